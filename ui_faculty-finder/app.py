@@ -6,8 +6,12 @@ from datetime import datetime
 from config import config
 from database.models import create_models
 from database.database import DatabaseOperations
+from database.writer import get_writer
+from database.cache import get_query_cache
 from crawler.bfs_crawler import NaturalUIFacultyCrawler
+from crawler.page_store import RawPageStore
 from search.search_engine import FacultySearchEngine
+from search.indexer import SearchIndexer
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,15 +22,52 @@ def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     
+    # Writer tunggal untuk database ini, dibuat sebelum model/indexer supaya memakai pengaturan config
+    get_writer(app.config['DATABASE_PATH'], max_batch=app.config['WRITE_QUEUE_MAX_BATCH'],
+               commit_delay=app.config['WRITE_QUEUE_COMMIT_DELAY'])
+    # Cache hasil query bersama (engine dan Faculty.search), dibuat dengan pengaturan config
+    query_cache = get_query_cache(app.config['DATABASE_PATH'], max_entries=app.config['QUERY_CACHE_SIZE'],
+                                  ttl=app.config['QUERY_CACHE_TTL'])
     db_operations = DatabaseOperations(app.config['DATABASE_PATH'])
     
     try:
-        search_engine = FacultySearchEngine(app.config['DATABASE_PATH'])
+        search_indexer = SearchIndexer(app.config['DATABASE_PATH'], weighting=app.config['SEARCH_WEIGHTING'],
+                                       binary_index_path=app.config['SEARCH_BINARY_INDEX_PATH'],
+                                       field_boosts=app.config['SEARCH_FIELD_BOOSTS'])
+        if search_indexer.ensure_index(workers=app.config['SEARCH_INDEX_WORKERS']):
+            app.logger.info("Inverted search index built")
+    except Exception as e:
+        app.logger.error(f"Failed to initialize search indexer: {e}")
+        search_indexer = None
+    
+    try:
+        search_engine = FacultySearchEngine(app.config['DATABASE_PATH'], backend=app.config['SEARCH_BACKEND'],
+                                            binary_index_path=app.config['SEARCH_BINARY_INDEX_PATH'],
+                                            field_boosts=app.config['SEARCH_FIELD_BOOSTS'],
+                                            resident=app.config['SEARCH_RESIDENT'],
+                                            reload_interval=app.config['SEARCH_RESIDENT_RELOAD_INTERVAL'])
         app.logger.info("Search engine initialized successfully")
     except Exception as e:
         app.logger.error(f"Failed to initialize search engine: {e}")
         search_engine = None
     
+    def sync_search_index():
+        """Re-index hanya fakultas yang berubah (index_queue) setelah data diubah"""
+        if not search_indexer:
+            return None
+        try:
+            return search_indexer.process_index_queue()
+        except Exception as e:
+            app.logger.error(f"Error updating search index: {e}")
+            return None
+    
+    page_store = None
+    if app.config.get('PAGE_STORE_ENABLED'):
+        try:
+            page_store = RawPageStore(app.config['PAGE_STORE_PATH'], app.config['PAGE_STORE_CODEC'])
+        except Exception as e:
+            app.logger.error(f"Failed to initialize page store: {e}")
+    
     @app.route('/')
     def index():
         try:
@@ -112,13 +153,17 @@ def create_app(config_name='default'):
         query = request.args.get('q', '').strip()
         limit = int(request.args.get('limit', 10))
         search_type = request.args.get('type', 'comprehensive')
+        faculty_type = request.args.get('faculty_type') or None
         
         if not query:
             return jsonify({'results': [], 'total': 0})
         
         try:
+            facets = {}
             if search_engine:
-                results = search_engine.search_faculties(query, limit=limit, search_type=search_type)
+                results = search_engine.search_faculties(query, limit=limit, search_type=search_type,
+                                                         faculty_type=faculty_type)
+                facets = search_engine.get_type_facets(query, search_type=search_type)
             else:
                 results = db_operations.models['faculty'].search(query, limit=limit)
             
@@ -136,7 +181,8 @@ def create_app(config_name='default'):
             return jsonify({
                 'results': api_results,
                 'total': len(api_results),
-                'query': query
+                'query': query,
+                'facets': facets
             })
             
         except Exception as e:
@@ -191,11 +237,15 @@ def create_app(config_name='default'):
             
             crawler = NaturalUIFacultyCrawler(
                 base_url="https://www.ui.ac.id/",
-                delay=delay
+                delay=delay,
+                budget_policy=request.form.get('budget_policy', app.config['CRAWL_BUDGET_POLICY']),
+                page_classifier=request.form.get('page_classifier', app.config['CRAWLER_PAGE_CLASSIFIER']),
+                page_store=page_store
             )
             
             start_time = datetime.now()
-            faculty_data = crawler.natural_crawl_bfs(max_depth=max_depth, max_pages=max_pages)
+            faculty_data = crawler.natural_crawl_bfs(max_depth=max_depth, max_pages=max_pages,
+                                                     journal_path=app.config['JSON_BACKUP_PATH'])
             end_time = datetime.now()
             
             crawl_duration = int((end_time - start_time).total_seconds())
@@ -211,11 +261,7 @@ def create_app(config_name='default'):
             
             crawler.save_results(app.config['JSON_BACKUP_PATH'])
             
-            if search_engine:
-                try:
-                    app.logger.info("Search index should be rebuilt after crawling")
-                except Exception as e:
-                    app.logger.error(f"Error rebuilding search index: {e}")
+            index_results = sync_search_index()
             
             crawler_summary = crawler.get_crawl_summary()
             
@@ -229,7 +275,10 @@ def create_app(config_name='default'):
                     'failed': import_results['failed'],
                     'errors': import_results['errors'][:5],
                     'navigation_stages': crawler_summary.get('navigation_stages', {}),
-                    'discovery_paths': crawler_summary.get('discovery_paths', [])[:3]
+                    'discovery_paths': crawler_summary.get('discovery_paths', [])[:3],
+                    'budget': crawler_summary.get('budget'),
+                    'crawl_id': crawler.crawl_id,
+                    'search_index': index_results
                 }
             })
             
@@ -240,6 +289,51 @@ def create_app(config_name='default'):
                 'message': f'Crawling failed: {str(e)}'
             }), 500
     
+    @app.route('/admin/reprocess', methods=['POST'])
+    def reprocess_crawl():
+        try:
+            if page_store is None:
+                return jsonify({
+                    'success': False,
+                    'message': 'Page store is disabled'
+                }), 400
+            
+            crawler = NaturalUIFacultyCrawler(
+                base_url="https://www.ui.ac.id/",
+                delay=0,
+                page_classifier=request.form.get('page_classifier', app.config['CRAWLER_PAGE_CLASSIFIER']),
+                page_store=page_store
+            )
+            
+            start_time = datetime.now()
+            faculty_data = crawler.reprocess(request.form.get('crawl_id') or None)
+            duration = (datetime.now() - start_time).total_seconds()
+            
+            import_results = db_operations.import_from_crawler(faculty_data)
+            crawler.save_results(app.config['JSON_BACKUP_PATH'])
+            index_results = sync_search_index()
+            
+            return jsonify({
+                'success': True,
+                'message': f'Stored crawl {crawler.crawl_id} reprocessed offline',
+                'results': {
+                    'crawl_id': crawler.crawl_id,
+                    'faculties_found': import_results['success'],
+                    'pages_reprocessed': len(crawler.visited),
+                    'duration_seconds': round(duration, 2),
+                    'failed': import_results['failed'],
+                    'errors': import_results['errors'][:5],
+                    'search_index': index_results
+                }
+            })
+            
+        except Exception as e:
+            app.logger.error(f"Error during reprocessing: {e}")
+            return jsonify({
+                'success': False,
+                'message': f'Reprocessing failed: {str(e)}'
+            }), 500
+    
     @app.route('/admin/import', methods=['POST'])
     def import_json():
         try:
@@ -252,6 +346,7 @@ def create_app(config_name='default'):
                 }), 404
             
             results = db_operations.import_from_json(json_file)
+            results['search_index'] = sync_search_index()
             
             return jsonify({
                 'success': True,
@@ -270,6 +365,7 @@ def create_app(config_name='default'):
     def clear_data():
         try:
             success = db_operations.clear_all_data()
+            sync_search_index()
             
             if success:
                 return jsonify({
@@ -292,7 +388,7 @@ def create_app(config_name='default'):
     @app.route('/admin/backup', methods=['POST'])
     def backup_data():
         try:
-            backup_file = f"data/backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            backup_file = f"data/backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
             success = db_operations.backup_to_json(backup_file)
             
             if success:
@@ -313,12 +409,36 @@ def create_app(config_name='default'):
                 'message': f'Backup failed: {str(e)}'
             }), 500
     
+    @app.route('/admin/cache')
+    def query_cache_stats():
+        return jsonify(query_cache.info())
+    
+    @app.route('/admin/index/rollback', methods=['POST'])
+    def rollback_search_index():
+        if not search_indexer:
+            return jsonify({
+                'success': False,
+                'message': 'Search indexer not available'
+            }), 500
+        
+        if search_indexer.rollback_index():
+            return jsonify({
+                'success': True,
+                'message': 'Search index rolled back to the previous version'
+            })
+        return jsonify({
+            'success': False,
+            'message': 'No previous search index to roll back to'
+        }), 409
+    
     @app.route('/admin/test-crawl', methods=['POST'])
     def test_crawl():
         try:
             crawler = NaturalUIFacultyCrawler(
                 base_url="https://www.ui.ac.id/",
-                delay=1
+                delay=1,
+                budget_policy=app.config['CRAWL_BUDGET_POLICY'],
+                page_classifier=app.config['CRAWLER_PAGE_CLASSIFIER']
             )
             
             start_time = datetime.now()
@@ -374,12 +494,19 @@ def run_initial_crawl():
             
             crawler = NaturalUIFacultyCrawler(
                 base_url="https://www.ui.ac.id/",
-                delay=2
+                delay=2,
+                budget_policy=DevelopmentConfig.CRAWL_BUDGET_POLICY,
+                page_classifier=DevelopmentConfig.CRAWLER_PAGE_CLASSIFIER,
+                page_store=RawPageStore(DevelopmentConfig.PAGE_STORE_PATH, DevelopmentConfig.PAGE_STORE_CODEC)
+                if DevelopmentConfig.PAGE_STORE_ENABLED else None
             )
             
             faculty_data = crawler.natural_crawl_bfs(max_depth=4, max_pages=28)
             
             results = db_ops.import_from_crawler(faculty_data)
+            SearchIndexer(DevelopmentConfig.DATABASE_PATH, weighting=DevelopmentConfig.SEARCH_WEIGHTING,
+                          binary_index_path=DevelopmentConfig.SEARCH_BINARY_INDEX_PATH,
+                          field_boosts=DevelopmentConfig.SEARCH_FIELD_BOOSTS).process_index_queue()
             
             crawler_summary = crawler.get_crawl_summary()
             
@@ -0,0 +1,8 @@
+"""
+Benchmarks package untuk UI Faculty Finder
+
+Berisi fixture corpus offline dan microbenchmark untuk crawler dan search.
+Jalankan dari direktori ui_faculty-finder, misalnya:
+
+    python -m benchmarks.bench_crawler
+"""
@@ -0,0 +1,149 @@
+"""
+Filter and facet benchmark: bitmaps in the binary index vs SQL.
+
+Indexing hundreds of thousands of synthetic faculties through SearchIndexer
+takes minutes, so this benchmark writes the binary index
+(search/binary_index.py) directly from random postings with a Zipf-like
+document frequency per term. The same postings are loaded into an in-memory
+SQLite table with the application's index layout, as the baseline.
+
+Timed operations per corpus size (ms, median):
+  * facet  - matching documents per faculty_type for a two-term query
+             (bitmap OR + popcount of AND vs GROUP BY over postings)
+  * filter - top 20 of a two-term query restricted to one faculty_type
+  * bool   - size of "term A AND type AND NOT term B"
+  * type   - first 20 faculties of one type, by name
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_bitmap [--sizes 100000 300000] [--repeat N]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from search.binary_index import BinaryIndex, write_binary_index
+from search.indexer import SearchIndexer
+
+FACULTY_TYPES = ['engineering', 'medical', 'social', 'science', 'humanities', 'business', 'law', 'general']
+TERM_COUNT = 2000
+
+
+def time_op(func, repeat: int) -> float:
+    """Median wall time of one call, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def generate_postings(size: int, seed: int = 42) -> Tuple[List[Dict], Iterator[Tuple[str, int, str, float]]]:
+    """Synthetic documents and (term, faculty_id, field, score) postings sorted by term"""
+    rng = np.random.default_rng(seed)
+    types = rng.integers(0, len(FACULTY_TYPES), size)
+    docs = [{'id': index + 1, 'name': f'Fakultas {index:07d}', 'faculty_type': FACULTY_TYPES[code]}
+            for index, code in enumerate(types.tolist())]
+    fields = SearchIndexer.FIELDS
+
+    def postings():
+        for rank in range(TERM_COUNT):
+            df = max(1, int(size * 0.3 / (rank + 1) ** 0.8))
+            faculty_ids = np.sort(rng.choice(size, df, replace=False)) + 1
+            field_codes = rng.integers(0, len(fields), df)
+            scores = rng.random(df)
+            for faculty_id, field_code, score in zip(faculty_ids.tolist(), field_codes.tolist(), scores.tolist()):
+                yield f'term{rank:05d}', faculty_id, fields[field_code], score
+
+    return docs, postings()
+
+
+def load_sqlite(docs: List[Dict], postings: Iterator[Tuple]) -> sqlite3.Connection:
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE faculties (id INTEGER PRIMARY KEY, name TEXT, faculty_type TEXT)')
+    conn.execute('''
+        CREATE TABLE index_postings (term TEXT, faculty_id INTEGER, field TEXT, score REAL,
+                                     PRIMARY KEY (term, faculty_id, field)) WITHOUT ROWID
+    ''')
+    conn.executemany('INSERT INTO faculties VALUES (?, ?, ?)',
+                     [(doc['id'], doc['name'], doc['faculty_type']) for doc in docs])
+    conn.executemany('INSERT OR IGNORE INTO index_postings VALUES (?, ?, ?, ?)', postings)
+    conn.execute('CREATE INDEX idx_faculties_type ON faculties(faculty_type)')
+    conn.execute('CREATE INDEX idx_faculties_name ON faculties(name)')
+    return conn
+
+
+def benchmark_size(size: int, repeat: int, workdir: str) -> Dict[str, float]:
+    path = os.path.join(workdir, f'bitmap_{size}.bin')
+    docs, postings = generate_postings(size)
+    start = time.perf_counter()
+    written = write_binary_index(path, SearchIndexer.FIELDS, docs, postings)
+    write_seconds = time.perf_counter() - start
+    index = BinaryIndex(path)
+    conn = load_sqlite(*generate_postings(size))
+
+    query = ['term00010', 'term00100']
+    faculty_type, excluded = 'medical', 'term00001'
+
+    result = {'size': size, 'postings': written['postings'], 'write_seconds': write_seconds,
+              'file_mb': os.path.getsize(path) / 1024 / 1024}
+    result['facet_bitmap_ms'] = time_op(lambda: index.facet_counts(index.match(query)), repeat)
+    result['facet_sql_ms'] = time_op(lambda: conn.execute('''
+        SELECT f.faculty_type, COUNT(DISTINCT p.faculty_id) FROM index_postings p
+        JOIN faculties f ON f.id = p.faculty_id WHERE p.term IN (?, ?) GROUP BY f.faculty_type
+    ''', query).fetchall(), repeat)
+    result['filter_bitmap_ms'] = time_op(lambda: index.search(query, 20, faculty_type=faculty_type), repeat)
+    result['filter_sql_ms'] = time_op(lambda: conn.execute('''
+        SELECT f.id, f.name, COUNT(DISTINCT p.term), SUM(p.score) AS final_score FROM index_postings p
+        JOIN faculties f ON f.id = p.faculty_id WHERE p.term IN (?, ?) AND f.faculty_type = ?
+        GROUP BY p.faculty_id ORDER BY final_score DESC, f.name LIMIT 20
+    ''', query + [faculty_type]).fetchall(), repeat)
+    result['bool_bitmap_ms'] = time_op(lambda: (
+        index.term_bitmap(query[0]) & index.type_bitmap(faculty_type) & ~index.term_bitmap(excluded)
+    ).bit_count(), repeat)
+    result['bool_sql_ms'] = time_op(lambda: conn.execute('''
+        SELECT COUNT(*) FROM (
+            SELECT p.faculty_id FROM index_postings p JOIN faculties f ON f.id = p.faculty_id
+            WHERE p.term = ? AND f.faculty_type = ?
+            EXCEPT SELECT faculty_id FROM index_postings WHERE term = ?
+        )
+    ''', (query[0], faculty_type, excluded)).fetchall(), repeat)
+    result['type_bitmap_ms'] = time_op(lambda: index.documents(index.type_bitmap(faculty_type), 20), repeat)
+    result['type_sql_ms'] = time_op(lambda: conn.execute(
+        'SELECT * FROM faculties WHERE faculty_type = ? ORDER BY name LIMIT 20', (faculty_type,)).fetchall(), repeat)
+    conn.close()
+    return result
+
+
+def run(sizes: List[int], repeat: int = 5) -> List[Dict[str, float]]:
+    results = []
+    print(f"🧮 Bitmap filter benchmark: {TERM_COUNT} terms, median of {repeat} (ms, bitmap / SQL)\n")
+    print(f"{'docs':>8} {'postings':>10} {'write (s)':>10} {'MB':>7} {'facet':>17} {'filter':>17} "
+          f"{'bool':>17} {'type':>17}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            result = benchmark_size(size, repeat, workdir)
+            results.append(result)
+            columns = ' '.join(f"{result[f'{op}_bitmap_ms']:>8.3f}/{result[f'{op}_sql_ms']:<8.3f}"
+                               for op in ('facet', 'filter', 'bool', 'type'))
+            print(f"{size:>8} {result['postings']:>10} {result['write_seconds']:>10.2f} "
+                  f"{result['file_mb']:>7.1f} {columns}")
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 300000],
+                        help='corpus sizes to benchmark (default: 100000 300000)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions per operation (default: 5)')
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeat)
@@ -0,0 +1,154 @@
+"""
+Query cache benchmark: cached vs computed search and suggestion latency.
+
+For every corpus size a synthetic database is generated (see
+benchmarks/search_corpus.py) and indexed with SearchIndexer. A
+FacultySearchEngine on the SQLite path then answers:
+
+- search:  search_faculties() for the sample and partial queries
+- suggest: get_search_suggestions() for query prefixes, as typed
+
+once with the query cache emptied before every call (miss: the query plus
+result enrichment) and once from the warm cache (hit: data version check
+and a dictionary lookup). Reports p50/p99 latency per call (ms).
+
+A skewed request mix (a few queries make up most of the traffic) is then
+replayed through a cache of --cache-size entries, reporting the hit rate
+and the hit/miss/eviction counters. Finally a faculty is changed and
+reindexed: the cache must be invalidated by the data version bump and
+answer the same as an uncached search.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_cache [--sizes 1000 5000] [--rounds N] [--requests N] [--cache-size N]
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.search_corpus import build_corpus_db, partial_queries, sample_queries
+from database.cache import QueryCache, get_query_cache
+from database.models import create_models
+from search.indexer import SearchIndexer
+from search.search_engine import FacultySearchEngine
+
+
+def latencies(calls: List[Callable], rounds: int, before: Callable = None) -> Tuple[float, float]:
+    """p50/p99 wall time of one call, in milliseconds (before() runs untimed ahead of every call)"""
+    timings = []
+    for _ in range(rounds):
+        for call in calls:
+            if before:
+                before()
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(timings, [50, 99]) * 1000
+    return p50, p99
+
+
+def workload(engine: FacultySearchEngine) -> Dict[str, List[Callable]]:
+    queries = sample_queries() + partial_queries()
+    prefixes = [query[:length] for query in sample_queries() for length in range(2, len(query) + 1, 2)]
+    return {
+        'search': [lambda query=query: engine.search_faculties(query, limit=20) for query in queries],
+        'suggest': [lambda prefix=prefix: engine.get_search_suggestions(prefix, limit=5) for prefix in prefixes],
+    }
+
+
+def skewed_traffic(engine: FacultySearchEngine, cache: QueryCache, requests: int, seed: int = 7) -> Dict:
+    """Replay `requests` searches drawn with Zipf-like weights (rank r gets 1/r of the traffic)"""
+    queries = sample_queries() + partial_queries()
+    queries += [f'{first} {second}' for first in sample_queries() for second in sample_queries() if first != second]
+    weights = [1 / rank for rank in range(1, len(queries) + 1)]
+    stream = random.Random(seed).choices(queries, weights=weights, k=requests)
+
+    cache.clear()
+    before = dict(cache.stats)
+    start = time.perf_counter()
+    for query in stream:
+        engine.search_faculties(query, limit=20)
+    elapsed = time.perf_counter() - start
+    counters = {key: cache.stats[key] - before.get(key, 0) for key in ('hits', 'misses', 'evictions')}
+    return dict(counters, distinct=len(set(stream)), per_request_ms=elapsed / requests * 1000)
+
+
+def invalidated(db_path: str, engine: FacultySearchEngine, indexer: SearchIndexer) -> bool:
+    """Change one faculty: the cached answer must follow the data, not the old result"""
+    engine.search_faculties('robotika', limit=20)
+    models = create_models(db_path)
+    faculty = models['faculty'].get_by_id(1)
+    faculty['description'] += ' robotika'
+    models['faculty'].create(faculty)
+    indexer.process_index_queue()
+
+    cached = [row['id'] for row in engine.search_faculties('robotika', limit=20)]
+    words = engine.preprocess_query('robotika')
+    computed = [row['id'] for row in engine._search_faculties('robotika', words, 20, 'comprehensive', 'index', None)]
+    return 1 in cached and cached == computed
+
+
+def benchmark_size(size: int, rounds: int, requests: int, cache_size: int, workdir: str) -> Dict:
+    db_path = os.path.join(workdir, f'cache_{size}.db')
+    build_corpus_db(db_path, size)
+    indexer = SearchIndexer(db_path)
+    indexer.rebuild_all_indexes()
+
+    cache = get_query_cache(db_path, max_entries=cache_size)
+    engine = FacultySearchEngine(db_path)
+    result = {'size': size}
+    for op, calls in workload(engine).items():
+        result[f'{op}_miss'] = latencies(calls, rounds, before=cache.clear)
+        for call in calls:
+            call()
+        result[f'{op}_hit'] = latencies(calls, rounds)
+
+    result['traffic'] = skewed_traffic(engine, cache, requests)
+    result['consistent'] = invalidated(db_path, engine, indexer)
+    cache.close()
+    return result
+
+
+def run(sizes: List[int], rounds: int = 5, requests: int = 2000, cache_size: int = 64) -> bool:
+    logging.disable(logging.WARNING)
+
+    print(f"🗃️  Query cache benchmark, {rounds} rounds (p50/p99 ms, miss -> hit), "
+          f"{requests} skewed requests through {cache_size} entries\n")
+    print(f"{'docs':>6} {'search':>26} {'suggest':>26} {'hit rate':>9} {'hits':>6} {'misses':>7} "
+          f"{'evicted':>8} {'ms/req':>7}  consistent")
+
+    consistent = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            result = benchmark_size(size, rounds, requests, cache_size, workdir)
+            columns = ' '.join(
+                f"{'{:.2f}/{:.2f} -> {:.3f}/{:.3f}'.format(*result[f'{op}_miss'], *result[f'{op}_hit']):>26}"
+                for op in ('search', 'suggest'))
+            traffic = result['traffic']
+            print(f"{size:>6} {columns} {traffic['hits'] / requests:>8.1%} {traffic['hits']:>6} "
+                  f"{traffic['misses']:>7} {traffic['evictions']:>8} {traffic['per_request_ms']:>7.3f}  "
+                  f"{'ok' if result['consistent'] else 'STALE'}")
+            consistent = consistent and result['consistent']
+
+    if not consistent:
+        print("\n❌ The cache served a result from before the data changed")
+    return consistent
+
+
+if __name__ == '__main__':
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000],
+                        help='corpus sizes to benchmark (default: 1000 5000)')
+    parser.add_argument('--rounds', type=int, default=5, help='passes over the request mix (default: 5)')
+    parser.add_argument('--requests', type=int, default=2000, help='skewed search requests (default: 2000)')
+    parser.add_argument('--cache-size', type=int, default=64, help='cache entries for the skewed mix (default: 64)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.sizes, args.rounds, args.requests, args.cache_size) else 1)
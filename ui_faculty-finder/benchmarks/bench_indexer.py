@@ -0,0 +1,157 @@
+"""
+Index rebuild benchmark: rebuild time versus corpus size.
+
+For every corpus size a synthetic database is generated (see
+benchmarks/search_corpus.py) and the full search index is rebuilt with:
+
+- per-faculty: the old path, one _get_complete_faculty_data and one
+  create_search_index transaction per faculty (only up to --baseline-max)
+- bulk: SearchIndexer.rebuild_all_indexes() in one transaction
+- bulk xN: the same with tokenization sharded over N worker processes
+  (one column and one docs/s figure per --workers value, so throughput
+  can be read against worker count)
+- incremental: process_index_queue() after two faculties changed
+
+It also reports the on-disk size of the live index (from the dbstat
+virtual table), split into the keyword store behind the search_index
+view and the whole index including postings.
+
+All full rebuild variants must produce identical postings, and the
+incremental update must re-index exactly the two changed faculties and
+leave the same stored scores as a full refresh_scores() afterwards.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_indexer [--sizes 1000 5000 20000] [--workers 2 4 8] [--baseline-max 2000] [--weighting tfidf]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.search_corpus import build_corpus_db
+from search.indexer import SearchIndexer
+from search.weighting import TermWeighting
+
+
+def rebuild_per_faculty(indexer: SearchIndexer) -> None:
+    """The pre-bulk rebuild: a connection + transaction for every faculty"""
+    with sqlite3.connect(indexer.db_path) as conn:
+        for table in SearchIndexer.INDEX_TABLES:
+            conn.execute(f'DELETE FROM {table}')
+        faculty_ids = [row[0] for row in conn.execute('SELECT id FROM faculties ORDER BY id')]
+
+    for faculty_id in faculty_ids:
+        indexer.create_search_index(faculty_id, indexer._get_complete_faculty_data(faculty_id), update_scores=False)
+    indexer.refresh_scores()
+
+
+def postings_checksum(db_path: str) -> tuple:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('''
+            SELECT COUNT(*), TOTAL(p.tf), ROUND(TOTAL(p.score), 6), COUNT(DISTINCT t.term)
+            FROM index_postings p JOIN index_terms t ON t.id = p.term_id
+        ''').fetchone()
+
+
+def index_size_mb(db_path: str, tables) -> float:
+    """Pages used by the given tables and their indexes, in MB (FTS5 tables include their shadow tables)"""
+    tables = [f'{table}{shadow}' for table in tables for shadow in ('', '_data', '_idx', '_content', '_docsize', '_config')]
+    with sqlite3.connect(db_path) as conn:
+        size = conn.execute(f'''
+            SELECT TOTAL(s.pgsize) FROM dbstat s
+            JOIN sqlite_master m ON m.name = s.name
+            WHERE m.tbl_name IN ({",".join("?" * len(tables))})
+        ''', tables).fetchone()[0]
+    return size / (1024 * 1024)
+
+
+def benchmark_size(size: int, workers: List[int], baseline_max: int, workdir: str,
+                   weighting: str = 'bm25') -> Dict[str, Optional[float]]:
+    db_path = os.path.join(workdir, f'index_{size}.db')
+    build_corpus_db(db_path, size)
+    indexer = SearchIndexer(db_path, weighting=weighting)
+    result = {'size': size, 'per_faculty': None, 'consistent': True}
+
+    checksums = []
+    if size <= baseline_max:
+        start = time.perf_counter()
+        rebuild_per_faculty(indexer)
+        result['per_faculty'] = time.perf_counter() - start
+        checksums.append(postings_checksum(db_path))
+
+    start = time.perf_counter()
+    indexer.rebuild_all_indexes()
+    result['bulk'] = time.perf_counter() - start
+    checksums.append(postings_checksum(db_path))
+
+    result['parallel'] = {}
+    for count in workers:
+        start = time.perf_counter()
+        indexer.rebuild_all_indexes(workers=count)
+        result['parallel'][count] = time.perf_counter() - start
+        checksums.append(postings_checksum(db_path))
+
+    result['consistent'] = len(set(checksums)) == 1
+    result['keyword_mb'] = index_size_mb(db_path, ('index_fields', 'index_keywords', 'index_entries'))
+    result['index_mb'] = index_size_mb(db_path, SearchIndexer.INDEX_TABLES)
+    
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE faculties SET description = description || ' robotika' WHERE id IN (1, 2)")
+    start = time.perf_counter()
+    queue_results = indexer.process_index_queue()
+    result['incremental'] = time.perf_counter() - start
+    incremental = postings_checksum(db_path)
+    indexer.refresh_scores()
+    result['consistent'] = (result['consistent'] and queue_results['reindexed'] == 2
+                            and incremental == postings_checksum(db_path))
+    return result
+
+
+def run(sizes: List[int], workers: Optional[List[int]] = None, baseline_max: int = 2000,
+        weighting: str = 'bm25') -> bool:
+    logging.disable(logging.WARNING)
+    workers = workers or [4]
+
+    print(f"🏗️  Index rebuild benchmark, {weighting} weighting (seconds; docs/s per worker count), "
+          f"{os.cpu_count()} CPUs\n")
+    print(f"{'docs':>8} {'per-faculty':>12} {'bulk':>9} "
+          + ''.join(f"{f'bulk x{count}':>10}" for count in workers)
+          + f" {'docs/s x1':>10}" + ''.join(f"{f'docs/s x{count}':>11}" for count in workers)
+          + f" {'2 changed':>10} {'keyword MB':>11} {'index MB':>9}  consistent")
+
+    consistent = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            result = benchmark_size(size, workers, baseline_max, workdir, weighting)
+            per_faculty = f"{result['per_faculty']:.2f}" if result['per_faculty'] is not None else '-'
+            parallel = result['parallel']
+            print(f"{size:>8} {per_faculty:>12} {result['bulk']:>9.2f} "
+                  + ''.join(f"{parallel[count]:>10.2f}" for count in workers)
+                  + f" {size / result['bulk']:>10.0f}" + ''.join(f"{size / parallel[count]:>11.0f}" for count in workers)
+                  + f" {result['incremental']:>10.3f} {result['keyword_mb']:>11.1f} "
+                  f"{result['index_mb']:>9.1f}  {'ok' if result['consistent'] else 'MISMATCH'}")
+            consistent = consistent and result['consistent']
+
+    if not consistent:
+        print("\n❌ Rebuild variants produced different postings or the incremental update was wrong")
+    return consistent
+
+
+if __name__ == '__main__':
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000],
+                        help='corpus sizes to benchmark (default: 1000 5000 20000)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4],
+                        help='worker process counts for the parallel rebuild (default: 2 4)')
+    parser.add_argument('--baseline-max', type=int, default=2000,
+                        help='largest corpus for the slow per-faculty baseline (default: 2000)')
+    parser.add_argument('--weighting', choices=TermWeighting.SCHEMES, default='bm25',
+                        help='postings weighting scheme (default: bm25)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.sizes, args.workers, args.baseline_max, args.weighting) else 1)
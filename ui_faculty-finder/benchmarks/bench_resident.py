@@ -0,0 +1,128 @@
+"""
+Resident snapshot benchmark: in-memory search vs the SQLite path.
+
+For every corpus size a synthetic database is generated (see
+benchmarks/search_corpus.py) and indexed with SearchIndexer. The same
+requests then run through two FacultySearchEngine instances, one reading
+SQLite per call (a new connection, postings query and per-result enrich
+queries) and one with resident=True answering from ResidentSnapshot:
+
+- search:  search_faculties() for the sample and partial queries
+- suggest: get_search_suggestions() for query prefixes, as typed
+- type:    get_faculty_by_type() for every faculty type
+
+Reports p50/p99 latency per call (ms) for both paths, the snapshot load
+time, and checks that both paths return the same results.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_resident [--sizes 500 2000 5000] [--rounds N]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.search_corpus import build_corpus_db, partial_queries, sample_queries
+from database.cache import get_query_cache
+from search.indexer import SearchIndexer
+from search.resident import ResidentSnapshot
+from search.search_engine import FacultySearchEngine
+
+
+def latencies(calls: List[Callable], rounds: int) -> Tuple[float, float]:
+    """p50/p99 wall time of one call, in milliseconds"""
+    timings = []
+    for _ in range(rounds):
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(timings, [50, 99]) * 1000
+    return p50, p99
+
+
+def workload(engine: FacultySearchEngine, types: List[str]) -> Dict[str, List[Callable]]:
+    queries = sample_queries() + partial_queries()
+    prefixes = [query[:length] for query in sample_queries() for length in range(2, len(query) + 1, 2)]
+    return {
+        'search': [lambda query=query: engine.search_faculties(query, limit=20) for query in queries],
+        'suggest': [lambda prefix=prefix: engine.get_search_suggestions(prefix, limit=5) for prefix in prefixes],
+        'type': [lambda faculty_type=faculty_type: engine.get_faculty_by_type(faculty_type, limit=20)
+                 for faculty_type in types],
+    }
+
+
+def same_results(sqlite_engine: FacultySearchEngine, resident_engine: FacultySearchEngine, types: List[str]) -> bool:
+    for query in sample_queries() + partial_queries():
+        expected = [(row['id'], row['match_count'], round(row['final_score'], 9), row['programs'], row['route'])
+                    for row in sqlite_engine.search_faculties(query, limit=20)]
+        actual = [(row['id'], row['match_count'], round(row['final_score'], 9), row['programs'], row['route'])
+                  for row in resident_engine.search_faculties(query, limit=20)]
+        if expected != actual:
+            return False
+        # Suggestion order is not defined on the SQLite path (set), compare complete answers
+        if set(sqlite_engine.get_search_suggestions(query[:4], 1000)) != \
+                set(resident_engine.get_search_suggestions(query[:4], 1000)):
+            return False
+    return all([row['id'] for row in sqlite_engine.get_faculty_by_type(faculty_type, 20)] ==
+               [row['id'] for row in resident_engine.get_faculty_by_type(faculty_type, 20)] for faculty_type in types)
+
+
+def benchmark_size(size: int, rounds: int, workdir: str) -> Dict:
+    db_path = os.path.join(workdir, f'resident_{size}.db')
+    build_corpus_db(db_path, size)
+    SearchIndexer(db_path).rebuild_all_indexes()
+    with sqlite3.connect(db_path) as conn:
+        types = [row[0] for row in conn.execute('SELECT DISTINCT faculty_type FROM faculties ORDER BY 1')]
+        start = time.perf_counter()
+        ResidentSnapshot(conn)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    # Query cache off: both engines must compute every answer (and the SQLite path is timed)
+    get_query_cache(db_path, max_entries=0)
+    sqlite_engine = FacultySearchEngine(db_path)
+    resident_engine = FacultySearchEngine(db_path, resident=True)
+    result = {'size': size, 'load_ms': load_ms, 'consistent': same_results(sqlite_engine, resident_engine, types)}
+    for path, engine in (('sqlite', sqlite_engine), ('resident', resident_engine)):
+        for op, calls in workload(engine, types).items():
+            result[f'{op}_{path}'] = latencies(calls, rounds)
+    resident_engine.close()
+    return result
+
+
+def run(sizes: List[int], rounds: int = 5) -> bool:
+    logging.disable(logging.WARNING)
+
+    print(f"🧠 Resident snapshot benchmark, {rounds} rounds (p50/p99 ms, SQLite -> resident)\n")
+    print(f"{'docs':>6} {'load (ms)':>10} {'search':>26} {'suggest':>26} {'type':>26}  consistent")
+
+    consistent = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            result = benchmark_size(size, rounds, workdir)
+            columns = ' '.join(
+                f"{'{:.2f}/{:.2f} -> {:.3f}/{:.3f}'.format(*result[f'{op}_sqlite'], *result[f'{op}_resident']):>26}"
+                for op in ('search', 'suggest', 'type'))
+            print(f"{size:>6} {result['load_ms']:>10.0f} {columns}  {'ok' if result['consistent'] else 'MISMATCH'}")
+            consistent = consistent and result['consistent']
+
+    if not consistent:
+        print("\n❌ The resident snapshot answered differently from SQLite")
+    return consistent
+
+
+if __name__ == '__main__':
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 5000],
+                        help='corpus sizes to benchmark (default: 500 2000 5000)')
+    parser.add_argument('--rounds', type=int, default=5, help='passes over the request mix (default: 5)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.sizes, args.rounds) else 1)
@@ -0,0 +1,96 @@
+"""
+Field boost benchmark: rescaling stored scores vs a full index rebuild.
+
+For every corpus size a synthetic database is generated (see
+benchmarks/search_corpus.py) and indexed with the default field boosts.
+The boosts are then changed (--boosts) and applied two ways:
+
+- reweight: SearchIndexer.reweight_index(), one UPDATE of the stored
+  postings scores per changed field, no re-tokenization
+- rebuild: rebuild_all_indexes() with the new boosts
+
+Every posting score after the reweight must match the rebuilt index.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_reweight [--sizes 10000 100000] [--boosts name=8 contact=0.5]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.search_corpus import build_corpus_db
+from search.indexer import SearchIndexer
+
+
+def posting_scores(db_path: str) -> Dict[tuple, float]:
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute('SELECT term_id, faculty_id, field, score FROM index_postings').fetchall()
+    return {(term_id, faculty_id, field): score for term_id, faculty_id, field, score in rows}
+
+
+def benchmark_size(size: int, boosts: Dict[str, float], workdir: str) -> Dict:
+    db_path = os.path.join(workdir, f'reweight_{size}.db')
+    build_corpus_db(db_path, size)
+    SearchIndexer(db_path).rebuild_all_indexes()
+    indexer = SearchIndexer(db_path, field_boosts=boosts)
+    result = {'size': size}
+
+    start = time.perf_counter()
+    result['factors'] = indexer.reweight_index()
+    result['reweight'] = time.perf_counter() - start
+    reweighted = posting_scores(db_path)
+
+    start = time.perf_counter()
+    indexer.rebuild_all_indexes()
+    result['rebuild'] = time.perf_counter() - start
+    rebuilt = posting_scores(db_path)
+
+    # Term ids are assigned in the same order by both builds
+    result['max_diff'] = max((abs(score - rebuilt[key]) for key, score in reweighted.items() if key in rebuilt),
+                             default=0.0)
+    result['consistent'] = reweighted.keys() == rebuilt.keys() and result['max_diff'] < 1e-9
+    return result
+
+
+def run(sizes: List[int], boosts: Dict[str, float]) -> bool:
+    logging.disable(logging.WARNING)
+
+    print(f"⚖️  Field boost benchmark: {boosts}\n")
+    print(f"{'docs':>8} {'reweight (s)':>13} {'rebuild (s)':>12} {'speedup':>8} {'max diff':>10}  consistent")
+
+    consistent = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            result = benchmark_size(size, boosts, workdir)
+            print(f"{size:>8} {result['reweight']:>13.3f} {result['rebuild']:>12.2f} "
+                  f"{result['rebuild'] / result['reweight']:>7.0f}x {result['max_diff']:>10.1e}  "
+                  f"{'ok' if result['consistent'] else 'MISMATCH'}")
+            consistent = consistent and result['consistent']
+
+    if not consistent:
+        print("\n❌ Reweighted scores differ from a full rebuild with the same boosts")
+    return consistent
+
+
+def parse_boost(value: str) -> tuple:
+    field, _, boost = value.partition('=')
+    if field not in SearchIndexer.FIELD_BOOSTS or not boost:
+        raise argparse.ArgumentTypeError(f"expected field=boost with field in {SearchIndexer.FIELDS}")
+    return field, float(boost)
+
+
+if __name__ == '__main__':
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help='corpus sizes to benchmark (default: 10000 100000)')
+    parser.add_argument('--boosts', type=parse_boost, nargs='+', default=[('name', 8.0), ('contact', 0.5)],
+                        help='changed field boosts as field=boost (default: name=8 contact=0.5)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.sizes, dict(args.boosts)) else 1)
@@ -0,0 +1,106 @@
+"""
+Search latency benchmark: LIKE scan vs inverted index vs FTS5.
+
+For every corpus size a synthetic database is generated (see
+benchmarks/search_corpus.py) and indexed with SearchIndexer. Each sample
+query is then timed through the legacy LIKE search over search_index and
+through the postings lookup of FacultySearchEngine._index_search.
+The inverted index should stay roughly flat as the corpus grows, while
+LIKE grows linearly. The same queries also run through the FTS5 backend
+(FacultySearchEngine._fts_search, bm25() ranking). Partial-word and
+misspelled queries are timed the same way; on the index side they go
+through the trigram index, FTS5 only matches them as prefixes. The
+inverted index is also exported to the mmap'ed binary index file
+(search/binary_index.py) and timed through
+FacultySearchEngine._binary_index_search; "open" is the cold start of
+that file.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_search [--sizes 1000 5000 20000] [--repeat N]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.search_corpus import build_corpus_db, partial_queries, sample_queries
+from search.binary_index import BinaryIndex
+from search.indexer import SearchIndexer
+from search.search_engine import FacultySearchEngine
+
+
+def time_query(func, repeat: int) -> float:
+    """Median wall time of one query, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def benchmark_size(size: int, repeat: int, workdir: str) -> Dict[str, float]:
+    db_path = os.path.join(workdir, f'search_{size}.db')
+    build_corpus_db(db_path, size)
+
+    binary_path = os.path.join(workdir, f'search_{size}.bin')
+    indexer = SearchIndexer(db_path)
+    start = time.perf_counter()
+    indexer.rebuild_all_indexes()
+    index_seconds = time.perf_counter() - start
+    indexer.export_binary_index(binary_path)
+
+    engine = FacultySearchEngine(db_path)
+    timings = {'open_ms': time_query(lambda: BinaryIndex(binary_path), repeat)}
+    binary_index = BinaryIndex(binary_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        for kind, queries in (('', sample_queries()), ('partial_', partial_queries())):
+            like_ms, index_ms, fts_ms, binary_ms = [], [], [], []
+            for query in queries:
+                words = engine.preprocess_query(query)
+                like_ms.append(time_query(lambda: engine._comprehensive_search(conn, words, 20), repeat))
+                index_ms.append(time_query(lambda: engine._index_search(conn, words, 20), repeat))
+                fts_ms.append(time_query(lambda: engine._fts_search(conn, query, 20), repeat))
+                binary_ms.append(time_query(lambda: engine._binary_index_search(conn, binary_index, words, 20), repeat))
+            timings[f'{kind}like_ms'] = statistics.mean(like_ms)
+            timings[f'{kind}index_ms'] = statistics.mean(index_ms)
+            timings[f'{kind}fts_ms'] = statistics.mean(fts_ms)
+            timings[f'{kind}binary_ms'] = statistics.mean(binary_ms)
+
+    return {'size': size, 'index_seconds': index_seconds, **timings}
+
+
+def run(sizes: List[int], repeat: int = 5) -> List[Dict[str, float]]:
+    logging.disable(logging.WARNING)
+    results = []
+
+    print(f"🔎 Search benchmark: {len(sample_queries())} queries + {len(partial_queries())} partial/misspelled, "
+          f"median of {repeat} (ms per query)\n")
+    print(f"{'docs':>8} {'index (s)':>10} {'LIKE':>10} {'postings':>10} {'fts5':>10} {'binary':>10} "
+          f"{'LIKE part':>10} {'trigram':>10} {'fts5 part':>10} {'bin part':>10} {'open':>10}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            result = benchmark_size(size, repeat, workdir)
+            results.append(result)
+            print(f"{size:>8} {result['index_seconds']:>10.2f} {result['like_ms']:>10.3f} "
+                  f"{result['index_ms']:>10.3f} {result['fts_ms']:>10.3f} {result['binary_ms']:>10.3f} "
+                  f"{result['partial_like_ms']:>10.3f} {result['partial_index_ms']:>10.3f} "
+                  f"{result['partial_fts_ms']:>10.3f} {result['partial_binary_ms']:>10.3f} {result['open_ms']:>10.3f}")
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000],
+                        help='corpus sizes to benchmark (default: 1000 5000 20000)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions per query (default: 5)')
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeat)
@@ -0,0 +1,88 @@
+"""
+Stemming throughput benchmark over the full index vocabulary.
+
+The vocabulary is every distinct token (after search.analysis.tokenize)
+of the saved HTML fixtures plus a synthetic corpus (see
+benchmarks/search_corpus.py). Each word is stemmed with
+search.stemmer.stem three ways:
+
+  * raw   - the affix-stripping algorithm without the memo cache
+  * cold  - through the lru_cache, starting empty (first indexing pass)
+  * warm  - through the lru_cache again (re-indexing, query time)
+
+Also reports how many words were reduced to a different stem and how many
+distinct stems the vocabulary collapses to.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_stemmer [--docs 5000] [--repeat N]
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from benchmarks.corpus import load_fixture_pages
+from benchmarks.search_corpus import generate_faculties
+from search.analysis import tokenize
+from search.stemmer import stem
+
+
+def build_vocabulary(docs: int) -> List[str]:
+    """Distinct tokens of the HTML fixtures and `docs` synthetic faculties, sorted"""
+    vocabulary = set()
+    for page in load_fixture_pages():
+        vocabulary.update(tokenize(BeautifulSoup(page['html'], 'html.parser').get_text(' ')))
+    for faculty in generate_faculties(docs):
+        texts = [faculty['name'], faculty['description'], faculty['faculty_type'], faculty['contact']['address']]
+        vocabulary.update(tokenize(' '.join(texts + faculty['programs'] + faculty['departments'])))
+    return sorted(vocabulary)
+
+
+def time_pass(func: Callable[[str], str], words: List[str], repeat: int, reset: bool = False) -> float:
+    """Median words per second of one pass over the vocabulary"""
+    timings = []
+    for _ in range(repeat):
+        if reset:
+            stem.cache_clear()
+        start = time.perf_counter()
+        for word in words:
+            func(word)
+        timings.append(time.perf_counter() - start)
+    return len(words) / statistics.median(timings)
+
+
+def run(docs: int = 5000, repeat: int = 5) -> Dict[str, float]:
+    words = build_vocabulary(docs)
+    stems = {word: stem.__wrapped__(word) for word in words}
+    changed = sum(1 for word, word_stem in stems.items() if word_stem != word)
+
+    result = {
+        'words': len(words),
+        'changed': changed,
+        'stems': len(set(stems.values())),
+        'raw_wps': time_pass(stem.__wrapped__, words, repeat),
+        'cold_wps': time_pass(stem, words, repeat, reset=True),
+    }
+    result['warm_wps'] = time_pass(stem, words, repeat)
+
+    print(f"🌱 Stemmer benchmark: {result['words']} distinct words, median of {repeat}\n")
+    print(f"{'changed':>10} {'stems':>10} {'raw w/s':>12} {'cold w/s':>12} {'warm w/s':>12}")
+    print(f"{result['changed']:>10} {result['stems']:>10} {result['raw_wps']:>12,.0f} "
+          f"{result['cold_wps']:>12,.0f} {result['warm_wps']:>12,.0f}")
+
+    examples = [(word, word_stem) for word, word_stem in stems.items() if word_stem != word][:10]
+    if examples:
+        print('\n' + ', '.join(f"{word} -> {word_stem}" for word, word_stem in examples))
+
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=5000, help='synthetic faculties in the vocabulary (default: 5000)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions per pass (default: 5)')
+    args = parser.parse_args()
+
+    run(args.docs, args.repeat)
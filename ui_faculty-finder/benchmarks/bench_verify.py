@@ -0,0 +1,125 @@
+"""
+Index verification benchmark: checksum verify + targeted repair vs full rebuild.
+
+For every corpus size a synthetic database is generated (see
+benchmarks/search_corpus.py) and indexed with rebuild_all_indexes(). Then:
+
+- verify: SearchIndexer.find_stale_faculties() on the healthy index
+  (median of --repeat runs), i.e. the per-faculty content hash join
+- verify+repair: repair_search_index() on the healthy index
+- damaged: --damage faculties are knocked out of sync (half changed
+  through Faculty with their index_queue entries dropped, half with
+  their index checksum deleted or corrupted) and repair_search_index()
+  re-indexes them
+- rebuild: the full rebuild the old check fell back to
+
+The repaired index must have no stale faculties left and the same
+postings (count and total tf) as a fresh full rebuild.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_verify [--sizes 10000 100000] [--damage 20] [--repeat N]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.search_corpus import build_corpus_db
+from database.models import create_models
+from search.indexer import SearchIndexer
+
+
+def postings_checksum(db_path: str) -> tuple:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT COUNT(*), TOTAL(tf) FROM index_postings').fetchone()
+
+
+def damage_index(db_path: str, models: Dict, count: int) -> None:
+    """Put `count` faculties out of sync with the index without queueing them"""
+    faculty_ids = list(range(1, count * 7, 7))[:count]
+    changed, broken = faculty_ids[:count // 2], faculty_ids[count // 2:]
+    for faculty_id in changed:
+        faculty = models['faculty'].get_by_id(faculty_id)
+        faculty['description'] += ' robotika'
+        models['faculty'].create(faculty)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('DELETE FROM index_queue')
+        for position, faculty_id in enumerate(broken):
+            if position % 2:
+                conn.execute("UPDATE index_checksums SET content_hash = 'corrupt' WHERE faculty_id = ?", (faculty_id,))
+            else:
+                conn.execute('DELETE FROM index_checksums WHERE faculty_id = ?', (faculty_id,))
+
+
+def benchmark_size(size: int, damage: int, repeat: int, workdir: str) -> Dict:
+    db_path = os.path.join(workdir, f'verify_{size}.db')
+    build_corpus_db(db_path, size)
+    models = create_models(db_path)
+    indexer = SearchIndexer(db_path)
+    result = {'size': size}
+
+    start = time.perf_counter()
+    indexer.rebuild_all_indexes()
+    result['rebuild'] = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stale = indexer.find_stale_faculties()
+        timings.append(time.perf_counter() - start)
+    result['verify_ms'] = statistics.median(timings) * 1000
+    result['healthy_stale'] = len(stale)
+
+    start = time.perf_counter()
+    indexer.repair_search_index()
+    result['healthy_repair_ms'] = (time.perf_counter() - start) * 1000
+
+    damage_index(db_path, models, damage)
+    start = time.perf_counter()
+    repaired = indexer.repair_search_index()
+    result['damaged_repair_ms'] = (time.perf_counter() - start) * 1000
+    result['repaired'] = repaired['stale']
+
+    repaired_postings = postings_checksum(db_path)
+    left = len(indexer.find_stale_faculties())
+    indexer.rebuild_all_indexes()
+    result['consistent'] = (result['healthy_stale'] == 0 and repaired['stale'] == damage and left == 0
+                            and repaired_postings == postings_checksum(db_path))
+    return result
+
+
+def run(sizes: List[int], damage: int = 20, repeat: int = 5) -> bool:
+    logging.disable(logging.WARNING)
+
+    print(f"🩺 Index verify/repair benchmark, {damage} damaged faculties\n")
+    print(f"{'docs':>8} {'verify (ms)':>12} {'verify+repair':>14} {'damaged repair':>15} {'rebuild (s)':>12}  consistent")
+
+    consistent = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            result = benchmark_size(size, damage, repeat, workdir)
+            print(f"{size:>8} {result['verify_ms']:>12.1f} {result['healthy_repair_ms']:>12.1f}ms "
+                  f"{result['damaged_repair_ms']:>13.1f}ms {result['rebuild']:>12.2f}  "
+                  f"{'ok' if result['consistent'] else 'MISMATCH'}")
+            consistent = consistent and result['consistent']
+
+    if not consistent:
+        print("\n❌ Repair missed damaged faculties or left the index different from a full rebuild")
+    return consistent
+
+
+if __name__ == '__main__':
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help='corpus sizes to benchmark (default: 10000 100000)')
+    parser.add_argument('--damage', type=int, default=20, help='faculties to put out of sync (default: 20)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions for verify (default: 5)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.sizes, args.damage, args.repeat) else 1)
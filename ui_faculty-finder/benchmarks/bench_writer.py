@@ -0,0 +1,139 @@
+"""
+Concurrent write benchmark: per-record connections vs the single-writer queue.
+
+Several import threads write synthetic faculties (benchmarks/search_corpus.py)
+into a fresh database, first alone and then while an indexer thread keeps
+draining index_queue, the way the admin crawl/import routes and the indexer
+overlap in the app.
+
+- per-record: the old Faculty.create path, one sqlite3 connection, one
+  transaction and one commit per faculty, every thread competing for the
+  database lock (sqlite3 default 5 s timeout, default synchronous)
+- queue sync: Faculty.create() through the shared WriteQueue, each thread
+  waiting for its record to commit before writing the next
+- queue async: Faculty.create_many(), each thread keeping a window of
+  records in flight
+
+Reports records/s, failed records ("database is locked" and other errors),
+commits and records per commit. Every queue variant must end with all
+faculties stored and, with the index drain, all of them indexed.
+
+Usage (from ui_faculty-finder/):
+    python -m benchmarks.bench_writer [--threads 4] [--records 500]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.search_corpus import generate_faculties
+from database.models import create_models
+from database.writer import get_writer
+from search.indexer import SearchIndexer
+
+
+def per_record(models: Dict, records: List[Dict], failures: List[int]):
+    for faculty_data in records:
+        try:
+            with sqlite3.connect(models['db_manager'].db_path) as conn:
+                models['faculty']._write_faculty(conn, faculty_data)
+        except sqlite3.Error:
+            failures.append(1)
+
+
+def queue_sync(models: Dict, records: List[Dict], failures: List[int]):
+    for faculty_data in records:
+        if models['faculty'].create(faculty_data) is None:
+            failures.append(1)
+
+
+def queue_async(models: Dict, records: List[Dict], failures: List[int]):
+    for _, faculty_id, error in models['faculty'].create_many(records, window=100):
+        if error is not None or faculty_id is None:
+            failures.append(1)
+
+
+def run_variant(name: str, writer_func: Callable, threads: int, records: int, workdir: str,
+                drain_index: bool) -> Dict:
+    db_path = os.path.join(workdir, f"{name}{'_indexed' if drain_index else ''}.db")
+    models = create_models(db_path)
+    indexer = SearchIndexer(db_path)
+    faculties = list(generate_faculties(threads * records))
+    shards = [faculties[index::threads] for index in range(threads)]
+    failures: List[int] = []
+    writer = get_writer(db_path)
+    commits_before = writer.stats['commits']
+
+    done = threading.Event()
+
+    def index_loop():
+        while not done.is_set():
+            indexer.process_index_queue()
+            time.sleep(0.05)
+
+    workers = [threading.Thread(target=writer_func, args=(models, shard, failures)) for shard in shards]
+    index_thread = threading.Thread(target=index_loop)
+    start = time.perf_counter()
+    if drain_index:
+        index_thread.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    if drain_index:
+        index_thread.join()
+        indexer.process_index_queue()
+
+    with sqlite3.connect(db_path) as conn:
+        stored = conn.execute('SELECT COUNT(*) FROM faculties').fetchone()[0]
+        indexed = conn.execute('SELECT COUNT(DISTINCT faculty_id) FROM index_documents').fetchone()[0]
+
+    # per-record commits once per stored faculty; queue commits are counted by the writer
+    commits = writer.stats['commits'] - commits_before if writer_func is not per_record else len(faculties) - len(failures)
+    return {
+        'name': name, 'records': len(faculties), 'seconds': elapsed, 'failed': len(failures),
+        'commits': commits, 'stored': stored, 'indexed': indexed,
+    }
+
+
+def run(threads: int = 4, records: int = 500) -> bool:
+    logging.disable(logging.CRITICAL)
+    variants = [('per-record', per_record), ('queue sync', queue_sync), ('queue async', queue_async)]
+
+    print(f"✍️  Concurrent write benchmark: {threads} threads x {records} faculties, {os.cpu_count()} CPUs\n")
+    print(f"{'variant':>12} {'index drain':>12} {'records/s':>10} {'failed':>8} {'commits':>8} {'rec/commit':>11} "
+          f"{'stored':>8} {'indexed':>8}")
+
+    complete = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for drain_index in (False, True):
+            for name, writer_func in variants:
+                result = run_variant(name.replace(' ', '_'), writer_func, threads, records, workdir, drain_index)
+                print(f"{name:>12} {'yes' if drain_index else 'no':>12} {result['records'] / result['seconds']:>10.0f} "
+                      f"{result['failed']:>8} {result['commits']:>8} "
+                      f"{result['records'] / max(result['commits'], 1):>11.1f} {result['stored']:>8} "
+                      f"{result['indexed'] if drain_index else '-':>8}")
+                if name != 'per-record':
+                    complete = complete and result['failed'] == 0 and result['stored'] == result['records']
+                    complete = complete and (not drain_index or result['indexed'] == result['records'])
+
+    if not complete:
+        print("\n❌ The write queue lost records or left them unindexed")
+    return complete
+
+
+if __name__ == '__main__':
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=4, help='concurrent import threads (default: 4)')
+    parser.add_argument('--records', type=int, default=500, help='faculties written per thread (default: 500)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.threads, args.records) else 1)
@@ -0,0 +1,33 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+MANIFEST_PATH = os.path.join(FIXTURES_DIR, 'manifest.json')
+
+
+def load_fixture_pages(names: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Load the saved HTML corpus.
+
+    Each entry is the manifest record (url, stage, expected labels) plus
+    the 'fixture' name and its raw 'html'.
+    """
+    with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    pages = []
+    for entry in manifest['pages']:
+        fixture_name = os.path.splitext(os.path.basename(entry['file']))[0]
+        if names and fixture_name not in names:
+            continue
+
+        with open(os.path.join(FIXTURES_DIR, entry['file']), 'r', encoding='utf-8') as f:
+            html = f.read()
+
+        page = dict(entry)
+        page['fixture'] = fixture_name
+        page['html'] = html
+        pages.append(page)
+
+    return pages
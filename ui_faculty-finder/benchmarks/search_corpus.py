@@ -0,0 +1,105 @@
+"""
+Synthetic faculty corpus for search benchmarks.
+
+The real database only has ~17 faculties, far too few to show how search
+scales. This module generates any number of faculty records with the same
+shape as crawler output (name, url, description, faculty_type, programs,
+departments, contact) from Indonesian/English academic vocabulary, and can
+load them into a fresh database with the application schema.
+"""
+import random
+import sqlite3
+from typing import Dict, Iterator, List
+
+from database.models import DatabaseManager
+
+FIELDS_OF_STUDY = [
+    'Teknik Sipil', 'Teknik Mesin', 'Teknik Elektro', 'Teknik Kimia', 'Teknik Industri', 'Arsitektur',
+    'Ilmu Komputer', 'Sistem Informasi', 'Kedokteran', 'Kedokteran Gigi', 'Farmasi', 'Ilmu Keperawatan',
+    'Kesehatan Masyarakat', 'Gizi', 'Psikologi', 'Hukum', 'Ilmu Ekonomi', 'Manajemen', 'Akuntansi',
+    'Ilmu Politik', 'Sosiologi', 'Kriminologi', 'Ilmu Komunikasi', 'Hubungan Internasional',
+    'Ilmu Administrasi Negara', 'Sastra Indonesia', 'Sastra Inggris', 'Sejarah', 'Arkeologi', 'Filsafat',
+    'Linguistik', 'Matematika', 'Fisika', 'Kimia', 'Biologi', 'Geografi', 'Statistika', 'Geologi',
+    'Ilmu Lingkungan', 'Kajian Stratejik', 'Bioinformatika', 'Aktuaria', 'Metalurgi', 'Bioproses',
+]
+PROGRAM_LEVELS = ['Sarjana', 'Magister', 'Doktor', 'Profesi', 'Spesialis', 'Diploma']
+FACULTY_PREFIXES = ['Fakultas', 'Sekolah', 'Program Pendidikan', 'Departemen']
+FACULTY_TYPES = ['engineering', 'medical', 'social', 'science', 'humanities', 'business', 'law', 'general']
+DESCRIPTION_WORDS = [
+    'pendidikan', 'penelitian', 'pengabdian', 'masyarakat', 'unggul', 'internasional', 'riset',
+    'laboratorium', 'mahasiswa', 'dosen', 'kurikulum', 'akreditasi', 'inovasi', 'teknologi', 'kesehatan',
+    'ekonomi', 'budaya', 'sosial', 'lingkungan', 'kampus', 'depok', 'salemba', 'global', 'berkelanjutan',
+    'research', 'education', 'excellence', 'science', 'engineering', 'medicine', 'policy', 'data',
+    'komputasi', 'klinik', 'rumah', 'sakit', 'industri', 'kebijakan', 'publik', 'hukum', 'seni',
+]
+STREETS = ['Jl. Margonda Raya', 'Jl. Salemba Raya', 'Kampus UI Depok', 'Jl. Prof. Dr. Sudjono D. Pusponegoro']
+
+
+def generate_faculties(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield `count` crawler-shaped faculty records (deterministic for a seed)"""
+    rng = random.Random(seed)
+    for index in range(count):
+        field_of_study = rng.choice(FIELDS_OF_STUDY)
+        name = f"{rng.choice(FACULTY_PREFIXES)} {field_of_study} {index}"
+        description = ' '.join(rng.choice(DESCRIPTION_WORDS) for _ in range(rng.randint(15, 60)))
+        programs = [
+            f"{rng.choice(PROGRAM_LEVELS)} {rng.choice(FIELDS_OF_STUDY)}" for _ in range(rng.randint(2, 20))
+        ]
+        departments = [f"Departemen {rng.choice(FIELDS_OF_STUDY)}" for _ in range(rng.randint(0, 5))]
+        yield {
+            'name': name,
+            'url': f"https://synthetic-{index}.ui.ac.id/",
+            'description': f"{field_of_study} {description}",
+            'faculty_type': rng.choice(FACULTY_TYPES),
+            'programs': programs,
+            'departments': departments,
+            'contact': {
+                'email': f"info{index}@ui.ac.id",
+                'phone': f"(021) {rng.randint(7000000, 7999999)}",
+                'address': f"{rng.choice(STREETS)} No. {rng.randint(1, 200)}, Depok"
+            }
+        }
+
+
+def build_corpus_db(db_path: str, count: int, seed: int = 42) -> int:
+    """
+    Create the application schema at db_path and bulk load `count` synthetic
+    faculties (without search index). Returns the number of faculties.
+    """
+    DatabaseManager(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        for faculty in generate_faculties(count, seed):
+            cursor.execute('''
+                INSERT INTO faculties (name, url, description, faculty_type) VALUES (?, ?, ?, ?)
+            ''', (faculty['name'], faculty['url'], faculty['description'], faculty['faculty_type']))
+            faculty_id = cursor.lastrowid
+
+            cursor.executemany('INSERT INTO programs (faculty_id, name) VALUES (?, ?)',
+                               [(faculty_id, program) for program in faculty['programs']])
+            cursor.executemany('INSERT INTO departments (faculty_id, name) VALUES (?, ?)',
+                               [(faculty_id, department) for department in faculty['departments']])
+            contact = faculty['contact']
+            cursor.execute('INSERT INTO contacts (faculty_id, email, phone, address) VALUES (?, ?, ?, ?)',
+                           (faculty_id, contact['email'], contact['phone'], contact['address']))
+        conn.commit()
+
+        cursor.execute('SELECT COUNT(*) FROM faculties')
+        return cursor.fetchone()[0]
+
+
+def sample_queries() -> List[str]:
+    """Mix of single-term, multi-term and synonym queries used by the benchmarks"""
+    return [
+        'teknik', 'kedokteran gigi', 'ilmu komputer', 'hukum', 'psikologi', 'magister manajemen',
+        'farmasi', 'sastra inggris', 'kesehatan masyarakat', 'riset teknologi'
+    ]
+
+
+def partial_queries() -> List[str]:
+    """Partial-word and misspelled queries, answered through the trigram index"""
+    return [
+        'komput', 'kedokt', 'psikolgi', 'farma', 'akuntnsi', 'metalur', 'bioinfo', 'kriminolog',
+        'sastr ingg', 'statistk'
+    ]
@@ -4,14 +4,47 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'ui-faculty-finder-secret-key-2024'
     
     DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ui_faculty.db')
-    JSON_BACKUP_PATH = os.path.join(os.path.dirname(__file__), 'data', 'faculty_data.json')
+    JSON_BACKUP_PATH = os.path.join(os.path.dirname(__file__), 'data', 'faculty_data.jsonl')
+    # All writes go through one writer thread (database/writer.py) that group-commits queued operations
+    WRITE_QUEUE_MAX_BATCH = 256  # Operations per transaction
+    WRITE_QUEUE_COMMIT_DELAY = 0.0  # Seconds to wait for more operations before committing (0 = only coalesce queued ones)
     
     BASE_URL = 'https://www.ui.ac.id/'
     CRAWLER_DELAY = 1
     MAX_CRAWL_DEPTH = 6
     MAX_CRAWL_PAGES = 300
+    CRAWL_BUDGET_POLICY = 'adaptive'  # 'adaptive' or 'fixed'
+    CRAWLER_PAGE_CLASSIFIER = 'rules'  # 'rules' or 'vector' (NumPy feature-vector classifier)
+    
+    # Raw HTML of every fetched page, content-addressed and compressed, for offline reprocessing
+    PAGE_STORE_ENABLED = True
+    PAGE_STORE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'page_store')
+    PAGE_STORE_CODEC = 'zlib'  # 'zlib' or 'lzma'
     
     SEARCH_RESULTS_LIMIT = 20
+    SEARCH_WEIGHTING = 'bm25'  # 'bm25' or 'tfidf' (cosine-normalized); changing it needs a full index rebuild
+    # Per-field boosts folded into the stored postings scores (and the FTS5 bm25() column weights);
+    # changing them only rescales the existing scores at startup, no re-tokenization
+    SEARCH_FIELD_BOOSTS = {
+        'name': 5.0,
+        'program': 3.0,
+        'department': 2.5,
+        'description': 2.0,
+        'type': 2.0,
+        'contact': 1.0,
+    }
+    SEARCH_INDEX_WORKERS = min(4, os.cpu_count() or 1)  # Tokenizer processes for full index rebuilds (1 = in-process)
+    SEARCH_BACKEND = 'index'  # 'index' (inverted index + trigrams) or 'fts5' (SQLite FTS5 with bm25())
+    # Read-only binary snapshot of the inverted index, mmap'ed by the 'index' backend (None = search SQLite)
+    SEARCH_BINARY_INDEX_PATH = os.path.join(os.path.dirname(__file__), 'data', 'search_index.bin')
+    # Keep faculties and the inverted index in process memory; searches, suggestions and type listings
+    # skip SQLite, and the snapshot is reloaded in the background when the database's data_version changes
+    SEARCH_RESIDENT = True
+    SEARCH_RESIDENT_RELOAD_INTERVAL = 1.0  # Seconds between data_version checks
+    # LRU cache of search, suggestion and facet results per database (database/cache.py), emptied
+    # whenever an import, clear or reindex bumps the database's data version
+    QUERY_CACHE_SIZE = 1024  # Cached results (0 = no cache)
+    QUERY_CACHE_TTL = 300.0  # Seconds a cached result is served at most (None = until the data changes)
     MIN_SIMILARITY_SCORE = 0.1
     
     LOG_LEVEL = 'INFO'
@@ -35,6 +68,10 @@ class TestingConfig(Config):
     TESTING = True
     DATABASE_PATH = ':memory:'
     MAX_CRAWL_PAGES = 5
+    PAGE_STORE_ENABLED = False
+    SEARCH_BINARY_INDEX_PATH = None
+    SEARCH_INDEX_WORKERS = 1
+    SEARCH_RESIDENT = False
 
 config = {
     'development': DevelopmentConfig,
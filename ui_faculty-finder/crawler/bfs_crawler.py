@@ -8,11 +8,28 @@ import re
 from urllib.parse import urljoin, urlparse
 import logging
 import os
+from collections import Counter
+
+from crawler.budget import CrawlBudgetAllocator
+from database.journal import JournalWriter
+from crawler.page_scanner import scan_page
 
 class NaturalUIFacultyCrawler:
-    def __init__(self, base_url="https://www.ui.ac.id/", delay=1):
+    PAGE_CLASSIFIERS = ('rules', 'vector')
+
+    def __init__(self, base_url="https://www.ui.ac.id/", delay=1, budget_policy='adaptive', page_classifier='rules',
+                 page_store=None):
+        if page_classifier not in self.PAGE_CLASSIFIERS:
+            raise ValueError(f"Unknown page classifier: {page_classifier}")
+
         self.base_url = base_url
         self.delay = delay
+        self.budget_policy = budget_policy
+        self.page_classifier = page_classifier
+        self.page_store = page_store  # Optional RawPageStore keeping every fetched HTML body
+        self.crawl_id = None
+        self.journal = None  # JournalWriter streaming results while crawling
+        self.budget = None  # CrawlBudgetAllocator, created per crawl
         self.visited = set()
         self.faculty_data = []
         self.navigation_path = []  # Track navigation path
@@ -54,6 +71,13 @@ class NaturalUIFacultyCrawler:
             'https://sksg.ui.ac.id/',   # Sekolah Kajian Stratejik dan Global
         ]
         self.known_faculty_netlocs = {urlparse(fsd).netloc for fsd in self.known_faculty_subdomains if urlparse(fsd).netloc}
+        self._expected_faculty_names_lower = [name.lower() for name in self.expected_faculties]
+        self.full_dom_pages = 0  # Pages that needed a BeautifulSoup tree
+
+        self.vector_classifier = None
+        if page_classifier == 'vector':
+            from crawler.page_classifier import VectorPageClassifier  # Needs numpy, only imported when selected
+            self.vector_classifier = VectorPageClassifier(self)
 
         logging.basicConfig(
             level=logging.INFO,
@@ -103,21 +127,31 @@ class NaturalUIFacultyCrawler:
     
     def get_navigation_priority_links(self, soup, current_url):
         """Get navigation links with smart priority for natural crawling"""
+        anchors = []
+        for link in soup.find_all('a', href=True):
+            link_parent = link.find_parent(['nav', 'ul', 'li'])
+            parent_classes = str(link_parent.get('class', [])).lower() if link_parent else None
+            anchors.append((link['href'], link.get_text(), parent_classes))
+        return self.rank_navigation_links(anchors, current_url)
+    
+    def rank_navigation_links(self, anchors, current_url):
+        """
+        Score (href, link_text, parent_classes) anchors for natural crawling.
+        parent_classes is the class string of the closest nav/ul/li ancestor.
+        """
         links = []
-        current_url_lower = current_url.lower()
+        navigation_stage = self.detect_navigation_stage(current_url)
         
-        for link in soup.find_all('a', href=True):
-            href = link['href']
+        for href, raw_link_text, parent_classes in anchors:
             full_url = urljoin(current_url, href)
             
             if not self.is_valid_url(full_url) or full_url in self.visited:
                 continue
             
-            link_text = link.get_text().strip().lower()
+            link_text = raw_link_text.strip().lower()
             link_url_lower = full_url.lower()
             
             priority = 0
-            navigation_stage = self.detect_navigation_stage(current_url)
             
             # Stage 1: From homepage, prioritize "Akademik" links
             if navigation_stage == 'homepage':
@@ -188,9 +222,8 @@ class NaturalUIFacultyCrawler:
             if parsed_link_url.netloc in self.known_faculty_netlocs:
                 priority += 35  # Significant boost
             
-            link_parent = link.find_parent(['nav', 'ul', 'li'])
-            if link_parent and any(class_name in str(link_parent.get('class', [])).lower() 
-                                for class_name in ['menu', 'nav', 'navigation']):
+            if parent_classes and any(class_name in parent_classes
+                                      for class_name in ['menu', 'nav', 'navigation']):
                 priority += 10
             
             low_priority_keywords = [
@@ -536,179 +569,342 @@ class NaturalUIFacultyCrawler:
         """Detect faculty page type"""
         return self.detect_navigation_stage(url) # Simplified
     
-    def is_faculty_page(self, url, soup):
-        """Determine if current page is a faculty page"""
+    # --- is_faculty_page rule tables (compiled once, shared with the streaming pre-classifier) ---
+    GENERIC_LISTING_URL_PATTERNS = [re.compile(p) for p in [r'/akademik/fakultas/?$', r'/fakultas/?$']]
+
+    GENERIC_TITLE_PATTERNS = [re.compile(p) for p in [
+        r'^fakultas\s*-\s*universitas\s*indonesia\s*$', r'^fakultas\s*ui\s*$',
+        r'^daftar\s*fakultas', r'^fakultas\s*$',
+        r'^academic\s*-\s*universitas\s*indonesia\s*$', r'^academic\s*-\s*ui\s*$',
+        r'^akademik\s*-\s*universitas\s*indonesia\s*$', r'^akademik\s*ui\s*$',
+        r'^detail\s*fakultas\s*$'
+    ]]
+
+    DEAN_LEADERSHIP_URL_PATTERNS = [re.compile(p) for p in [
+        r'/(dekan|profil-dekan|sambutan-dekan)($|/|_)',
+        r'/(pimpinan|struktur-pimpinan|profil-pimpinan|manajemen)($|/|_)',
+        r'/staff($|/|[-_])(dosen|akademik|pengajar|list|direktori)?',
+        r'/dosen($|/|[-_])(profil|list|daftar)?',
+        r'/profil[-_](dosen|staf|pegawai)($|/)', r'/direktori[-_](dosen|staf|pegawai)($|/)',
+        r'/guru-besar($|/)'
+    ]]
+
+    DEAN_LEADERSHIP_TITLE_HEADING_KEYWORDS = [
+        'dekan fakultas', 'profil dekan', 'sambutan dekan', 'kata dekan', 'wakil dekan',
+        'pimpinan fakultas', 'struktur pimpinan', 'manajemen fakultas', 'profil pimpinan',
+        'daftar dosen', 'staff direktori', 'direktori dosen', 'profil dosen', 'guru besar kami',
+        'tenaga pengajar', 'staf pengajar', 'staf akademik', 'struktur organisasi universitas indonesia'
+    ]
+
+    DETAIL_PAGE_FACULTY_KEYWORDS = [
+        'kedokteran', 'teknik', 'hukum', 'ekonomi', 'psikologi', 'matematika', 'mipa', 'farmasi',
+        'administrasi', 'budaya', 'fib', 'keperawatan', 'fik', 'komputer', 'fasilkom', 'kesehatan', 'fkm',
+        'sosial', 'politik', 'fisip', 'gigi', 'fkg', 'vokasi', 'lingkungan', 'sil', 'kajian', 'stratejik', 'global', 'sksg'
+    ]
+
+    SPECIFIC_FACULTY_URL_PATTERNS = [re.compile(p) for p in [
+        'fk.ui.ac.id', 'ft.ui.ac.id', 'eng.ui.ac.id', 'fh.ui.ac.id', 'feb.ui.ac.id', 'psy.ui.ac.id',
+        'sci.ui.ac.id', 'fmipa.ui.ac.id', 'dent.ui.ac.id', 'fkg.ui.ac.id', 'fisip.ui.ac.id', 'fib.ui.ac.id',
+        'nursing.ui.ac.id', 'fik.ui.ac.id', 'cs.ui.ac.id', 'fasilkom.ui.ac.id', 'pubhealth.ui.ac.id', 'fkm.ui.ac.id',
+        'adm.ui.ac.id', 'fia.ui.ac.id', 'pharmacy.ui.ac.id', 'sil.ui.ac.id', 'sksg.ui.ac.id', 'vokasi.ui.ac.id', 'fvok.ui.ac.id',
+        r'/fakultas[/-](kedokteran|teknik|hukum|ekonomi|psikologi|matematika|farmasi|administrasi|budaya|keperawatan|komputer|kesehatan|sosial|gigi)',
+        r'/(fk|kedokteran)/', r'/(ft|teknik|engineering)/', r'/(fh|hukum|law)/', r'/(feb|ekonomi)/',
+        r'/(fpsi|psikologi)/', r'/(fmipa|sci|matematika)/', r'/(ff|farmasi|pharmacy)/', r'/(fia|adm|administrasi)/',
+        r'/(fib|budaya)/', r'/(fik|nursing|keperawatan)/', r'/(fasilkom|cs|komputer)/', r'/(fkm|pubhealth|kesehatan)/',
+        r'/(fisip|sosial|politik)/', r'/(fkg|dent|gigi)/', r'/(vokasi|fvok|vocational|diploma)/',
+        r'/(sil|lingkungan|environment)/', r'/(sksg|kajian|stratejik|strategic|global)/',
+        r'/program.*vokasi', r'/pendidikan.*vokasi', r'/sekolah.*lingkungan',
+        r'/sekolah.*kajian', r'/kajian.*stratejik', r'/stratejik.*global'
+    ]]
+
+    OG_SITE_NAME_KEYWORDS = ['fakultas', 'sekolah', 'program', 'faculty', 'school', 'vocational', 'vokasi', 'pharmacy', 'teknik', 'lingkungan']
+
+    SPECIFIC_FACULTY_CONTENT_INDICATORS = [
+        'dekan', 'dean', 'wakil dekan', 'vice dean', 'pimpinan fakultas', 'struktur organisasi fakultas',
+        'organisasi fakultas', 'senat akademik fakultas', 'sejarah fakultas', 'visi misi fakultas', 'profil fakultas',
+        'tentang fakultas', 'sejarah sekolah', 'visi misi sekolah', 'profil sekolah', 'tentang sekolah',
+        'sejarah program', 'visi misi program', 'profil program', 'tentang program', 'program studi', 'prodi',
+        'departemen', 'department', 'jurusan', 'guru besar', 'dosen tetap fakultas', 'direktur program',
+        'ketua program studi', 'kepala sekolah', 'direktur sekolah', 'program vokasi', 'pendidikan vokasi',
+        'program diploma', 'ilmu lingkungan', 'kajian stratejik', 'kajian global', 'fakultas farmasi ui', 'sekolah ilmu lingkungan ui'
+    ]
+
+    HIERARCHY_INDICATORS = ['kaprodi', 'ketua departemen', 'sekretaris fakultas']
+
+    FACULTY_SECTION_CLASS_PATTERN = re.compile(r'(faculty|fakultas|academic|dean|sekolah|program|departemen|department)', re.I)
+
+    PROGRAM_LIST_KEYWORDS = ['program studi', 'sarjana', 'magister', 'doktor', 'diploma', 'spesialis', 'profesi']
+
+    PROGRAM_LEVEL_KEYWORDS = ['sarjana (s1)', 's1-', 'magister (s2)', 's2-', 'doktor (s3)', 's3-', 'program profesi', 'program spesialis', 'program diploma']
+
+    VERY_GENERIC_TITLES = ['kontak', 'berita', 'artikel', 'pengumuman', 'agenda', 'login', 'pendaftaran']
+
+    FACULTY_PAGE_THRESHOLD = 35  # Root/other subdomain thresholds (60/55) are above this, so it decides alone
+    DOM_SIGNAL_MAX_SCORE = 20  # Faculty sections (10) + program list (10): only known after building the DOM
+
+    def _is_excluded_faculty_page(self, url, title_text_lower, main_heading_text_lower, page_text_lower):
+        """Exclusion rules of is_faculty_page (listing, generic, dean/staff pages)"""
         url_lower = url.lower()
-        page_text_lower = soup.get_text().lower() 
-        title_tag = soup.find('title')
-        title_text_lower = title_tag.get_text().strip().lower() if title_tag else ""
 
-        # --- Exclusion Rules ---
-        generic_faculty_listing_url_patterns = [r'/akademik/fakultas/?$', r'/fakultas/?$']
-        if any(re.search(pattern, url_lower) for pattern in generic_faculty_listing_url_patterns):
-            return False
-        
-        generic_titles = [
-            r'^fakultas\s*-\s*universitas\s*indonesia\s*$', r'^fakultas\s*ui\s*$',
-            r'^daftar\s*fakultas', r'^fakultas\s*$',
-            r'^academic\s*-\s*universitas\s*indonesia\s*$', r'^academic\s*-\s*ui\s*$',
-            r'^akademik\s*-\s*universitas\s*indonesia\s*$', r'^akademik\s*ui\s*$',
-            r'^detail\s*fakultas\s*$' 
-        ]
-        if any(re.search(pattern, title_text_lower) for pattern in generic_titles):
-            return False
+        if any(pattern.search(url_lower) for pattern in self.GENERIC_LISTING_URL_PATTERNS):
+            return True
 
-        parsed_page_url_for_exclusion_check = urlparse(url)
-        page_netloc_for_exclusion = parsed_page_url_for_exclusion_check.netloc
-        is_root_of_known_subdomain_for_exclusion = (page_netloc_for_exclusion in self.known_faculty_netlocs and
-                                                    parsed_page_url_for_exclusion_check.path.strip('/') == '')
-
-        dean_leadership_url_patterns = [
-            r'/(dekan|profil-dekan|sambutan-dekan)($|/|_)',
-            r'/(pimpinan|struktur-pimpinan|profil-pimpinan|manajemen)($|/|_)',
-            r'/staff($|/|[-_])(dosen|akademik|pengajar|list|direktori)?',
-            r'/dosen($|/|[-_])(profil|list|daftar)?',
-            r'/profil[-_](dosen|staf|pegawai)($|/)', r'/direktori[-_](dosen|staf|pegawai)($|/)',
-            r'/guru-besar($|/)'
-        ]
-        if not is_root_of_known_subdomain_for_exclusion:
-            if any(re.search(pattern, url_lower) for pattern in dean_leadership_url_patterns):
-                return False
+        if any(pattern.search(title_text_lower) for pattern in self.GENERIC_TITLE_PATTERNS):
+            return True
 
-        main_heading_text_lower = ""
-        h1 = soup.find('h1')
-        if h1: main_heading_text_lower += h1.get_text().strip().lower() + " "
-        h2 = soup.find('h2') 
-        if h2: main_heading_text_lower += h2.get_text().strip().lower()
+        parsed_url = urlparse(url)
+        is_root_of_known_subdomain = (parsed_url.netloc in self.known_faculty_netlocs and
+                                      parsed_url.path.strip('/') == '')
+
+        if not is_root_of_known_subdomain:
+            if any(pattern.search(url_lower) for pattern in self.DEAN_LEADERSHIP_URL_PATTERNS):
+                return True
 
-        dean_leadership_title_heading_keywords = [
-            'dekan fakultas', 'profil dekan', 'sambutan dekan', 'kata dekan', 'wakil dekan',
-            'pimpinan fakultas', 'struktur pimpinan', 'manajemen fakultas', 'profil pimpinan',
-            'daftar dosen', 'staff direktori', 'direktori dosen', 'profil dosen', 'guru besar kami',
-            'tenaga pengajar', 'staf pengajar', 'staf akademik', 'struktur organisasi universitas indonesia'
-        ]
-        if not is_root_of_known_subdomain_for_exclusion:
             page_title_or_heading_is_dean_focused = any(keyword in title_text_lower or keyword in main_heading_text_lower
-                                                        for keyword in dean_leadership_title_heading_keywords)
+                                                        for keyword in self.DEAN_LEADERSHIP_TITLE_HEADING_KEYWORDS)
             if page_title_or_heading_is_dean_focused:
-                return False
-        
+                return True
+
         if 'detail fakultas' in title_text_lower or ('detail fakultas' in page_text_lower and len(page_text_lower) < 1000):
-            specific_faculty_name_keywords_in_detail = [
-                'kedokteran', 'teknik', 'hukum', 'ekonomi', 'psikologi', 'matematika', 'mipa', 'farmasi', 
-                'administrasi', 'budaya', 'fib', 'keperawatan', 'fik', 'komputer', 'fasilkom', 'kesehatan', 'fkm',
-                'sosial', 'politik', 'fisip', 'gigi', 'fkg', 'vokasi', 'lingkungan', 'sil', 'kajian', 'stratejik', 'global', 'sksg'
-            ]
-            if not any(specific_keyword in page_text_lower for specific_keyword in specific_faculty_name_keywords_in_detail) and \
-               not any(specific_keyword in title_text_lower for specific_keyword in specific_faculty_name_keywords_in_detail):
-                return False
-        
-        # --- Positive Identification Scoring System ---
+            if not any(specific_keyword in page_text_lower for specific_keyword in self.DETAIL_PAGE_FACULTY_KEYWORDS) and \
+               not any(specific_keyword in title_text_lower for specific_keyword in self.DETAIL_PAGE_FACULTY_KEYWORDS):
+                return True
+
+        return False
+
+    def _faculty_text_score(self, url, page_text_lower, og_site_name, og_type):
+        """Positive score from URL, meta tags and page text (everything except DOM structure)"""
         faculty_score = 0
+        url_lower = url.lower()
         parsed_page_url = urlparse(url)
-        page_netloc = parsed_page_url.netloc
-        is_on_known_faculty_subdomain = page_netloc in self.known_faculty_netlocs
+        is_on_known_faculty_subdomain = parsed_page_url.netloc in self.known_faculty_netlocs
         is_root_of_known_subdomain = is_on_known_faculty_subdomain and (parsed_page_url.path.strip('/') == '')
 
-        if is_on_known_faculty_subdomain: faculty_score += 50 
+        if is_on_known_faculty_subdomain: faculty_score += 50
         if is_root_of_known_subdomain: faculty_score += 10
 
-        specific_faculty_url_patterns = [
-            'fk.ui.ac.id', 'ft.ui.ac.id', 'eng.ui.ac.id', 'fh.ui.ac.id', 'feb.ui.ac.id', 'psy.ui.ac.id',
-            'sci.ui.ac.id', 'fmipa.ui.ac.id', 'dent.ui.ac.id', 'fkg.ui.ac.id', 'fisip.ui.ac.id', 'fib.ui.ac.id',
-            'nursing.ui.ac.id', 'fik.ui.ac.id', 'cs.ui.ac.id', 'fasilkom.ui.ac.id', 'pubhealth.ui.ac.id', 'fkm.ui.ac.id',
-            'adm.ui.ac.id', 'fia.ui.ac.id', 'pharmacy.ui.ac.id', 'sil.ui.ac.id', 'sksg.ui.ac.id', 'vokasi.ui.ac.id', 'fvok.ui.ac.id',
-            r'/fakultas[/-](kedokteran|teknik|hukum|ekonomi|psikologi|matematika|farmasi|administrasi|budaya|keperawatan|komputer|kesehatan|sosial|gigi)',
-            r'/(fk|kedokteran)/', r'/(ft|teknik|engineering)/', r'/(fh|hukum|law)/', r'/(feb|ekonomi)/', 
-            r'/(fpsi|psikologi)/', r'/(fmipa|sci|matematika)/', r'/(ff|farmasi|pharmacy)/', r'/(fia|adm|administrasi)/',
-            r'/(fib|budaya)/', r'/(fik|nursing|keperawatan)/', r'/(fasilkom|cs|komputer)/', r'/(fkm|pubhealth|kesehatan)/', 
-            r'/(fisip|sosial|politik)/', r'/(fkg|dent|gigi)/', r'/(vokasi|fvok|vocational|diploma)/',
-            r'/(sil|lingkungan|environment)/', r'/(sksg|kajian|stratejik|strategic|global)/',
-            r'/program.*vokasi', r'/pendidikan.*vokasi', r'/sekolah.*lingkungan',
-            r'/sekolah.*kajian', r'/kajian.*stratejik', r'/stratejik.*global'
-        ]
-        if any(re.search(pattern, url_lower) for pattern in specific_faculty_url_patterns): faculty_score += 30
-        
-        og_site_name_tag = soup.find('meta', property='og:site_name')
-        if og_site_name_tag and og_site_name_tag.get('content'):
-            og_site_name_content = og_site_name_tag.get('content').lower()
-            if any(keyword in og_site_name_content for keyword in ['fakultas', 'sekolah', 'program', 'faculty', 'school', 'vocational', 'vokasi', 'pharmacy', 'teknik', 'lingkungan']):
+        if any(pattern.search(url_lower) for pattern in self.SPECIFIC_FACULTY_URL_PATTERNS): faculty_score += 30
+
+        if og_site_name:
+            og_site_name_content = og_site_name.lower()
+            if any(keyword in og_site_name_content for keyword in self.OG_SITE_NAME_KEYWORDS):
                 faculty_score += 15
 
-        og_type_tag = soup.find('meta', property='og:type')
-        if og_type_tag and og_type_tag.get('content', '').lower() == 'school': faculty_score += 10
-
-        specific_faculty_content_indicators = [
-            'dekan', 'dean', 'wakil dekan', 'vice dean', 'pimpinan fakultas', 'struktur organisasi fakultas',
-            'organisasi fakultas', 'senat akademik fakultas', 'sejarah fakultas', 'visi misi fakultas', 'profil fakultas',
-            'tentang fakultas', 'sejarah sekolah', 'visi misi sekolah', 'profil sekolah', 'tentang sekolah',
-            'sejarah program', 'visi misi program', 'profil program', 'tentang program', 'program studi', 'prodi',
-            'departemen', 'department', 'jurusan', 'guru besar', 'dosen tetap fakultas', 'direktur program',
-            'ketua program studi', 'kepala sekolah', 'direktur sekolah', 'program vokasi', 'pendidikan vokasi',
-            'program diploma', 'ilmu lingkungan', 'kajian stratejik', 'kajian global', 'fakultas farmasi ui', 'sekolah ilmu lingkungan ui'
-        ]
-        content_specific_matches = sum(1 for indicator in specific_faculty_content_indicators if indicator in page_text_lower)
+        if og_type and og_type.lower() == 'school': faculty_score += 10
+
+        content_specific_matches = sum(1 for indicator in self.SPECIFIC_FACULTY_CONTENT_INDICATORS if indicator in page_text_lower)
         if content_specific_matches >= 3: faculty_score += 25
         elif content_specific_matches >= 1: faculty_score += 15
+
+        if any(expected_name in page_text_lower for expected_name in self._expected_faculty_names_lower): faculty_score += 20
+
+        if sum(1 for indicator in self.HIERARCHY_INDICATORS if indicator in page_text_lower) >= 1: faculty_score += 10
+
+        program_level_hits = sum(1 for keyword in self.PROGRAM_LEVEL_KEYWORDS if keyword in page_text_lower)
+        if program_level_hits >= 2: faculty_score += 15
+        elif program_level_hits == 1: faculty_score += 5
+
+        return faculty_score
+
+    def is_faculty_candidate(self, url, scan):
+        """
+        Cheap pre-classification from a streaming PageScan.
+
+        Applies the exclusion rules and an upper bound of the is_faculty_page
+        score (DOM-only signals counted at their maximum), so a page rejected
+        here can never pass is_faculty_page and does not need a full DOM.
+        """
+        title_text_lower = scan.title.strip().lower()
+        page_text_lower = scan.text_lower
+
+        if self._is_excluded_faculty_page(url, title_text_lower, scan.main_heading_lower, page_text_lower):
+            return False
+
+        score_upper_bound = self._faculty_text_score(
+            url, page_text_lower, scan.meta.get('og:site_name'), scan.meta.get('og:type')
+        ) + self.DOM_SIGNAL_MAX_SCORE
+        return score_upper_bound >= self.FACULTY_PAGE_THRESHOLD
+
+    def is_faculty_page(self, url, soup):
+        """Determine if current page is a faculty page"""
+        page_text_lower = soup.get_text().lower() 
+        title_tag = soup.find('title')
+        title_text_lower = title_tag.get_text().strip().lower() if title_tag else ""
+
+        main_heading_text_lower = ""
+        h1 = soup.find('h1')
+        if h1: main_heading_text_lower += h1.get_text().strip().lower() + " "
+        h2 = soup.find('h2') 
+        if h2: main_heading_text_lower += h2.get_text().strip().lower()
+
+        # --- Exclusion Rules ---
+        if self._is_excluded_faculty_page(url, title_text_lower, main_heading_text_lower, page_text_lower):
+            return False
         
-        if any(expected_name.lower() in page_text_lower for expected_name in self.expected_faculties): faculty_score += 20
-        
-        hierarchy_indicators = ['kaprodi', 'ketua departemen', 'sekretaris fakultas']
-        if sum(1 for indicator in hierarchy_indicators if indicator in page_text_lower) >= 1: faculty_score += 10
+        # --- Positive Identification Scoring System ---
+        og_site_name_tag = soup.find('meta', property='og:site_name')
+        og_type_tag = soup.find('meta', property='og:type')
+        faculty_score = self._faculty_text_score(
+            url, page_text_lower,
+            og_site_name_tag.get('content') if og_site_name_tag else None,
+            og_type_tag.get('content', '') if og_type_tag else None
+        )
 
         faculty_sections_found = False
-        for section_tag in soup.find_all(['div', 'section'], class_=re.compile(r'(faculty|fakultas|academic|dean|sekolah|program|departemen|department)', re.I), limit=5):
+        for section_tag in soup.find_all(['div', 'section'], class_=self.FACULTY_SECTION_CLASS_PATTERN, limit=5):
             if len(section_tag.get_text(strip=True)) > 100: faculty_sections_found = True; break
         if faculty_sections_found: faculty_score += 10
         
         program_list_found = False
         for ul_ol in soup.find_all(['ul', 'ol'], limit=10):
             ul_ol_text = ul_ol.get_text(" ", strip=True).lower()
-            if any(prog_keyword in ul_ol_text for prog_keyword in ['program studi', 'sarjana', 'magister', 'doktor', 'diploma', 'spesialis', 'profesi']):
+            if any(prog_keyword in ul_ol_text for prog_keyword in self.PROGRAM_LIST_KEYWORDS):
                 if len(ul_ol.find_all('li')) > 1: program_list_found = True; break
         if program_list_found: faculty_score += 10
 
-        program_level_keywords = ['sarjana (s1)', 's1-', 'magister (s2)', 's2-', 'doktor (s3)', 's3-', 'program profesi', 'program spesialis', 'program diploma']
-        program_level_hits = sum(1 for keyword in program_level_keywords if keyword in page_text_lower)
-        if program_level_hits >= 2: faculty_score += 15
-        elif program_level_hits == 1: faculty_score += 5
-
         # --- Final Decision ---
-        is_faculty = False
-        faculty_page_threshold_on_subdomain_root = 60 
-        faculty_page_threshold_on_subdomain_other = 55 
-        faculty_page_threshold_general = 35     
-
-        if is_root_of_known_subdomain:
-            if faculty_score >= faculty_page_threshold_on_subdomain_root: is_faculty = True
-        elif is_on_known_faculty_subdomain: 
-            if faculty_score >= faculty_page_threshold_on_subdomain_other: is_faculty = True
+        is_faculty = faculty_score >= self.FACULTY_PAGE_THRESHOLD
         
-        if not is_faculty and faculty_score >= faculty_page_threshold_general: is_faculty = True
-        
-        very_generic_titles_final_check = ['kontak', 'berita', 'artikel', 'pengumuman', 'agenda', 'login', 'pendaftaran']
-        if is_faculty and any(vg_title in title_text_lower for vg_title in very_generic_titles_final_check) and faculty_score < 70:
+        if is_faculty and any(vg_title in title_text_lower for vg_title in self.VERY_GENERIC_TITLES) and faculty_score < 70:
             if len(soup.find_all('article')) > 3 and 'fakultas' not in title_text_lower and 'sekolah' not in title_text_lower:
                 is_faculty = False
         
         return is_faculty
     
-    def natural_crawl_bfs(self, max_depth=6, max_pages=100):
+    def process_page(self, url, html_content):
+        """Classify one fetched page and extract its faculty info, returns (scan, faculty_info or None)"""
+        # Tier 1: streaming pass for links and pre-classification.
+        # Tier 2: full DOM only for pages that can still be faculty pages.
+        scan = scan_page(html_content)
+        soup = None
+        if self.vector_classifier is not None:
+            # Vector classifier decides from the scan alone, DOM only for extraction
+            is_faculty = self.vector_classifier.classify(url, scan)
+            if is_faculty:
+                soup = BeautifulSoup(html_content, 'html.parser')
+                self.full_dom_pages += 1
+        else:
+            if self.is_faculty_candidate(url, scan):
+                soup = BeautifulSoup(html_content, 'html.parser')
+                self.full_dom_pages += 1
+            is_faculty = soup is not None and self.is_faculty_page(url, soup)
+        
+        faculty_info = self.extract_faculty_info(url, soup) if is_faculty else None
+        return scan, faculty_info
+    
+    def _record_faculty(self, faculty_info):
+        """Add a newly found faculty, returns (new_faculties, all_found)"""
+        if not faculty_info or not faculty_info['name']:
+            return 0, False
+        
+        if faculty_info['name'] in [f['name'] for f in self.faculty_data]:
+            self.logger.info(f"⚠️ DUPLICATE FACULTY SKIPPED: {faculty_info['name']}")
+            return 0, False
+        
+        self.faculty_data.append(faculty_info)
+        if self.journal is not None:
+            self.journal.write('faculty', faculty_info)
+        self.logger.info(f"✅ FOUND FACULTY: {faculty_info['name']}")
+        self.logger.info(f"   📍 Discovery Path: {' -> '.join([step['name'] for step in faculty_info['navigation_path']])}")
+        self.logger.info(f"   📊 Programs: {len(faculty_info['programs'])}, Contact: {bool(faculty_info['contact'])}")
+        self.logger.info(f"   🎯 Progress: {len(self.faculty_data)}/{len(self.expected_faculties)} faculties found")
+        
+        current_found_faculty_names = {f['name'] for f in self.faculty_data}
+        return 1, self.expected_faculties.issubset(current_found_faculty_names)
+    
+    def reprocess(self, crawl_id=None):
+        """
+        Re-run classification and extraction over a crawl kept in the page store.
+        
+        Pages are replayed in their original fetch order from local disk, so
+        heuristic changes can be evaluated without touching the network.
+        """
+        if self.page_store is None:
+            raise ValueError("reprocess needs a page_store")
+        
+        crawl_id = crawl_id or self.page_store.latest_crawl_id()
+        if not crawl_id:
+            raise ValueError("No stored crawl to reprocess")
+        
+        self.crawl_id = crawl_id
+        self.visited = set()
+        self.faculty_data = []
+        self.queue_history = []
+        self.full_dom_pages = 0
+        
+        self.logger.info(f"♻️ Reprocessing stored crawl {crawl_id} (no network)")
+        start_time = time.time()
+        pages = 0
+        for page in self.page_store.iter_pages(crawl_id):
+            pages += 1
+            self.visited.add(page['url'])
+            self.queue_history.append({
+                'url': page['url'], 'depth': page['depth'], 'stage': page['stage'],
+                'queue_size': 0, 'visited_count': len(self.visited)
+            })
+            _, faculty_info = self.process_page(page['url'], page['html'])
+            self._record_faculty(faculty_info)
+        
+        self.logger.info(f"♻️ Reprocessed {pages} pages in {time.time() - start_time:.2f}s: "
+                         f"{len(self.faculty_data)} faculties ({self.full_dom_pages} needed a full DOM)")
+        return self.faculty_data
+    
+    def start_journal(self, filename):
+        """Stream faculties and page events to a JSONL journal while crawling"""
+        self.journal = JournalWriter(
+            filename, 'crawl', method='Natural BFS Navigation', base_url=self.base_url,
+            page_classifier=self.page_classifier, budget_policy=self.budget_policy
+        )
+        self.logger.info(f"📝 Journaling crawl results to {filename}")
+        return self.journal
+    
+    def natural_crawl_bfs(self, max_depth=6, max_pages=100, journal_path=None):
         """Natural BFS crawling following UI website navigation, stops when all faculties are found"""
+        if journal_path:
+            self.start_journal(journal_path)
+        
         queue = deque([(self.base_url, 0, 'homepage')])
+        deferred = deque()  # Items denied by the budget allocator, retried after rebalancing
         pages_crawled = 0
+        self.budget = CrawlBudgetAllocator(
+            max_pages, policy=self.budget_policy,
+            exempt_hosts={CrawlBudgetAllocator.host_of(self.base_url)}, logger=self.logger
+        )
         
         self.logger.info(f"🚀 Starting ENHANCED NATURAL BFS crawl from {self.base_url}")
         self.logger.info(f"📊 Following natural navigation: Homepage -> Akademik -> Fakultas -> Individual Faculty")
-        self.logger.info(f"🎯 Parameters: max_depth={max_depth}, max_pages={max_pages}")
+        self.logger.info(f"🎯 Parameters: max_depth={max_depth}, max_pages={max_pages}, "
+                         f"budget_policy={self.budget_policy}, page_classifier={self.page_classifier}")
         self.logger.info(f"🔍 TARGET: Find all {len(self.expected_faculties)} faculties")
         
-        while queue and pages_crawled < max_pages:
+        if self.page_store is not None:
+            self.crawl_id = self.page_store.start_crawl(self.base_url)
+        
+        while pages_crawled < max_pages:
+            if not queue:
+                if not deferred:
+                    break
+                # Queue drained: give the remaining budget to the stages still waiting
+                self.budget.rebalance(Counter(item[2] for item in deferred))
+                # One pass splits the deferred URLs into retried and still denied
+                retry, still_deferred = [], deque()
+                for item in deferred:
+                    (retry if self.budget.allow_fetch(item[0], item[2]) else still_deferred).append(item)
+                if not retry:
+                    self.logger.info(f"💰 Budget exhausted for {len(deferred)} deferred URLs, stopping")
+                    break
+                deferred = still_deferred
+                queue.extend(retry)
+            
             current_url, depth, stage = queue.popleft()
             
             if current_url in self.visited or depth > max_depth:
                 continue
             
+            if not self.budget.allow_fetch(current_url, stage):
+                deferred.append((current_url, depth, stage))
+                continue
+            
             self.visited.add(current_url)
             self.logger.info(f"🔍 [{stage.upper()}] Depth {depth}: {current_url}")
             
@@ -719,34 +915,30 @@ class NaturalUIFacultyCrawler:
             
             html_content = self.get_page_content(current_url)
             if not html_content:
+                # Failed fetches use budget too: a host that keeps timing out gets closed
+                self.budget.record_failure(current_url, stage)
                 continue
             
-            soup = BeautifulSoup(html_content, 'html.parser')
             pages_crawled += 1
+            if self.page_store is not None:
+                self.page_store.add_page(self.crawl_id, current_url, html_content, depth, stage)
             
-            if self.is_faculty_page(current_url, soup):
-                faculty_info = self.extract_faculty_info(current_url, soup)
-                if faculty_info and faculty_info['name']:
-                    if faculty_info['name'] not in [f['name'] for f in self.faculty_data]:
-                        self.faculty_data.append(faculty_info)
-                        self.logger.info(f"✅ FOUND FACULTY: {faculty_info['name']}")
-                        self.logger.info(f"   📍 Discovery Path: {' -> '.join([step['name'] for step in faculty_info['navigation_path']])}")
-                        self.logger.info(f"   📊 Programs: {len(faculty_info['programs'])}, Contact: {bool(faculty_info['contact'])}")
-                        self.logger.info(f"   🎯 Progress: {len(self.faculty_data)}/{len(self.expected_faculties)} faculties found")
-
-                        current_found_faculty_names = {f['name'] for f in self.faculty_data}
-                        if self.expected_faculties.issubset(current_found_faculty_names):
-                            self.logger.info(
-                                f"🎉🎉🎉 All {len(self.expected_faculties)} expected faculties have been found! Halting crawl."
-                            )
-                            break 
-                    else:
-                        self.logger.info(f"⚠️ DUPLICATE FACULTY SKIPPED: {faculty_info['name']}")
+            scan, faculty_info = self.process_page(current_url, html_content)
+            new_faculties, all_found = self._record_faculty(faculty_info)
+            if self.journal is not None:
+                self.journal.write('page', dict(self.queue_history[-1], new_faculties=new_faculties))
+            
+            self.budget.record_fetch(current_url, stage, new_faculties)
+            
+            if all_found:
+                self.logger.info(
+                    f"🎉🎉🎉 All {len(self.expected_faculties)} expected faculties have been found! Halting crawl."
+                )
+                break
             
             if depth < max_depth:
-                priority_links = self.get_navigation_priority_links(soup, current_url)
-                max_links_per_stage = {'homepage': 10, 'akademik': 15, 'fakultas_list': 30, 'specific_faculty': 10, 'other': 8}
-                max_links = max_links_per_stage.get(stage, 8)
+                priority_links = self.rank_navigation_links(scan.anchors, current_url)
+                max_links = self.budget.link_quota(stage)
                 
                 added_count = 0
                 for link_url, priority, link_text, _ in priority_links:
@@ -755,11 +947,20 @@ class NaturalUIFacultyCrawler:
                         queue.append((link_url, depth + 1, next_stage))
                         added_count += 1
             
+            if self.budget.should_rebalance():
+                self.budget.rebalance(Counter(item[2] for item in list(queue) + list(deferred)))
+            
             time.sleep(self.delay)
         
+        if self.page_store is not None:
+            self.page_store.finish_crawl(self.crawl_id)
+        
         self.logger.info(f"🏁 Enhanced natural crawling completed!")
         self.logger.info(f"📈 Results: {len(self.faculty_data)} faculties discovered naturally")
-        self.logger.info(f"📄 Pages crawled: {pages_crawled}")
+        self.logger.info(f"📄 Pages crawled: {pages_crawled} ({self.full_dom_pages} needed a full DOM)")
+        budget_summary = self.budget.summary()
+        self.logger.info(f"💰 Budget efficiency ({budget_summary['policy']}): "
+                         f"{budget_summary['faculties_per_page']} faculties/page")
         
         found_names = {f['name'] for f in self.faculty_data}
         missing_faculties = [expected for expected in self.expected_faculties if expected not in found_names and 
@@ -774,26 +975,38 @@ class NaturalUIFacultyCrawler:
 
         return self.faculty_data
     
-    def save_results(self, filename='data/natural_faculty_data.json'):
-        """Save crawling results"""
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        save_data = {
-            'crawl_info': {
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'method': 'Natural BFS Navigation',
-                'base_url': self.base_url,
-                'total_faculties': len(self.faculty_data),
-                'pages_crawled': len(self.visited),
-                'navigation_stages': self.get_stage_summary()
-            },
-            'faculties': self.faculty_data,
-            'crawl_path': self.queue_history[-20:]  # Last 20 crawl steps
+    def save_results(self, filename='data/natural_faculty_data.jsonl'):
+        """
+        Save crawling results as a JSONL journal.
+        
+        If the crawl was already journaled to this file only the footer
+        (crawl summary) is appended; otherwise the journal is written now,
+        one record per faculty and crawl step.
+        """
+        crawl_info = {
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'method': 'Natural BFS Navigation',
+            'base_url': self.base_url,
+            'crawl_id': self.crawl_id,
+            'total_faculties': len(self.faculty_data),
+            'pages_crawled': len(self.visited),
+            'navigation_stages': self.get_stage_summary(),
+            'page_classifier': self.page_classifier,
+            'budget': self.budget.summary() if self.budget else None
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        journal = self.journal
+        if journal is None or journal.closed or os.path.abspath(journal.path) != os.path.abspath(filename):
+            journal = JournalWriter(
+                filename, 'crawl', method='Natural BFS Navigation', base_url=self.base_url,
+                page_classifier=self.page_classifier, budget_policy=self.budget_policy
+            )
+            for faculty in self.faculty_data:
+                journal.write('faculty', faculty)
+            for step in self.queue_history:
+                journal.write('page', step)
         
+        journal.close(crawl_info=crawl_info)
         self.logger.info(f"💾 Results saved to {filename}")
     
     def get_stage_summary(self):
@@ -809,7 +1022,11 @@ class NaturalUIFacultyCrawler:
         summary = {
             'total_faculties': len(self.faculty_data),
             'pages_visited': len(self.visited),
+            'full_dom_pages': self.full_dom_pages,
+            'page_classifier': self.page_classifier,
+            'crawl_id': self.crawl_id,
             'navigation_stages': self.get_stage_summary(),
+            'budget': self.budget.summary() if self.budget else None,
             'discovery_paths': [],
             'faculties': []
         }
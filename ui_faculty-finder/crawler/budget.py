@@ -0,0 +1,282 @@
+# budget.py
+import logging
+from collections import Counter, deque
+from urllib.parse import urlparse
+from typing import Dict, List, Optional
+
+
+class CrawlBudgetAllocator:
+    """
+    Divides the crawl page budget across navigation stages and hosts.
+
+    Policies:
+    - 'fixed'    : static budgets that are never rebalanced. Links enqueued per
+                   page follow the old ``max_links_per_stage`` quotas, but unlike
+                   the old crawler, fetched pages are also capped per stage
+                   (``stage_budget``, from the stage shares) and per host
+                   (``base_host_budget``, ``host_share`` of ``total_pages``;
+                   exempt hosts are uncapped). The crawler defers URLs that
+                   ``allow_fetch`` refuses.
+    - 'adaptive' : periodically shifts the remaining budget toward the stages
+                   and hosts that are still producing new faculties.
+
+    Failed fetches (``record_failure``) use stage and host budget like fetched
+    pages, and under both policies a host that fails ``max_host_failures``
+    times in a row is closed, so an unreachable host cannot be retried forever.
+
+    Every allocation decision is kept in ``decisions`` (and logged) so crawl
+    efficiency (faculties found per page fetched) can be compared across policies.
+    """
+
+    STAGES = ('homepage', 'akademik', 'fakultas_list', 'specific_faculty', 'other')
+
+    # Initial share of the page budget per stage
+    DEFAULT_STAGE_SHARES = {
+        'homepage': 0.05, 'akademik': 0.15, 'fakultas_list': 0.20,
+        'specific_faculty': 0.45, 'other': 0.15
+    }
+
+    # Links enqueued per fetched page (the previous hard-coded split)
+    DEFAULT_LINK_QUOTAS = {
+        'homepage': 10, 'akademik': 15, 'fakultas_list': 30, 'specific_faculty': 10, 'other': 8
+    }
+
+    POLICIES = ('fixed', 'adaptive')
+
+    def __init__(self, total_pages: int, policy: str = 'adaptive', stage_shares: Optional[Dict[str, float]] = None,
+                 host_share: float = 0.2, min_stage_share: float = 0.02, rebalance_every: int = 10,
+                 host_patience: int = 4, decay: float = 0.7, max_host_failures: int = 3, exempt_hosts=None,
+                 logger=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown budget policy: {policy}")
+
+        self.total_pages = max(1, int(total_pages))
+        self.policy = policy
+        self.host_share = host_share
+        self.min_stage_share = min_stage_share
+        self.rebalance_every = max(1, rebalance_every)
+        self.host_patience = host_patience
+        self.decay = decay
+        self.max_host_failures = max(1, max_host_failures)
+        self.logger = logger or logging.getLogger(__name__)
+
+        shares = dict(stage_shares or self.DEFAULT_STAGE_SHARES)
+        share_total = sum(shares.get(stage, 0) for stage in self.STAGES) or 1.0
+        self.stage_budget = {
+            stage: max(1, int(round(self.total_pages * shares.get(stage, 0) / share_total)))
+            for stage in self.STAGES
+        }
+
+        self.base_host_budget = max(3, int(self.total_pages * host_share))
+        self.host_budget = {}
+        self.exempt_hosts = {host.lower() for host in (exempt_hosts or ())}  # e.g. the navigation host
+
+        self.stage_pages = Counter()
+        self.stage_found = Counter()
+        self.stage_recent_yield = {stage: None for stage in self.STAGES}
+        self.host_pages = Counter()
+        self.host_found = Counter()
+        self.host_pages_since_find = Counter()
+        self.closed_hosts = set()
+        self.host_failures = Counter()  # Consecutive failed fetches per host
+
+        self.pages_fetched = 0
+        self.failed_fetches = 0
+        self.faculties_found = 0
+        self.denied = Counter()
+        self.decisions = deque(maxlen=200)
+
+        self._log_decision('init', f"policy={policy}, total={self.total_pages}, "
+                                   f"stage_budget={self.stage_budget}, host_budget={self.base_host_budget}")
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Host (netloc) used as budget key"""
+        return urlparse(url).netloc.lower()
+
+    def _stage_key(self, stage: str) -> str:
+        return stage if stage in self.STAGES else 'other'
+
+    def _log_decision(self, action: str, detail: str):
+        entry = {'page': self.pages_fetched, 'action': action, 'detail': detail}
+        self.decisions.append(entry)
+        self.logger.info(f"💰 Budget [{action}] @{self.pages_fetched}: {detail}")
+
+    def get_host_budget(self, host: str) -> int:
+        if host in self.exempt_hosts:
+            return self.total_pages
+        return self.host_budget.get(host, self.base_host_budget)
+
+    def allow_fetch(self, url: str, stage: str) -> bool:
+        """Check whether a queued URL still fits in its stage and host budget"""
+        if self.pages_fetched >= self.total_pages:
+            return False
+
+        stage = self._stage_key(stage)
+        host = self.host_of(url)
+
+        if self.stage_pages[stage] >= self.stage_budget[stage]:
+            self.denied[f"stage:{stage}"] += 1
+            return False
+
+        if host in self.closed_hosts or self.host_pages[host] >= self.get_host_budget(host):
+            self.denied[f"host:{host}"] += 1
+            return False
+
+        return True
+
+    def record_fetch(self, url: str, stage: str, new_faculties: int = 0):
+        """Record one fetched page and how many new faculties it produced"""
+        stage = self._stage_key(stage)
+        host = self.host_of(url)
+
+        self.pages_fetched += 1
+        self.stage_pages[stage] += 1
+        self.host_pages[host] += 1
+        self.host_failures[host] = 0
+
+        if new_faculties:
+            self.faculties_found += new_faculties
+            self.stage_found[stage] += new_faculties
+            self.host_found[host] += new_faculties
+            self.host_pages_since_find[host] = 0
+        else:
+            self.host_pages_since_find[host] += 1
+
+        previous = self.stage_recent_yield[stage]
+        observed = 1.0 if new_faculties else 0.0
+        self.stage_recent_yield[stage] = observed if previous is None else (
+            self.decay * previous + (1 - self.decay) * observed
+        )
+
+        if self.policy == 'adaptive':
+            self._adjust_host(host, new_faculties)
+
+    def record_failure(self, url: str, stage: str):
+        """Record a fetch that returned nothing: it still uses stage and host budget"""
+        stage = self._stage_key(stage)
+        host = self.host_of(url)
+
+        self.failed_fetches += 1
+        self.stage_pages[stage] += 1
+        self.host_pages[host] += 1
+        self.host_failures[host] += 1
+
+        if host not in self.exempt_hosts and host not in self.closed_hosts and \
+                self.host_failures[host] >= self.max_host_failures:
+            self.closed_hosts.add(host)
+            self._log_decision('host-', f"{host} failed {self.host_failures[host]} fetches in a row -> closed")
+
+    def _adjust_host(self, host: str, new_faculties: int):
+        """Grow budget of hosts that keep producing, close hosts that stopped"""
+        if host in self.exempt_hosts:
+            return
+
+        if new_faculties:
+            new_budget = self.host_pages[host] + self.base_host_budget
+            if new_budget > self.get_host_budget(host):
+                self.host_budget[host] = new_budget
+                self._log_decision('host+', f"{host} produced {new_faculties} new faculty -> budget {new_budget}")
+        elif self.host_found[host] > 0 and self.host_pages_since_find[host] >= self.host_patience and \
+                host not in self.closed_hosts:
+            self.closed_hosts.add(host)
+            self._log_decision('host-', f"{host} idle for {self.host_pages_since_find[host]} pages -> closed")
+
+    def link_quota(self, stage: str) -> int:
+        """Maximum number of outgoing links to enqueue from a page of this stage"""
+        stage = self._stage_key(stage)
+        base = self.DEFAULT_LINK_QUOTAS[stage]
+        if self.policy == 'fixed':
+            return base
+
+        recent = self.stage_recent_yield[stage]
+        if recent is None or self.faculties_found == 0:
+            return base
+
+        overall = self.faculties_found / max(1, self.pages_fetched)
+        ratio = recent / overall if overall else 1.0
+        return max(2, min(base * 2, int(round(base * (0.5 + ratio)))))
+
+    def should_rebalance(self) -> bool:
+        return self.policy == 'adaptive' and self.pages_fetched > 0 and \
+            self.pages_fetched % self.rebalance_every == 0
+
+    def rebalance(self, pending_stages: Optional[Counter] = None):
+        """
+        Redistribute the remaining page budget across stages.
+
+        Stages are weighted by their recent yield (unexplored stages get an
+        optimistic prior) and only stages with pending URLs receive budget.
+        """
+        if self.policy != 'adaptive':
+            return
+
+        remaining = self.total_pages - self.pages_fetched
+        if remaining <= 0:
+            return
+
+        pending_stages = pending_stages or Counter()
+        overall = self.faculties_found / max(1, self.pages_fetched)
+        prior = max(overall, 0.1)
+
+        weights = {}
+        for stage in self.STAGES:
+            if pending_stages and not pending_stages.get(stage):
+                weights[stage] = 0.0
+                continue
+            recent = self.stage_recent_yield[stage]
+            weights[stage] = self.min_stage_share + (prior if recent is None else recent)
+
+        weight_total = sum(weights.values())
+        if weight_total <= 0:
+            return
+
+        new_budget = {}
+        for stage in self.STAGES:
+            extra = int(round(remaining * weights[stage] / weight_total))
+            if weights[stage] > 0:
+                extra = max(1, extra)
+            new_budget[stage] = self.stage_pages[stage] + extra
+
+        if new_budget != self.stage_budget:
+            self.stage_budget = new_budget
+            self._log_decision('rebalance', f"weights={ {s: round(w, 3) for s, w in weights.items()} } "
+                                            f"-> stage_budget={new_budget}")
+
+    def summary(self) -> Dict:
+        """Efficiency summary for comparing policies"""
+        def efficiency(found, pages):
+            return round(found / pages, 4) if pages else 0.0
+
+        return {
+            'policy': self.policy,
+            'total_budget': self.total_pages,
+            'pages_fetched': self.pages_fetched,
+            'failed_fetches': self.failed_fetches,
+            'faculties_found': self.faculties_found,
+            'faculties_per_page': efficiency(self.faculties_found, self.pages_fetched),
+            'stages': {
+                stage: {
+                    'budget': self.stage_budget[stage],
+                    'pages': self.stage_pages[stage],
+                    'faculties': self.stage_found[stage],
+                    'faculties_per_page': efficiency(self.stage_found[stage], self.stage_pages[stage])
+                }
+                for stage in self.STAGES
+            },
+            'hosts': {
+                host: {
+                    'budget': self.get_host_budget(host),
+                    'pages': pages,
+                    'faculties': self.host_found[host],
+                    'failures': self.host_failures[host],
+                    'closed': host in self.closed_hosts
+                }
+                for host, pages in self.host_pages.most_common()
+            },
+            'denied': dict(self.denied),
+            'decisions': list(self.decisions)
+        }
+
+    def decision_log(self) -> List[Dict]:
+        return list(self.decisions)
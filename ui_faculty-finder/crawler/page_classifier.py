@@ -0,0 +1,203 @@
+# page_classifier.py
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+from crawler.page_scanner import PageScan
+
+VETO = -1000.0  # Weight of exclusion features: one hit keeps the score below any threshold
+
+
+class VectorPageClassifier:
+    """
+    Linear faculty page classifier over a fixed feature vector.
+
+    Every page is turned into one feature vector from its streaming PageScan
+    (URL patterns, title/heading keyword hits, known subdomain root, section
+    and list counts) and scored with a single dot product against WEIGHTS.
+    The default weights reproduce the rule cascade of
+    NaturalUIFacultyCrawler.is_faculty_page, so both classifiers agree;
+    tuning is a matter of changing the weight table.
+
+    Exclusion rules are features with a VETO weight. The "very generic title"
+    rule only applies below GENERIC_TITLE_MIN_SCORE, so it is kept as a
+    separate gate column applied after scoring.
+    """
+
+    # (feature, weight) - order defines the feature vector layout
+    WEIGHTS = [
+        ('known_subdomain', 50.0),
+        ('subdomain_root', 10.0),
+        ('faculty_url_pattern', 30.0),
+        ('og_site_name', 15.0),
+        ('og_type_school', 10.0),
+        ('content_indicator_1', 15.0),  # >= 1 content indicator
+        ('content_indicator_3', 10.0),  # >= 3 content indicators (15 + 10 = 25)
+        ('expected_name', 20.0),
+        ('hierarchy', 10.0),
+        ('program_level_1', 5.0),  # exactly 1 program level keyword
+        ('program_level_2', 10.0),  # >= 2 program level keywords (5 + 10 = 15)
+        ('faculty_section', 10.0),
+        ('program_list', 10.0),
+        ('listing_url', VETO),
+        ('generic_title', VETO),
+        ('dean_url', VETO),
+        ('dean_title', VETO),
+        ('generic_detail', VETO),
+        ('generic_title_listing', 0.0),  # Gate column, see classify_matrix()
+    ]
+
+    FEATURES = [name for name, _ in WEIGHTS]
+    GATE_COLUMN = FEATURES.index('generic_title_listing')
+    GENERIC_TITLE_MIN_SCORE = 70
+
+    # Keyword groups counted on the page text in one pass over a merged keyword table
+    TEXT_KEYWORD_GROUPS = ('content_indicator', 'hierarchy', 'program_level', 'expected_name', 'detail_specific')
+
+    def __init__(self, crawler, weights: Optional[Dict[str, float]] = None, threshold: Optional[float] = None):
+        """
+        Args:
+            crawler: NaturalUIFacultyCrawler whose rule tables and known subdomains are used
+            weights: optional overrides, e.g. {'og_site_name': 20.0}
+            threshold: decision threshold (default: crawler.FACULTY_PAGE_THRESHOLD)
+        """
+        unknown = set(weights or {}) - set(self.FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown classifier features: {sorted(unknown)}")
+
+        self.crawler = crawler
+        self.threshold = float(crawler.FACULTY_PAGE_THRESHOLD if threshold is None else threshold)
+        self.weights = np.array([(weights or {}).get(name, weight) for name, weight in self.WEIGHTS])
+        self.known_faculty_netlocs = set(crawler.known_faculty_netlocs)
+
+        # One alternation per pattern list instead of a regex search per pattern
+        self.listing_url_regex = self._merge_patterns(crawler.GENERIC_LISTING_URL_PATTERNS)
+        self.generic_title_regex = self._merge_patterns(crawler.GENERIC_TITLE_PATTERNS)
+        self.dean_url_regex = self._merge_patterns(crawler.DEAN_LEADERSHIP_URL_PATTERNS)
+        self.faculty_url_regex = self._merge_patterns(crawler.SPECIFIC_FACULTY_URL_PATTERNS)
+
+        # Merged text keyword table: keyword -> group membership matrix (keywords x groups)
+        groups = {
+            'content_indicator': crawler.SPECIFIC_FACULTY_CONTENT_INDICATORS,
+            'hierarchy': crawler.HIERARCHY_INDICATORS,
+            'program_level': crawler.PROGRAM_LEVEL_KEYWORDS,
+            'expected_name': crawler._expected_faculty_names_lower,
+            'detail_specific': crawler.DETAIL_PAGE_FACULTY_KEYWORDS,
+        }
+        self.text_keywords = sorted({keyword for keywords in groups.values() for keyword in keywords})
+        keyword_index = {keyword: i for i, keyword in enumerate(self.text_keywords)}
+        self.keyword_groups = np.zeros((len(self.text_keywords), len(self.TEXT_KEYWORD_GROUPS)))
+        for group_index, group in enumerate(self.TEXT_KEYWORD_GROUPS):
+            for keyword in groups[group]:
+                self.keyword_groups[keyword_index[keyword], group_index] += 1.0  # Duplicates count twice, as in the rules
+
+        self.dean_title_keywords = crawler.DEAN_LEADERSHIP_TITLE_HEADING_KEYWORDS
+        self.detail_keywords = crawler.DETAIL_PAGE_FACULTY_KEYWORDS
+        self.og_site_name_keywords = crawler.OG_SITE_NAME_KEYWORDS
+        self.program_list_keywords = crawler.PROGRAM_LIST_KEYWORDS
+        self.very_generic_titles = crawler.VERY_GENERIC_TITLES
+
+    @staticmethod
+    def _merge_patterns(patterns) -> re.Pattern:
+        return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in patterns))
+
+    def keyword_hits(self, page_text_lower: str) -> np.ndarray:
+        """0/1 vector over the merged text keyword table"""
+        return np.fromiter((keyword in page_text_lower for keyword in self.text_keywords),
+                           dtype=float, count=len(self.text_keywords))
+
+    def extract_features(self, url: str, scan: PageScan, keyword_counts: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Feature vector of one page.
+
+        keyword_counts are the per-group text keyword counts; when omitted they
+        are computed here (classify_batch computes them for all pages at once).
+        """
+        page_text_lower = scan.text_lower
+        title_lower = scan.title.strip().lower()
+        heading_lower = scan.main_heading_lower
+        url_lower = url.lower()
+
+        if keyword_counts is None:
+            keyword_counts = self.keyword_hits(page_text_lower) @ self.keyword_groups
+        content_count, hierarchy_count, level_count, name_count, detail_count = keyword_counts
+
+        parsed_url = urlparse(url)
+        known_subdomain = parsed_url.netloc in self.known_faculty_netlocs
+        subdomain_root = known_subdomain and parsed_url.path.strip('/') == ''
+
+        og_site_name = (scan.meta.get('og:site_name') or '').lower()
+        og_type = (scan.meta.get('og:type') or '').lower()
+
+        has_program_list = any(
+            li_count > 1 and any(keyword in list_text for keyword in self.program_list_keywords)
+            for list_text, li_count in scan.lists
+        )
+
+        detail_page = 'detail fakultas' in title_lower or \
+            ('detail fakultas' in page_text_lower and len(page_text_lower) < 1000)
+        generic_detail = detail_page and not detail_count and \
+            not any(keyword in title_lower for keyword in self.detail_keywords)
+
+        generic_title_listing = any(title in title_lower for title in self.very_generic_titles) and \
+            scan.article_count > 3 and 'fakultas' not in title_lower and 'sekolah' not in title_lower
+
+        return np.array([
+            known_subdomain,
+            subdomain_root,
+            bool(self.faculty_url_regex.search(url_lower)),
+            any(keyword in og_site_name for keyword in self.og_site_name_keywords),
+            og_type == 'school',
+            content_count >= 1,
+            content_count >= 3,
+            name_count >= 1,
+            hierarchy_count >= 1,
+            level_count >= 1,
+            level_count >= 2,
+            any(length > 100 for length in scan.sections),
+            has_program_list,
+            bool(self.listing_url_regex.search(url_lower)),
+            bool(self.generic_title_regex.search(title_lower)),
+            not subdomain_root and bool(self.dean_url_regex.search(url_lower)),
+            not subdomain_root and any(keyword in title_lower or keyword in heading_lower
+                                       for keyword in self.dean_title_keywords),
+            generic_detail,
+            generic_title_listing,
+        ], dtype=float)
+
+    def feature_matrix(self, pages: Iterable[Tuple[str, PageScan]]) -> np.ndarray:
+        """Feature matrix (pages x features) for a batch of (url, scan) pairs"""
+        pages = list(pages)
+        if not pages:
+            return np.zeros((0, len(self.FEATURES)))
+
+        keyword_hits = np.vstack([self.keyword_hits(scan.text_lower) for _, scan in pages])
+        keyword_counts = keyword_hits @ self.keyword_groups
+        return np.vstack([
+            self.extract_features(url, scan, counts) for (url, scan), counts in zip(pages, keyword_counts)
+        ])
+
+    def score_matrix(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.weights
+
+    def classify_matrix(self, features: np.ndarray) -> np.ndarray:
+        """Boolean decision per row of a feature matrix"""
+        scores = self.score_matrix(features)
+        gated = (features[:, self.GATE_COLUMN] > 0) & (scores < self.GENERIC_TITLE_MIN_SCORE)
+        return (scores >= self.threshold) & ~gated
+
+    def classify(self, url: str, scan: PageScan) -> bool:
+        """Classify a single page"""
+        return bool(self.classify_matrix(self.extract_features(url, scan)[np.newaxis, :])[0])
+
+    def classify_batch(self, pages: Iterable[Tuple[str, PageScan]]) -> List[bool]:
+        """Classify many (url, scan) pages with one matrix product"""
+        return self.classify_matrix(self.feature_matrix(pages)).tolist()
+
+    def explain(self, url: str, scan: PageScan) -> Dict[str, float]:
+        """Weighted contribution of every active feature (for tuning)"""
+        features = self.extract_features(url, scan)
+        return {name: float(value * weight)
+                for name, value, weight in zip(self.FEATURES, features, self.weights) if value}
@@ -0,0 +1,205 @@
+# page_scanner.py
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Optional
+
+# Elements that never get an end tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# Content that BeautifulSoup.get_text() does not return
+SKIPPED_TEXT_ELEMENTS = {'script', 'style', 'template'}
+
+SECTION_CLASS_PATTERN = re.compile(r'(faculty|fakultas|academic|dean|sekolah|program|departemen|department)', re.I)
+
+
+class PageScan:
+    """Lightweight result of a single streaming pass over an HTML page"""
+
+    def __init__(self):
+        self.title = ''
+        self.h1 = None  # Text of the first h1 (None when absent)
+        self.h2 = None
+        self.headings = []  # All h1/h2 texts in document order
+        self.anchors = []  # (href, link_text, parent_classes) tuples
+        self.meta = {}  # name/property -> content (first occurrence)
+        self.text_parts = []
+        self.article_count = 0
+        self.sections = []  # Text length of the first 5 class-matching div/section elements
+        self.lists = []  # (joined_text_lower, li_count) of the first 10 ul/ol elements
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.text_parts)
+
+    @property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @property
+    def main_heading_lower(self) -> str:
+        """Same composition as the first h1 + first h2 used by is_faculty_page"""
+        heading = ''
+        if self.h1 is not None:
+            heading += self.h1.strip().lower() + ' '
+        if self.h2 is not None:
+            heading += self.h2.strip().lower()
+        return heading
+
+
+class _StreamingPageParser(HTMLParser):
+    """html.parser event handler that fills a PageScan without building a tree"""
+
+    def __init__(self, scan: PageScan, max_sections: int = 5, max_lists: int = 10):
+        super().__init__(convert_charrefs=True)
+        self.scan = scan
+        self.max_sections = max_sections
+        self.max_lists = max_lists
+        self.stack = []  # Open element tags
+        self.open_tags = Counter()
+        self.link_parents = []  # Class strings of open nav/ul/li elements
+        self.skip_depth = 0
+        self.title_parts = None
+        self.heading = None  # [tag, parts]
+        self.anchor = None  # [href, parts, parent_classes]
+        self.open_sections = []  # [stack_depth, index]
+        self.open_lists = []  # [stack_depth, index, parts, li_count]
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        scan = self.scan
+
+        if tag == 'meta':
+            key = (attrs.get('name') or attrs.get('property') or '').lower()
+            if key and key not in scan.meta:
+                scan.meta[key] = (attrs.get('content') or '').strip()
+            return
+        if tag in VOID_ELEMENTS:
+            return
+
+        if tag in SKIPPED_TEXT_ELEMENTS:
+            self.skip_depth += 1
+        elif tag == 'title' and self.title_parts is None and not scan.title:
+            self.title_parts = []
+        elif tag in ('h1', 'h2') and self.heading is None:
+            self.heading = [tag, []]
+        elif tag == 'a' and attrs.get('href') is not None and self.anchor is None:
+            self.anchor = [attrs.get('href'), [], self._nearest_parent_classes()]
+        elif tag == 'article':
+            scan.article_count += 1
+        elif tag == 'li':
+            for open_list in self.open_lists:
+                open_list[3] += 1
+
+        if tag in ('div', 'section') and len(scan.sections) < self.max_sections and \
+                SECTION_CLASS_PATTERN.search(attrs.get('class') or ''):
+            scan.sections.append(0)
+            self.open_sections.append([len(self.stack), len(scan.sections) - 1])
+        elif tag in ('ul', 'ol') and len(scan.lists) < self.max_lists:
+            scan.lists.append(('', 0))
+            self.open_lists.append([len(self.stack), len(scan.lists) - 1, [], 0])
+
+        self.stack.append(tag)
+        self.open_tags[tag] += 1
+        if tag in ('nav', 'ul', 'li'):
+            self.link_parents.append(str((attrs.get('class') or '').split()).lower())
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def _nearest_parent_classes(self) -> Optional[str]:
+        """Class string of the closest nav/ul/li ancestor (None when there is none)"""
+        return self.link_parents[-1] if self.link_parents else None
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+        if not self.open_tags[tag]:
+            return  # Stray end tag
+
+        while self.stack:
+            open_tag = self.stack.pop()
+            self._close(open_tag)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag):
+        scan = self.scan
+        depth = len(self.stack)
+        self.open_tags[tag] -= 1
+        if tag in ('nav', 'ul', 'li'):
+            self.link_parents.pop()
+
+        if tag in SKIPPED_TEXT_ELEMENTS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == 'title' and self.title_parts is not None:
+            scan.title = ''.join(self.title_parts)
+            self.title_parts = None
+        elif self.heading is not None and tag == self.heading[0]:
+            heading_text = ''.join(self.heading[1])
+            scan.headings.append(heading_text)
+            if tag == 'h1' and scan.h1 is None:
+                scan.h1 = heading_text
+            elif tag == 'h2' and scan.h2 is None:
+                scan.h2 = heading_text
+            self.heading = None
+        elif tag == 'a' and self.anchor is not None:
+            href, parts, parent_classes = self.anchor
+            scan.anchors.append((href, ''.join(parts), parent_classes))
+            self.anchor = None
+
+        while self.open_sections and self.open_sections[-1][0] >= depth:
+            self.open_sections.pop()
+        while self.open_lists and self.open_lists[-1][0] >= depth:
+            _, index, parts, li_count = self.open_lists.pop()
+            scan.lists[index] = (' '.join(parts).lower(), li_count)
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+
+        scan = self.scan
+        scan.text_parts.append(data)
+
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+        if self.heading is not None:
+            self.heading[1].append(data)
+        if self.anchor is not None:
+            self.anchor[1].append(data)
+
+        stripped = data.strip()
+        if stripped:
+            for open_section in self.open_sections:
+                scan.sections[open_section[1]] += len(stripped)
+            for open_list in self.open_lists:
+                open_list[2].append(stripped)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self._close(self.stack.pop())
+        if self.title_parts is not None:
+            self.scan.title = ''.join(self.title_parts)
+
+
+def scan_page(html_content: str) -> PageScan:
+    """
+    Single streaming pass over raw HTML.
+
+    Collects anchors, title, h1/h2, meta tags, visible text and the few
+    structural counts the faculty classifier needs, without building a DOM.
+    """
+    scan = PageScan()
+    parser = _StreamingPageParser(scan)
+    try:
+        parser.feed(html_content or '')
+        parser.close()
+    except Exception:
+        pass  # Keep whatever was collected from malformed HTML
+    return scan
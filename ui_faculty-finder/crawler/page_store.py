@@ -0,0 +1,270 @@
+# page_store.py
+import hashlib
+import logging
+import lzma
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'page_store')
+
+# codec -> (compress, decompress, file extension)
+CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 6), zlib.decompress, '.z'),
+    'lzma': (lambda data: lzma.compress(data, preset=6), lzma.decompress, '.xz'),
+}
+
+
+class RawPageStore:
+    """
+    Content-addressed store for the raw HTML of every fetched page.
+
+    Layout under ``root``:
+    - objects/ab/<sha256>.z|.xz : compressed HTML, one file per distinct body
+    - index.db                 : SQLite index of crawls, objects and pages
+
+    Identical bodies (same SHA-256) are stored once, no matter how many URLs
+    or crawls reference them. Pages are indexed by crawl id (in fetch order)
+    and by URL, so a stored crawl can be reprocessed without any network.
+    """
+
+    def __init__(self, root: Optional[str] = None, codec: str = 'zlib'):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown page store codec: {codec}")
+
+        self.root = root or DEFAULT_STORE_PATH
+        self.codec = codec
+        self.objects_dir = os.path.join(self.root, 'objects')
+        self.index_path = os.path.join(self.root, 'index.db')
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._initialize_index()
+
+    @contextmanager
+    def get_connection(self):
+        with self._lock:
+            conn = sqlite3.connect(self.index_path, timeout=30.0)
+            conn.row_factory = sqlite3.Row
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+    def _initialize_index(self):
+        with self.get_connection() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS crawls (
+                    crawl_id TEXT PRIMARY KEY,
+                    base_url TEXT,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    pages INTEGER DEFAULT 0
+                );
+
+                CREATE TABLE IF NOT EXISTS objects (
+                    content_hash TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    raw_size INTEGER NOT NULL,
+                    stored_size INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS pages (
+                    crawl_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    depth INTEGER,
+                    stage TEXT,
+                    content_hash TEXT NOT NULL,
+                    fetched_at TEXT,
+                    PRIMARY KEY (crawl_id, seq)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_pages_url ON pages(url, crawl_id);
+                CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash);
+            ''')
+
+    @staticmethod
+    def content_hash(html_content: str) -> str:
+        return hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+
+    def _object_path(self, content_hash: str, codec: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], content_hash + CODECS[codec][2])
+
+    def start_crawl(self, base_url: str, crawl_id: Optional[str] = None) -> str:
+        """Register a new crawl and return its id"""
+        crawl_id = crawl_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self.get_connection() as conn:
+            conn.execute('INSERT INTO crawls (crawl_id, base_url, started_at) VALUES (?, ?, ?)',
+                         (crawl_id, base_url, time.strftime('%Y-%m-%d %H:%M:%S')))
+        self.logger.info(f"🗄️ Page store crawl {crawl_id} started ({self.codec})")
+        return crawl_id
+
+    def finish_crawl(self, crawl_id: str):
+        with self.get_connection() as conn:
+            conn.execute('''
+                UPDATE crawls SET finished_at = ?, pages = (SELECT COUNT(*) FROM pages WHERE crawl_id = ?)
+                WHERE crawl_id = ?
+            ''', (time.strftime('%Y-%m-%d %H:%M:%S'), crawl_id, crawl_id))
+
+    def put_object(self, html_content: str) -> str:
+        """Store one HTML body (deduplicated) and return its content hash"""
+        data = html_content.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        with self.get_connection() as conn:
+            if conn.execute('SELECT 1 FROM objects WHERE content_hash = ?', (content_hash,)).fetchone():
+                return content_hash
+
+            compress = CODECS[self.codec][0]
+            compressed = compress(data)
+            path = self._object_path(content_hash, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)  # Never leave a truncated object behind
+
+            conn.execute('INSERT INTO objects (content_hash, codec, raw_size, stored_size) VALUES (?, ?, ?, ?)',
+                         (content_hash, self.codec, len(data), len(compressed)))
+        return content_hash
+
+    def add_page(self, crawl_id: str, url: str, html_content: str, depth: int = 0, stage: str = 'other') -> str:
+        """Store a fetched page for a crawl, returns the content hash"""
+        content_hash = self.put_object(html_content)
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT COALESCE(MAX(seq), 0) FROM pages WHERE crawl_id = ?', (crawl_id,)).fetchone()
+            conn.execute('''
+                INSERT INTO pages (crawl_id, seq, url, depth, stage, content_hash, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (crawl_id, row[0] + 1, url, depth, stage, content_hash, time.strftime('%Y-%m-%d %H:%M:%S')))
+        return content_hash
+
+    def get_object(self, content_hash: str) -> Optional[str]:
+        """Decompressed HTML of a stored body"""
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT codec FROM objects WHERE content_hash = ?', (content_hash,)).fetchone()
+        if not row:
+            return None
+
+        with open(self._object_path(content_hash, row['codec']), 'rb') as f:
+            return CODECS[row['codec']][1](f.read()).decode('utf-8')
+
+    def get_page(self, url: str, crawl_id: Optional[str] = None) -> Optional[str]:
+        """HTML of a URL from the given crawl (default: the most recent crawl that fetched it)"""
+        query = 'SELECT content_hash FROM pages WHERE url = ?'
+        params = [url]
+        if crawl_id:
+            query += ' AND crawl_id = ?'
+            params.append(crawl_id)
+        query += ' ORDER BY rowid DESC LIMIT 1'  # Latest fetch
+
+        with self.get_connection() as conn:
+            row = conn.execute(query, params).fetchone()
+        return self.get_object(row['content_hash']) if row else None
+
+    def iter_pages(self, crawl_id: str) -> Iterator[Dict]:
+        """Pages of a crawl in fetch order: dicts with url, depth, stage, content_hash, html"""
+        with self.get_connection() as conn:
+            rows = conn.execute('''
+                SELECT p.seq, p.url, p.depth, p.stage, p.content_hash, o.codec
+                FROM pages p JOIN objects o ON o.content_hash = p.content_hash
+                WHERE p.crawl_id = ? ORDER BY p.seq
+            ''', (crawl_id,)).fetchall()
+
+        for row in rows:
+            with open(self._object_path(row['content_hash'], row['codec']), 'rb') as f:
+                html_content = CODECS[row['codec']][1](f.read()).decode('utf-8')
+            yield {
+                'url': row['url'], 'depth': row['depth'], 'stage': row['stage'],
+                'content_hash': row['content_hash'], 'html': html_content
+            }
+
+    def list_crawls(self) -> List[Dict]:
+        with self.get_connection() as conn:
+            rows = conn.execute('''
+                SELECT c.crawl_id, c.base_url, c.started_at, c.finished_at, COUNT(p.seq) AS pages
+                FROM crawls c LEFT JOIN pages p ON p.crawl_id = c.crawl_id
+                GROUP BY c.crawl_id ORDER BY c.rowid DESC
+            ''').fetchall()
+        return [dict(row) for row in rows]
+
+    def latest_crawl_id(self) -> Optional[str]:
+        crawls = [crawl for crawl in self.list_crawls() if crawl['pages']]
+        return crawls[0]['crawl_id'] if crawls else None
+
+    def get_statistics(self) -> Dict:
+        """Object/page counts and compression + dedup ratios"""
+        with self.get_connection() as conn:
+            objects = conn.execute('''
+                SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM objects
+            ''').fetchone()
+            pages = conn.execute('''
+                SELECT COUNT(*), COALESCE(SUM(o.raw_size), 0)
+                FROM pages p JOIN objects o ON o.content_hash = p.content_hash
+            ''').fetchone()
+            crawls = conn.execute('SELECT COUNT(*) FROM crawls').fetchone()[0]
+
+        object_count, raw_bytes, stored_bytes = objects
+        page_count, referenced_bytes = pages
+        return {
+            'crawls': crawls,
+            'pages': page_count,
+            'objects': object_count,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+            'compression_ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+            'dedup_ratio': round(referenced_bytes / raw_bytes, 2) if raw_bytes else 0.0
+        }
+
+
+def reprocess_crawl(crawl_id: Optional[str] = None, store: Optional[RawPageStore] = None,
+                    page_classifier: str = 'rules', output: Optional[str] = None) -> List[Dict]:
+    """Re-run classification and extraction over a stored crawl (no network)"""
+    from crawler.bfs_crawler import NaturalUIFacultyCrawler
+
+    store = store or RawPageStore()
+    crawler = NaturalUIFacultyCrawler(delay=0, page_classifier=page_classifier, page_store=store)
+    faculty_data = crawler.reprocess(crawl_id)
+    if output:
+        crawler.save_results(output)
+    return faculty_data
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Raw page store: list crawls or reprocess one offline')
+    parser.add_argument('command', choices=['list', 'stats', 'reprocess'])
+    parser.add_argument('crawl_id', nargs='?', help='crawl to reprocess (default: latest)')
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help='page store directory')
+    parser.add_argument('--classifier', default='rules', choices=['rules', 'vector'])
+    parser.add_argument('--output', help='save reprocessed results to this JSON file')
+    args = parser.parse_args()
+
+    page_store = RawPageStore(args.store)
+    if args.command == 'list':
+        for crawl in page_store.list_crawls():
+            print(f"{crawl['crawl_id']}  {crawl['started_at']}  {crawl['pages']:>5} pages  {crawl['base_url']}")
+    elif args.command == 'stats':
+        for key, value in page_store.get_statistics().items():
+            print(f"{key}: {value}")
+    else:
+        start = time.time()
+        results = reprocess_crawl(args.crawl_id, page_store, args.classifier, args.output)
+        print(f"♻️  Reprocessed: {len(results)} faculties in {time.time() - start:.2f}s")
+        for faculty in results:
+            print(f"   - {faculty['name']} ({faculty['url']})")
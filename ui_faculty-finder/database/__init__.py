@@ -4,7 +4,12 @@ Database package untuk UI Faculty Finder
 Berisi models dan utilities untuk database operations
 """
 
-from .models import DatabaseManager, Faculty, CrawlMetadata, create_models
+from .models import DatabaseManager, Faculty, CrawlMetadata, content_hash, create_models
 from .database import DatabaseOperations
+from .journal import JournalWriter, iter_journal, open_faculty_records
+from .writer import WriteQueue, get_writer
+from .cache import QueryCache, bump_data_version, get_query_cache
 
-__all__ = ['DatabaseManager', 'Faculty', 'CrawlMetadata', 'create_models', 'DatabaseOperations']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'Faculty', 'CrawlMetadata', 'content_hash', 'create_models', 'DatabaseOperations',
+           'JournalWriter', 'iter_journal', 'open_faculty_records', 'WriteQueue', 'get_writer', 'QueryCache',
+           'bump_data_version', 'get_query_cache']
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Cache hasil query dengan invalidasi lewat data version
+
+Tabel data_version menyimpan satu counter global per database yang dinaikkan
+(bump_data_version) di dalam transaksi setiap penulisan yang mengubah hasil
+pencarian: import/hapus fakultas, clear data dan re-index (lihat Faculty,
+DatabaseOperations dan SearchIndexer). Karena counter ikut di-commit bersama
+perubahannya, proses lain yang memakai database yang sama melihatnya juga.
+
+QueryCache adalah cache LRU + TTL per database (get_query_cache) yang dipakai
+FacultySearchEngine dan Faculty.search. Setiap lookup membandingkan versi data
+dengan versi isi cache: koneksi baca sendiri cukup menjalankan PRAGMA
+data_version (berubah hanya jika koneksi lain commit) dan membaca ulang tabel
+data_version hanya saat itu berubah, jadi query yang sering dicari cukup satu
+PRAGMA dan satu lookup dict. Begitu versi berubah seluruh isi cache dibuang.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def create_data_version_table(cursor):
+    """Tabel counter data version (satu baris, id = 1)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)')
+
+
+def bump_data_version(conn):
+    """Naikkan data version di dalam transaksi yang sedang berjalan (operasi WriteQueue)"""
+    conn.execute('UPDATE data_version SET version = version + 1 WHERE id = 1')
+
+
+def read_data_version(conn) -> Optional[int]:
+    """Data version saat ini (None jika tabelnya belum ada)"""
+    try:
+        row = conn.execute('SELECT version FROM data_version WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+class QueryCache:
+    """Cache LRU + TTL hasil query, dikosongkan saat data version database berubah"""
+
+    def __init__(self, db_path: str, max_entries: int = 1024, ttl: Optional[float] = 300.0,
+                 timeout: float = 10.0):
+        """
+        Args:
+            db_path: path database SQLite yang data version-nya dipantau
+            max_entries: jumlah hasil maksimum; entry yang paling lama tidak
+                dipakai dibuang lebih dulu (0 = cache nonaktif)
+            ttl: detik sebuah hasil boleh dipakai (None = tanpa batas waktu),
+                batas atas untuk penulisan yang tidak menaikkan data version
+            timeout: busy timeout koneksi baca data version
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.timeout = timeout
+        self.stats = Counter()  # hits, misses, evictions, expired, invalidations, bypassed
+        self._entries = OrderedDict()  # key -> (expires_at, value), urutan LRU
+        self._lock = threading.Lock()
+        self._version = None  # Data version isi cache
+        self._generation = 0  # Naik setiap clear(): hasil yang dihitung sebelumnya tidak disimpan
+        self._conn = None
+        self._pragma_version = None  # PRAGMA data_version saat tabel data_version terakhir dibaca
+        self._data_version = None
+        self._conn_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self) -> Optional[int]:
+        """
+        Data version database (None jika tidak bisa dibaca, mis. database
+        ':memory:' atau skema lama; selama itu cache dilewati).
+        """
+        with self._conn_lock:
+            try:
+                if self._conn is None:
+                    self._conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+                    self._pragma_version = None
+                pragma_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+                if pragma_version != self._pragma_version:
+                    self._data_version = read_data_version(self._conn)
+                    self._pragma_version = pragma_version
+                return self._data_version
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading data version of {self.db_path}: {e}")
+                self._pragma_version = None
+                return None
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Hasil untuk key dari cache, atau compute() yang lalu disimpan.
+
+        Hasil dipakai bersama semua pemanggil berikutnya, jadi jangan diubah.
+        Exception dari compute() diteruskan dan tidak di-cache.
+        """
+        if self.max_entries <= 0:
+            return compute()
+
+        # Versi dibaca sebelum compute: data yang berubah di tengah compute membuat
+        # lookup berikutnya melihat versi baru, jadi hasil ini tidak terpakai lagi
+        version = self.version()
+        with self._lock:
+            if version is None:
+                self.stats['bypassed'] += 1
+                generation = None
+            else:
+                if version != self._version:
+                    if self._entries:
+                        self.stats['invalidations'] += 1
+                    self._entries.clear()
+                    self._version = version
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[0] > time.monotonic():
+                        self._entries.move_to_end(key)
+                        self.stats['hits'] += 1
+                        return entry[1]
+                    del self._entries[key]
+                    self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                generation = self._generation
+
+        value = compute()
+        if generation is None:
+            return value
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else float('inf')
+        with self._lock:
+            if version == self._version and generation == self._generation:
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+        return value
+
+    def clear(self):
+        """Buang semua hasil (mis. saat sumber data pencarian diganti tanpa perubahan data version)"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def info(self) -> Dict:
+        """Ukuran, pengaturan, data version dan counter cache"""
+        with self._lock:
+            return dict(self.stats, size=len(self._entries), max_entries=self.max_entries, ttl=self.ttl,
+                        version=self._version)
+
+    def close(self):
+        """Tutup koneksi baca data version"""
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_caches: Dict[str, QueryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_query_cache(db_path: str, **options) -> QueryCache:
+    """
+    QueryCache bersama untuk db_path (dibuat saat pertama dipakai).
+
+    options (max_entries, ttl, timeout) hanya berlaku saat cache dibuat.
+    """
+    key = db_path if db_path == ':memory:' else os.path.abspath(db_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = QueryCache(db_path, **options)
+        return cache
+
+
+# Koneksi data version tidak boleh dipakai proses hasil fork
+os.register_at_fork(after_in_child=_caches.clear)
@@ -1,8 +1,11 @@
 import json
 import sqlite3
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from .models import create_models
+from .journal import JournalWriter, open_faculty_records
+from .cache import bump_data_version
+from .writer import get_writer
 
 class DatabaseOperations:
     """Helper class untuk operasi database yang lebih kompleks"""
@@ -12,32 +15,33 @@ class DatabaseOperations:
         self.models = create_models(db_path)
         self.logger = logging.getLogger(__name__)
     
-    def import_from_crawler(self, crawler_data: List[Dict]) -> Dict:
-        """Import data dari hasil crawler ke database"""
+    def import_from_crawler(self, crawler_data: Iterable[Dict]) -> Dict:
+        """Import data dari hasil crawler ke database (list atau iterator)"""
         results = {
             'success': 0,
             'failed': 0,
             'errors': []
         }
+        processed = 0
         
         try:
-            for faculty_data in crawler_data:
-                try:
-                    faculty_id = self.models['faculty'].create(faculty_data)
-                    if faculty_id:
-                        results['success'] += 1
-                    else:
-                        results['failed'] += 1
-                        results['errors'].append(f"Failed to create faculty: {faculty_data.get('name', 'Unknown')}")
-                        
-                except Exception as e:
+            # Record diantrikan ke WriteQueue tanpa menunggu satu per satu, jadi
+            # banyak record di-commit dalam satu transaksi
+            for faculty_data, faculty_id, error in self.models['faculty'].create_many(crawler_data):
+                processed += 1
+                if error is not None:
                     results['failed'] += 1
-                    results['errors'].append(f"Error processing {faculty_data.get('name', 'Unknown')}: {str(e)}")
+                    results['errors'].append(f"Error processing {faculty_data.get('name', 'Unknown')}: {str(error)}")
+                elif faculty_id:
+                    results['success'] += 1
+                else:
+                    results['failed'] += 1
+                    results['errors'].append(f"Failed to create faculty: {faculty_data.get('name', 'Unknown')}")
             
             self.models['crawl_metadata'].create_crawl_record(
                 base_url="https://www.ui.ac.id/",
                 total_faculties=results['success'],
-                pages_crawled=len(crawler_data)
+                pages_crawled=processed
             )
             
             self.logger.info(f"Import completed: {results['success']} success, {results['failed']} failed")
@@ -49,12 +53,9 @@ class DatabaseOperations:
             return results
     
     def import_from_json(self, json_file_path: str) -> Dict:
-        """Import data dari file JSON hasil crawler"""
+        """Import data dari journal JSONL (incremental) atau file JSON lama hasil crawler"""
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            faculties = data.get('faculties', [])
+            faculties = open_faculty_records(json_file_path)
             return self.import_from_crawler(faculties)
             
         except FileNotFoundError:
@@ -128,47 +129,51 @@ class DatabaseOperations:
     def clear_all_data(self) -> bool:
         """Hapus semua data (untuk testing atau reset)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                tables = ['search_index', 'routes', 'contacts', 'departments', 'programs', 'faculties', 'crawl_metadata']
-                
-                for table in tables:
-                    cursor.execute(f'DELETE FROM {table}')
-                
-                conn.commit()
-                self.logger.info("All data cleared successfully")
-                return True
-                
+            get_writer(self.db_path).execute(self._clear_tables)
+            self.logger.info("All data cleared successfully")
+            return True
+            
         except sqlite3.Error as e:
             self.logger.error(f"Error clearing data: {e}")
             return False
     
+    def _clear_tables(self, conn):
+        """Kosongkan tabel data dan index (operasi WriteQueue)"""
+        cursor = conn.cursor()
+        tables = ['routes', 'contacts', 'departments', 'programs', 'faculties', 'crawl_metadata']
+        
+        for table in tables:
+            cursor.execute(f'DELETE FROM {table}')
+        
+        # Search index ikut dikosongkan; dengan SearchIndexer search_index adalah view
+        # di atas tabel index ternormalisasi, jadi yang dihapus tabel-tabelnya
+        cursor.execute('''
+            SELECT name FROM sqlite_master WHERE type = 'table'
+            AND name IN ('search_index', 'index_fields', 'index_keywords', 'index_entries', 'index_postings',
+                         'index_documents', 'index_terms', 'index_stats', 'index_trigrams', 'index_stems',
+                         'index_checksums', 'faculty_fts')
+        ''')
+        for (table,) in cursor.fetchall():
+            cursor.execute(f'DELETE FROM {table}')
+        bump_data_version(conn)
+    
     def backup_to_json(self, output_file: str) -> bool:
-        """Backup data ke file JSON"""
+        """Backup data ke journal JSONL, satu record per fakultas"""
         try:
-            faculties = []
-            all_faculties = self.models['faculty'].get_all()
-            
-            for faculty in all_faculties:
-                complete_faculty = self.models['faculty'].get_by_id(faculty['id'])
-                if complete_faculty:
-                    faculties.append(complete_faculty)
-            
             crawl_info = self.models['crawl_metadata'].get_latest_crawl()
-            statistics = self.get_faculty_statistics()
             
-            backup_data = {
-                'backup_info': {
+            with JournalWriter(output_file, 'backup',
+                               crawl_timestamp=crawl_info.get('timestamp') if crawl_info else None) as journal:
+                for faculty in self.models['faculty'].get_all():
+                    complete_faculty = self.models['faculty'].get_by_id(faculty['id'])
+                    if complete_faculty:
+                        journal.write('faculty', complete_faculty)
+                
+                journal.close(backup_info={
                     'timestamp': crawl_info.get('timestamp') if crawl_info else None,
-                    'total_faculties': len(faculties),
-                    'statistics': statistics
-                },
-                'faculties': faculties
-            }
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+                    'total_faculties': journal.counts['faculty'],
+                    'statistics': self.get_faculty_statistics()
+                })
             
             self.logger.info(f"Data backed up to {output_file}")
             return True
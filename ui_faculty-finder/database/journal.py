@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Dict, Iterator, Optional
+
+JOURNAL_FORMAT = 'ui-faculty-journal'
+JOURNAL_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class JournalWriter:
+    """
+    Append-only JSONL journal untuk hasil crawl dan backup.
+
+    Format: satu objek JSON per baris, setiap record langsung di-flush:
+        {"type": "header", "format": "ui-faculty-journal", "version": 1, "kind": ..., ...}
+        {"type": "faculty", "data": {...}}
+        {"type": "page", "data": {...}}
+        {"type": "footer", "counts": {...}, ...}
+
+    Data yang sudah ditulis tetap ada walaupun proses berhenti di tengah jalan;
+    journal tanpa footer dianggap tidak lengkap (partial).
+    """
+
+    def __init__(self, path: str, kind: str, **meta):
+        self.path = path
+        self.counts = Counter()
+        self.closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write_line({
+            'type': 'header', 'format': JOURNAL_FORMAT, 'version': JOURNAL_VERSION,
+            'kind': kind, 'created_at': time.strftime('%Y-%m-%d %H:%M:%S'), **meta
+        })
+
+    def _write_line(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+    def write(self, record_type: str, data: Dict):
+        """Append satu record (faculty, page, ...)"""
+        if self.closed:
+            raise ValueError(f"Journal already closed: {self.path}")
+        self.counts[record_type] += 1
+        self._write_line({'type': record_type, 'data': data})
+
+    def close(self, **summary):
+        """Tulis footer ringkasan lalu tutup file"""
+        if self.closed:
+            return
+        self._write_line({
+            'type': 'footer', 'finished_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'counts': dict(self.counts), **summary
+        })
+        self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif not self.closed:
+            self._file.close()  # Tanpa footer: journal ditandai partial
+            self.closed = True
+        return False
+
+
+def is_journal(path: str) -> bool:
+    """True jika file diawali header journal"""
+    with open(path, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+    try:
+        header = json.loads(first_line)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(header, dict) and header.get('type') == 'header' and header.get('format') == JOURNAL_FORMAT
+
+
+def iter_journal(path: str) -> Iterator[Dict]:
+    """Baca journal record demi record (memori konstan), baris rusak dilewati"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt journal line {line_number} in {path}")
+
+
+def read_footer(path: str) -> Optional[Dict]:
+    """Footer journal (dibaca dari akhir file), None jika journal partial"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        block = min(size, 64 * 1024)
+        f.seek(size - block)
+        lines = f.read(block).decode('utf-8', errors='ignore').strip().splitlines()
+
+    if not lines:
+        return None
+    try:
+        record = json.loads(lines[-1])
+    except json.JSONDecodeError:
+        return None
+    return record if record.get('type') == 'footer' else None
+
+
+def open_faculty_records(path: str) -> Iterator[Dict]:
+    """
+    Iterator faculty dari file hasil crawl/backup.
+
+    Mendukung journal JSONL (dibaca incremental) maupun file JSON lama
+    ({"faculties": [...]}, dibaca sekaligus). File dibuka saat fungsi dipanggil,
+    sehingga FileNotFoundError / JSONDecodeError file lama langsung terlihat.
+    """
+    if is_journal(path):
+        return (record['data'] for record in iter_journal(path) if record.get('type') == 'faculty')
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return iter(data.get('faculties', []))
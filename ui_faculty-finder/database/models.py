@@ -1,13 +1,75 @@
 import sqlite3
+import hashlib
 import json
 import logging
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime
-from typing import List, Dict, Optional, Union
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import os
 
+from .cache import bump_data_version, create_data_version_table, get_query_cache
+from .writer import get_writer
+
+
+def content_hash(faculty_data: Dict) -> str:
+    """
+    Hash isi fakultas yang di-index (nama, deskripsi, tipe, programs, departments,
+    alamat). Dihitung Faculty saat menulis (faculties.content_hash) dan indexer saat
+    meng-index (index_checksums); keduanya sama selama index mutakhir.
+    """
+    contact = faculty_data.get('contact') or {}
+    content = [
+        faculty_data.get('name') or '', faculty_data.get('description') or '', faculty_data.get('faculty_type') or '',
+        list(faculty_data.get('programs') or []), list(faculty_data.get('departments') or []),
+        (contact.get('address') if isinstance(contact, dict) else None) or ''
+    ]
+    return hashlib.blake2b(json.dumps(content, ensure_ascii=False).encode('utf-8'), digest_size=16).hexdigest()
+
+
 class DatabaseManager:
     """Database manager untuk UI Faculty Finder"""
     
+    # Trigger yang mengisi index_queue saat data yang di-index berubah
+    INDEX_QUEUE_TRIGGERS = [
+        '''CREATE TRIGGER IF NOT EXISTS trg_faculties_insert_index AFTER INSERT ON faculties
+           BEGIN INSERT OR IGNORE INTO index_queue (faculty_id) VALUES (NEW.id); END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_faculties_update_index AFTER UPDATE OF name, description, faculty_type ON faculties
+           WHEN OLD.name IS NOT NEW.name OR OLD.description IS NOT NEW.description OR OLD.faculty_type IS NOT NEW.faculty_type
+           BEGIN INSERT OR IGNORE INTO index_queue (faculty_id) VALUES (NEW.id); END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_faculties_delete_index AFTER DELETE ON faculties
+           BEGIN INSERT OR IGNORE INTO index_queue (faculty_id) VALUES (OLD.id); END''',
+    ] + [
+        trigger
+        for table in ('programs', 'departments', 'contacts')
+        for trigger in (
+            f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_index AFTER INSERT ON {table}
+                BEGIN INSERT OR IGNORE INTO index_queue (faculty_id) SELECT NEW.faculty_id WHERE NEW.faculty_id IS NOT NULL; END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_update_index AFTER UPDATE ON {table}
+                BEGIN
+                    INSERT OR IGNORE INTO index_queue (faculty_id) SELECT OLD.faculty_id WHERE OLD.faculty_id IS NOT NULL;
+                    INSERT OR IGNORE INTO index_queue (faculty_id) SELECT NEW.faculty_id WHERE NEW.faculty_id IS NOT NULL;
+                END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_delete_index AFTER DELETE ON {table}
+                BEGIN INSERT OR IGNORE INTO index_queue (faculty_id) SELECT OLD.faculty_id WHERE OLD.faculty_id IS NOT NULL; END''',
+        )
+    ]
+    
+    # Trigger yang mengosongkan faculties.content_hash saat isinya diubah di luar Faculty
+    # (Faculty mengisinya lagi di akhir penulisan), supaya verify index tetap melihat
+    # perubahan itu walaupun entry index_queue-nya hilang
+    CONTENT_HASH_TRIGGERS = [
+        '''CREATE TRIGGER IF NOT EXISTS trg_faculties_update_hash AFTER UPDATE OF name, description, faculty_type ON faculties
+           WHEN OLD.name IS NOT NEW.name OR OLD.description IS NOT NEW.description OR OLD.faculty_type IS NOT NEW.faculty_type
+           BEGIN UPDATE faculties SET content_hash = NULL WHERE id = NEW.id; END''',
+    ] + [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_hash AFTER {event} ON {table}
+            BEGIN UPDATE faculties SET content_hash = NULL WHERE id IN ({faculty_ids}); END'''
+        for table in ('programs', 'departments', 'contacts')
+        for event, faculty_ids in (('INSERT', 'NEW.faculty_id'), ('UPDATE', 'OLD.faculty_id, NEW.faculty_id'),
+                                   ('DELETE', 'OLD.faculty_id'))
+    ]
+    
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
@@ -17,101 +79,121 @@ class DatabaseManager:
         """Initialize database dengan membuat tabel-tabel yang diperlukan"""
         try:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            get_writer(self.db_path).execute(self._create_schema)
+            self.logger.info("Database initialized successfully")
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('PRAGMA foreign_keys = ON')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS faculties (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        url TEXT UNIQUE NOT NULL,
-                        description TEXT,
-                        faculty_type TEXT DEFAULT 'general',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS programs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        faculty_id INTEGER,
-                        name TEXT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS departments (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        faculty_id INTEGER,
-                        name TEXT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS contacts (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        faculty_id INTEGER UNIQUE,
-                        email TEXT,
-                        phone TEXT,
-                        address TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS routes (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        faculty_id INTEGER,
-                        step_order INTEGER,
-                        name TEXT NOT NULL,
-                        url TEXT NOT NULL,
-                        FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS crawl_metadata (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        base_url TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        total_faculties INTEGER DEFAULT 0,
-                        pages_crawled INTEGER DEFAULT 0,
-                        crawl_duration INTEGER DEFAULT 0,
-                        status TEXT DEFAULT 'completed'
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS search_index (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        faculty_id INTEGER,
-                        content_type TEXT,
-                        content TEXT,
-                        keywords TEXT,
-                        FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
-                    )
-                ''')
-                
-                cursor.execute('''CREATE INDEX IF NOT EXISTS idx_faculties_name ON faculties(name)''')
-                cursor.execute('''CREATE INDEX IF NOT EXISTS idx_faculties_type ON faculties(faculty_type)''')
-                cursor.execute('''CREATE INDEX IF NOT EXISTS idx_search_keywords ON search_index(keywords)''')
-                cursor.execute('''CREATE INDEX IF NOT EXISTS idx_search_content ON search_index(content)''')
-                
-                conn.commit()
-                self.logger.info("Database initialized successfully")
-                
         except sqlite3.Error as e:
             self.logger.error(f"Error initializing database: {e}")
             raise
+    
+    def _create_schema(self, conn):
+        """Buat tabel, index dan trigger (operasi WriteQueue)"""
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS faculties (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                url TEXT UNIQUE NOT NULL,
+                description TEXT,
+                faculty_type TEXT DEFAULT 'general',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                content_hash TEXT
+            )
+        ''')
+        
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(faculties)')}
+        if 'content_hash' not in columns:
+            cursor.execute('ALTER TABLE faculties ADD COLUMN content_hash TEXT')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS programs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                faculty_id INTEGER,
+                name TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS departments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                faculty_id INTEGER,
+                name TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS contacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                faculty_id INTEGER UNIQUE,
+                email TEXT,
+                phone TEXT,
+                address TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS routes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                faculty_id INTEGER,
+                step_order INTEGER,
+                name TEXT NOT NULL,
+                url TEXT NOT NULL,
+                FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_metadata (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                base_url TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                total_faculties INTEGER DEFAULT 0,
+                pages_crawled INTEGER DEFAULT 0,
+                crawl_duration INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'completed'
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                faculty_id INTEGER,
+                content_type TEXT,
+                content TEXT,
+                keywords TEXT,
+                FOREIGN KEY (faculty_id) REFERENCES faculties (id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('''CREATE INDEX IF NOT EXISTS idx_faculties_name ON faculties(name)''')
+        cursor.execute('''CREATE INDEX IF NOT EXISTS idx_faculties_type ON faculties(faculty_type)''')
+        # SearchIndexer mengganti search_index dengan view di atas tabel index ternormalisasi
+        cursor.execute("SELECT type FROM sqlite_master WHERE name = 'search_index'")
+        if cursor.fetchone()[0] == 'table':
+            cursor.execute('''CREATE INDEX IF NOT EXISTS idx_search_keywords ON search_index(keywords)''')
+            cursor.execute('''CREATE INDEX IF NOT EXISTS idx_search_content ON search_index(content)''')
+        
+        # Change tracking untuk search index: trigger menandai fakultas yang
+        # datanya berubah, SearchIndexer.process_index_queue() me-re-index hanya itu
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS index_queue (
+                faculty_id INTEGER PRIMARY KEY,
+                queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        for trigger_sql in self.INDEX_QUEUE_TRIGGERS + self.CONTENT_HASH_TRIGGERS:
+            cursor.execute(trigger_sql)
+        
+        # Counter yang dinaikkan setiap perubahan data/index, untuk invalidasi QueryCache
+        create_data_version_table(cursor)
 
 
 class Faculty:
@@ -119,95 +201,14 @@ class Faculty:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.cache = get_query_cache(db_manager.db_path)
         self.logger = logging.getLogger(__name__)
     
     def create(self, faculty_data: Dict) -> Optional[int]:
-        """Membuat record fakultas baru"""
+        """Membuat record fakultas baru (menunggu commit WriteQueue)"""
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if not faculty_data.get('name') or not faculty_data.get('url'):
-                    self.logger.warning(f"Missing required data: name={faculty_data.get('name')}, url={faculty_data.get('url')}")
-                    return None
-                
-                cursor.execute('''
-                    INSERT OR IGNORE INTO faculties (name, url, description, faculty_type)
-                    VALUES (?, ?, ?, ?)
-                ''', (
-                    faculty_data.get('name', '').strip(),
-                    faculty_data.get('url', '').strip(),
-                    faculty_data.get('description', '').strip(),
-                    faculty_data.get('faculty_type', 'general')
-                ))
-                
-                faculty_id = cursor.lastrowid
-                
-                if faculty_id == 0:
-                    cursor.execute('SELECT id FROM faculties WHERE url = ?', (faculty_data.get('url', '').strip(),))
-                    result = cursor.fetchone()
-                    if result:
-                        faculty_id = result[0]
-                    else:
-                        self.logger.error("Failed to get faculty ID")
-                        return None
-                
-                cursor.execute('DELETE FROM programs WHERE faculty_id = ?', (faculty_id,))
-                cursor.execute('DELETE FROM departments WHERE faculty_id = ?', (faculty_id,))
-                cursor.execute('DELETE FROM routes WHERE faculty_id = ?', (faculty_id,))
-                cursor.execute('DELETE FROM search_index WHERE faculty_id = ?', (faculty_id,))
-                
-                programs = faculty_data.get('programs', [])
-                if programs:
-                    for program in programs:
-                        if program and program.strip():
-                            cursor.execute('''
-                                INSERT INTO programs (faculty_id, name) VALUES (?, ?)
-                            ''', (faculty_id, program.strip()))
-                
-                departments = faculty_data.get('departments', [])
-                if departments:
-                    for department in departments:
-                        if department and department.strip():
-                            cursor.execute('''
-                                INSERT INTO departments (faculty_id, name) VALUES (?, ?)
-                            ''', (faculty_id, department.strip()))
-                
-                contact = faculty_data.get('contact', {})
-                if contact and any(contact.values()):
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO contacts (faculty_id, email, phone, address)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        faculty_id,
-                        contact.get('email', '').strip() if contact.get('email') else None,
-                        contact.get('phone', '').strip() if contact.get('phone') else None,
-                        contact.get('address', '').strip() if contact.get('address') else None
-                    ))
-                
-                routes = faculty_data.get('route', [])
-                if routes:
-                    for i, route_step in enumerate(routes):
-                        if route_step and route_step.get('name'):
-                            cursor.execute('''
-                                INSERT INTO routes (faculty_id, step_order, name, url)
-                                VALUES (?, ?, ?, ?)
-                            ''', (
-                                faculty_id,
-                                i,
-                                route_step.get('name', '').strip(),
-                                route_step.get('url', '').strip()
-                            ))
-                
-                self._create_search_index(cursor, faculty_id, faculty_data)
-                
-                cursor.execute('''
-                    UPDATE faculties SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
-                ''', (faculty_id,))
-                
-                conn.commit()
-                return faculty_id
-                
+            return self.submit(faculty_data).result()
+            
         except sqlite3.Error as e:
             self.logger.error(f"Database error creating faculty: {e}")
             return None
@@ -215,77 +216,135 @@ class Faculty:
             self.logger.error(f"Unexpected error creating faculty: {e}")
             return None
     
-    def _create_search_index(self, cursor, faculty_id: int, faculty_data: Dict):
-        """Membuat index untuk pencarian"""
-        try:
-            name = faculty_data.get('name', '').strip()
-            if name:
-                cursor.execute('''
-                    INSERT INTO search_index (faculty_id, content_type, content, keywords)
-                    VALUES (?, ?, ?, ?)
-                ''', (
-                    faculty_id,
-                    'name',
-                    name,
-                    self._extract_keywords(name)
-                ))
-            
-            description = faculty_data.get('description', '').strip()
-            if description:
+    def submit(self, faculty_data: Dict) -> Future:
+        """Antrikan create ke WriteQueue; Future berisi faculty_id (None jika data tidak lengkap)"""
+        return get_writer(self.db.db_path).submit(self._write_faculty, faculty_data)
+    
+    def create_many(self, faculties_data: Iterable[Dict],
+                    window: int = 1000) -> Iterator[Tuple[Dict, Optional[int], Optional[Exception]]]:
+        """
+        Create banyak fakultas lewat WriteQueue: (faculty_data, faculty_id, error) per record.
+        
+        Sampai `window` record diantrikan sekaligus sehingga writer meng-commit
+        banyak record per transaksi; iterator input dibaca bertahap.
+        """
+        pending = deque()
+        
+        def take():
+            faculty_data, future = pending.popleft()
+            try:
+                return faculty_data, future.result(), None
+            except Exception as e:
+                return faculty_data, None, e
+        
+        for faculty_data in faculties_data:
+            pending.append((faculty_data, self.submit(faculty_data)))
+            if len(pending) >= window:
+                yield take()
+        while pending:
+            yield take()
+    
+    def _write_faculty(self, conn, faculty_data: Dict) -> Optional[int]:
+        """Insert/update satu fakultas beserta relasinya (operasi WriteQueue)"""
+        cursor = conn.cursor()
+        
+        if not faculty_data.get('name') or not faculty_data.get('url'):
+            self.logger.warning(f"Missing required data: name={faculty_data.get('name')}, url={faculty_data.get('url')}")
+            return None
+        
+        cursor.execute('''
+            INSERT OR IGNORE INTO faculties (name, url, description, faculty_type)
+            VALUES (?, ?, ?, ?)
+        ''', (
+            faculty_data.get('name', '').strip(),
+            faculty_data.get('url', '').strip(),
+            faculty_data.get('description', '').strip(),
+            faculty_data.get('faculty_type', 'general')
+        ))
+        
+        # Koneksi WriteQueue dipakai terus, jadi lastrowid insert yang di-IGNORE masih id insert
+        # sebelumnya; rowcount yang menandakan baris baru
+        faculty_id = cursor.lastrowid if cursor.rowcount == 1 else 0
+        
+        if faculty_id == 0:
+            cursor.execute('SELECT id FROM faculties WHERE url = ?', (faculty_data.get('url', '').strip(),))
+            result = cursor.fetchone()
+            if result:
+                faculty_id = result[0]
+            else:
+                self.logger.error("Failed to get faculty ID")
+                return None
+        
+        # Field utama hanya di-update jika berubah, supaya trigger index_queue
+        # hanya menandai fakultas yang datanya benar-benar berubah
+        name = faculty_data.get('name', '').strip()
+        description = faculty_data.get('description', '').strip()
+        faculty_type = faculty_data.get('faculty_type', 'general')
+        cursor.execute('''
+            UPDATE faculties SET name = ?, description = ?, faculty_type = ?
+            WHERE id = ? AND (name IS NOT ? OR description IS NOT ? OR faculty_type IS NOT ?)
+        ''', (name, description, faculty_type, faculty_id, name, description, faculty_type))
+        
+        programs = [program.strip() for program in faculty_data.get('programs', []) if program and program.strip()]
+        cursor.execute('SELECT name FROM programs WHERE faculty_id = ? ORDER BY id', (faculty_id,))
+        if [row[0] for row in cursor.fetchall()] != programs:
+            cursor.execute('DELETE FROM programs WHERE faculty_id = ?', (faculty_id,))
+            cursor.executemany('''
+                INSERT INTO programs (faculty_id, name) VALUES (?, ?)
+            ''', [(faculty_id, program) for program in programs])
+        
+        departments = [department.strip() for department in faculty_data.get('departments', [])
+                       if department and department.strip()]
+        cursor.execute('SELECT name FROM departments WHERE faculty_id = ? ORDER BY id', (faculty_id,))
+        if [row[0] for row in cursor.fetchall()] != departments:
+            cursor.execute('DELETE FROM departments WHERE faculty_id = ?', (faculty_id,))
+            cursor.executemany('''
+                INSERT INTO departments (faculty_id, name) VALUES (?, ?)
+            ''', [(faculty_id, department) for department in departments])
+        
+        contact = faculty_data.get('contact', {})
+        if contact and any(contact.values()):
+            contact_row = tuple(
+                contact.get(key, '').strip() if contact.get(key) else None
+                for key in ('email', 'phone', 'address')
+            )
+            cursor.execute('SELECT email, phone, address FROM contacts WHERE faculty_id = ?', (faculty_id,))
+            if cursor.fetchone() != contact_row:
                 cursor.execute('''
-                    INSERT INTO search_index (faculty_id, content_type, content, keywords)
+                    INSERT OR REPLACE INTO contacts (faculty_id, email, phone, address)
                     VALUES (?, ?, ?, ?)
-                ''', (
-                    faculty_id,
-                    'description',
-                    description,
-                    self._extract_keywords(description)
-                ))
-            
-            programs = faculty_data.get('programs', [])
-            for program in programs:
-                if program and program.strip():
-                    cursor.execute('''
-                        INSERT INTO search_index (faculty_id, content_type, content, keywords)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        faculty_id,
-                        'program',
-                        program.strip(),
-                        self._extract_keywords(program)
-                    ))
-            
-            departments = faculty_data.get('departments', [])
-            for department in departments:
-                if department and department.strip():
+                ''', (faculty_id, *contact_row))
+        
+        cursor.execute('DELETE FROM routes WHERE faculty_id = ?', (faculty_id,))
+        
+        routes = faculty_data.get('route', [])
+        if routes:
+            for i, route_step in enumerate(routes):
+                if route_step and route_step.get('name'):
                     cursor.execute('''
-                        INSERT INTO search_index (faculty_id, content_type, content, keywords)
+                        INSERT INTO routes (faculty_id, step_order, name, url)
                         VALUES (?, ?, ?, ?)
                     ''', (
                         faculty_id,
-                        'department',
-                        department.strip(),
-                        self._extract_keywords(department)
+                        i,
+                        route_step.get('name', '').strip(),
+                        route_step.get('url', '').strip()
                     ))
-                    
-        except sqlite3.Error as e:
-            self.logger.error(f"Error creating search index: {e}")
-    
-    def _extract_keywords(self, text: str) -> str:
-        """Ekstrak kata kunci dari teks untuk indexing"""
-        if not text:
-            return ""
         
-        import re
-        words = re.findall(r'\b\w+\b', text.lower())
+        # Hash dari isi yang tersimpan (alamat lama tetap dipakai jika contact tidak dikirim)
+        cursor.execute('SELECT address FROM contacts WHERE faculty_id = ?', (faculty_id,))
+        address_row = cursor.fetchone()
+        stored_hash = content_hash({
+            'name': name, 'description': description, 'faculty_type': faculty_type,
+            'programs': programs, 'departments': departments,
+            'contact': {'address': address_row[0] if address_row else None}
+        })
+        cursor.execute('''
+            UPDATE faculties SET updated_at = CURRENT_TIMESTAMP, content_hash = ? WHERE id = ?
+        ''', (stored_hash, faculty_id))
+        bump_data_version(conn)
         
-        stopwords = {
-            'dan', 'atau', 'yang', 'dari', 'di', 'ke', 'pada', 'untuk', 'dengan', 
-            'adalah', 'ini', 'itu', 'the', 'of', 'and', 'in', 'to', 'for', 'with'
-        }
-        keywords = [word for word in words if len(word) > 2 and word not in stopwords]
-        
-        return ' '.join(set(keywords))
+        return faculty_id
     
     def get_by_id(self, faculty_id: int) -> Optional[Dict]:
         """Ambil fakultas berdasarkan ID dengan data lengkap"""
@@ -331,59 +390,20 @@ class Faculty:
             return None
     
     def search(self, query: str, limit: int = 20) -> List[Dict]:
-        """Pencarian fakultas berdasarkan query dengan scoring"""
+        """
+        Pencarian fakultas berdasarkan query dengan scoring
+        
+        Hasil di-cache (QueryCache) per query ternormalisasi dan limit sampai
+        data berubah; list hasil dipakai bersama, jangan diubah.
+        """
+        if not query or not query.strip():
+            return self.get_all(limit=limit)
+        
+        normalized = query.lower().strip()
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                if not query or not query.strip():
-                    return self.get_all(limit=limit)
-                
-                search_pattern = f"%{query.lower().strip()}%"
-                
-                search_sql = '''
-                    SELECT DISTINCT f.*, 
-                           (CASE WHEN LOWER(f.name) LIKE ? THEN 10 ELSE 0 END +
-                            CASE WHEN LOWER(f.description) LIKE ? THEN 5 ELSE 0 END +
-                            CASE WHEN EXISTS(SELECT 1 FROM programs p WHERE p.faculty_id = f.id AND LOWER(p.name) LIKE ?) THEN 8 ELSE 0 END +
-                            CASE WHEN EXISTS(SELECT 1 FROM departments d WHERE d.faculty_id = f.id AND LOWER(d.name) LIKE ?) THEN 6 ELSE 0 END +
-                            CASE WHEN EXISTS(SELECT 1 FROM search_index si WHERE si.faculty_id = f.id AND LOWER(si.keywords) LIKE ?) THEN 3 ELSE 0 END
-                           ) as relevance_score
-                    FROM faculties f
-                    WHERE LOWER(f.name) LIKE ? 
-                       OR LOWER(f.description) LIKE ?
-                       OR EXISTS(SELECT 1 FROM programs p WHERE p.faculty_id = f.id AND LOWER(p.name) LIKE ?)
-                       OR EXISTS(SELECT 1 FROM departments d WHERE d.faculty_id = f.id AND LOWER(d.name) LIKE ?)
-                       OR EXISTS(SELECT 1 FROM search_index si WHERE si.faculty_id = f.id AND LOWER(si.keywords) LIKE ?)
-                    HAVING relevance_score > 0
-                    ORDER BY relevance_score DESC, f.name ASC
-                    LIMIT ?
-                '''
-                
-                params = [search_pattern] * 10 + [limit]
-                cursor.execute(search_sql, params)
-                
-                results = []
-                for row in cursor.fetchall():
-                    faculty = dict(row)
-                    
-                    cursor.execute('SELECT COUNT(*) as count FROM programs WHERE faculty_id = ?', (faculty['id'],))
-                    faculty['programs_count'] = cursor.fetchone()['count']
-                    
-                    cursor.execute('SELECT COUNT(*) as count FROM departments WHERE faculty_id = ?', (faculty['id'],))
-                    faculty['departments_count'] = cursor.fetchone()['count']
-                    
-                    cursor.execute('SELECT name FROM programs WHERE faculty_id = ? LIMIT 3', (faculty['id'],))
-                    faculty['sample_programs'] = [row['name'] for row in cursor.fetchall()]
-                    
-                    cursor.execute('SELECT name FROM departments WHERE faculty_id = ? LIMIT 3', (faculty['id'],))
-                    faculty['sample_departments'] = [row['name'] for row in cursor.fetchall()]
-                    
-                    results.append(faculty)
-                
-                return results
-                
+            return self.cache.get_or_compute(('faculty.search', normalized, limit),
+                                             lambda: self._search(normalized, limit))
+        
         except sqlite3.Error as e:
             self.logger.error(f"Database error searching faculties: {e}")
             return []
@@ -391,6 +411,56 @@ class Faculty:
             self.logger.error(f"Unexpected error searching faculties: {e}")
             return []
     
+    def _search(self, normalized_query: str, limit: int) -> List[Dict]:
+        """Query LIKE berskor untuk search() (exception diteruskan supaya tidak di-cache)"""
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            search_pattern = f"%{normalized_query}%"
+            
+            search_sql = '''
+                SELECT DISTINCT f.*, 
+                       (CASE WHEN LOWER(f.name) LIKE ? THEN 10 ELSE 0 END +
+                        CASE WHEN LOWER(f.description) LIKE ? THEN 5 ELSE 0 END +
+                        CASE WHEN EXISTS(SELECT 1 FROM programs p WHERE p.faculty_id = f.id AND LOWER(p.name) LIKE ?) THEN 8 ELSE 0 END +
+                        CASE WHEN EXISTS(SELECT 1 FROM departments d WHERE d.faculty_id = f.id AND LOWER(d.name) LIKE ?) THEN 6 ELSE 0 END +
+                        CASE WHEN EXISTS(SELECT 1 FROM search_index si WHERE si.faculty_id = f.id AND LOWER(si.keywords) LIKE ?) THEN 3 ELSE 0 END
+                       ) as relevance_score
+                FROM faculties f
+                WHERE LOWER(f.name) LIKE ? 
+                   OR LOWER(f.description) LIKE ?
+                   OR EXISTS(SELECT 1 FROM programs p WHERE p.faculty_id = f.id AND LOWER(p.name) LIKE ?)
+                   OR EXISTS(SELECT 1 FROM departments d WHERE d.faculty_id = f.id AND LOWER(d.name) LIKE ?)
+                   OR EXISTS(SELECT 1 FROM search_index si WHERE si.faculty_id = f.id AND LOWER(si.keywords) LIKE ?)
+                HAVING relevance_score > 0
+                ORDER BY relevance_score DESC, f.name ASC
+                LIMIT ?
+            '''
+            
+            params = [search_pattern] * 10 + [limit]
+            cursor.execute(search_sql, params)
+            
+            results = []
+            for row in cursor.fetchall():
+                faculty = dict(row)
+                
+                cursor.execute('SELECT COUNT(*) as count FROM programs WHERE faculty_id = ?', (faculty['id'],))
+                faculty['programs_count'] = cursor.fetchone()['count']
+                
+                cursor.execute('SELECT COUNT(*) as count FROM departments WHERE faculty_id = ?', (faculty['id'],))
+                faculty['departments_count'] = cursor.fetchone()['count']
+                
+                cursor.execute('SELECT name FROM programs WHERE faculty_id = ? LIMIT 3', (faculty['id'],))
+                faculty['sample_programs'] = [row['name'] for row in cursor.fetchall()]
+                
+                cursor.execute('SELECT name FROM departments WHERE faculty_id = ? LIMIT 3', (faculty['id'],))
+                faculty['sample_departments'] = [row['name'] for row in cursor.fetchall()]
+                
+                results.append(faculty)
+            
+            return results
+    
     def get_all(self, limit: int = None, offset: int = 0) -> List[Dict]:
         """Ambil semua fakultas dengan pagination"""
         try:
@@ -437,43 +507,42 @@ class Faculty:
             return 0
     
     def bulk_insert(self, faculties_data: List[Dict]) -> Dict:
-        """Insert multiple faculties sekaligus"""
+        """Insert multiple faculties sekaligus (di-commit berkelompok oleh WriteQueue)"""
         results = {
             'success': 0,
             'failed': 0,
             'errors': []
         }
         
-        for i, faculty_data in enumerate(faculties_data):
-            try:
-                faculty_id = self.create(faculty_data)
-                if faculty_id:
-                    results['success'] += 1
-                else:
-                    results['failed'] += 1
-                    results['errors'].append(f"Failed to insert: {faculty_data.get('name', 'Unknown')}")
-                    
-            except Exception as e:
+        for faculty_data, faculty_id, error in self.create_many(faculties_data):
+            if error is not None:
                 results['failed'] += 1
-                error_msg = f"Error inserting {faculty_data.get('name', 'Unknown')}: {str(e)}"
+                error_msg = f"Error inserting {faculty_data.get('name', 'Unknown')}: {str(error)}"
                 results['errors'].append(error_msg)
                 self.logger.error(error_msg)
+            elif faculty_id:
+                results['success'] += 1
+            else:
+                results['failed'] += 1
+                results['errors'].append(f"Failed to insert: {faculty_data.get('name', 'Unknown')}")
         
         return results
     
     def delete_by_id(self, faculty_id: int) -> bool:
         """Hapus fakultas berdasarkan ID"""
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM faculties WHERE id = ?', (faculty_id,))
-                deleted = cursor.rowcount > 0
-                conn.commit()
-                return deleted
-                
+            return get_writer(self.db.db_path).execute(self._delete_faculty, faculty_id)
+            
         except sqlite3.Error as e:
             self.logger.error(f"Error deleting faculty {faculty_id}: {e}")
             return False
+    
+    def _delete_faculty(self, conn, faculty_id: int) -> bool:
+        """Hapus satu fakultas (operasi WriteQueue)"""
+        if conn.execute('DELETE FROM faculties WHERE id = ?', (faculty_id,)).rowcount == 0:
+            return False
+        bump_data_version(conn)
+        return True
 
 
 class CrawlMetadata:
@@ -486,17 +555,11 @@ class CrawlMetadata:
     def create_crawl_record(self, base_url: str, total_faculties: int, pages_crawled: int, duration: int = 0) -> Optional[int]:
         """Buat record crawling baru"""
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO crawl_metadata (base_url, total_faculties, pages_crawled, crawl_duration)
-                    VALUES (?, ?, ?, ?)
-                ''', (base_url, total_faculties, pages_crawled, duration))
-                
-                crawl_id = cursor.lastrowid
-                conn.commit()
-                return crawl_id
-                
+            return get_writer(self.db.db_path).execute(lambda conn: conn.execute('''
+                INSERT INTO crawl_metadata (base_url, total_faculties, pages_crawled, crawl_duration)
+                VALUES (?, ?, ?, ?)
+            ''', (base_url, total_faculties, pages_crawled, duration)).lastrowid)
+            
         except sqlite3.Error as e:
             self.logger.error(f"Error creating crawl metadata: {e}")
             return None
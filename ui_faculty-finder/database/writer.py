@@ -0,0 +1,236 @@
+"""
+Single writer untuk database SQLite
+
+Semua penulisan aplikasi (import fakultas, crawl metadata, clear data,
+indexer) lewat satu WriteQueue per file database: satu thread writer
+pemilik satu-satunya koneksi tulis, mengambil operasi dari antrian dan
+menjalankannya dalam batch (group commit). Operasi yang menunggu selama
+commit sebelumnya berjalan di-commit bersama dalam satu transaksi, jadi
+writer tidak pernah saling berebut lock dan banyak transaksi kecil
+digabung menjadi satu fsync.
+
+Operasi adalah callable func(conn, *args) yang dijalankan di thread writer
+di dalam transaksi yang sedang berjalan (tanpa BEGIN/COMMIT sendiri).
+Setiap operasi dibungkus SAVEPOINT: operasi yang gagal di-rollback sendiri
+tanpa membatalkan operasi lain di batch yang sama. submit() mengembalikan
+Future yang selesai setelah COMMIT batch-nya berhasil.
+"""
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Penanda berhenti untuk thread writer
+_STOP = object()
+
+
+class WriteQueue:
+    """Antrian operasi tulis dengan satu thread writer dan group commit"""
+
+    def __init__(self, db_path: str, max_batch: int = 256, commit_delay: float = 0.0, timeout: float = 60.0):
+        """
+        Args:
+            db_path: path database SQLite
+            max_batch: operasi maksimum per transaksi
+            commit_delay: detik menunggu operasi lain sebelum commit batch yang
+                belum penuh (0 = hanya menggabungkan operasi yang sudah antri)
+            timeout: busy timeout koneksi tulis (penulis di proses lain)
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.commit_delay = commit_delay
+        self.timeout = timeout
+        self.stats = Counter()  # operations, failed, commits, batch_failures
+        self._queue = queue.Queue()
+        self._conn = None
+        self._closed = False
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'sqlite-writer:{os.path.basename(db_path)}',
+                                        daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=10000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        return conn
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Antrikan func(conn, *args, **kwargs); Future berisi hasilnya setelah di-commit"""
+        if threading.current_thread() is self._thread:
+            # Dipanggil dari operasi lain: jalankan langsung di transaksi yang sedang berjalan
+            future = Future()
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(func(self._conn, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        if self._closed:
+            raise RuntimeError(f"WriteQueue for {self.db_path} is closed")
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def execute(self, func: Callable, *args, **kwargs):
+        """submit() lalu tunggu hasilnya (exception operasi diteruskan)"""
+        return self.submit(func, *args, **kwargs).result()
+
+    def flush(self):
+        """Tunggu sampai semua operasi yang sudah diantrikan selesai"""
+        self.execute(lambda conn: None)
+
+    def close(self):
+        """Selesaikan antrian lalu hentikan thread writer"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            self._conn = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"Cannot open write connection to {self.db_path}: {e}")
+            self._closed = True
+        self._ready.set()
+        if self._conn is None:
+            self._fail_pending(RuntimeError(f"WriteQueue for {self.db_path} has no connection"))
+            return
+
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._commit_batch(batch)
+        self._conn.close()
+
+    def _next_batch(self) -> Tuple[List, bool]:
+        """Operasi untuk satu transaksi: yang pertama (blocking) lalu yang sudah antri"""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.commit_delay
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit_batch(self, batch: List):
+        conn = self._conn
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+        except sqlite3.Error as e:
+            self._fail(batch, e)
+            return
+
+        done = []
+        for position, (future, func, args, kwargs) in enumerate(batch):
+            if not future.set_running_or_notify_cancel():
+                continue
+            conn.execute('SAVEPOINT write_op')
+            try:
+                result = func(conn, *args, **kwargs)
+            except BaseException as e:
+                self.stats['failed'] += 1
+                future.set_exception(e)
+                if not conn.in_transaction:
+                    # SQLite sudah membatalkan seluruh transaksi (mis. disk penuh)
+                    self._fail(done + batch[position + 1:], e)
+                    return
+                conn.execute('ROLLBACK TO write_op')
+                conn.execute('RELEASE write_op')
+                continue
+            conn.execute('RELEASE write_op')
+            done.append((future, result))
+
+        try:
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            self._fail(done, e)
+            return
+
+        self.stats['commits'] += 1
+        self.stats['operations'] += len(done)
+        for future, result in done:
+            future.set_result(result)
+
+    def _fail(self, items: List, error: Exception):
+        """Tandai operasi satu batch gagal (Future berisi error transaksi)"""
+        self.stats['batch_failures'] += 1
+        logger.error(f"Write batch of {len(items)} operations failed: {error}")
+        for item in items:
+            future = item[0]
+            if future.done():
+                continue
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _fail_pending(self, error: Exception):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                self._fail([item], error)
+
+
+_writers: Dict[str, WriteQueue] = {}
+_writers_lock = threading.Lock()
+
+
+def _writer_key(db_path: str) -> str:
+    return db_path if db_path == ':memory:' else os.path.abspath(db_path)
+
+
+def get_writer(db_path: str, **options) -> WriteQueue:
+    """
+    WriteQueue bersama untuk db_path (dibuat saat pertama dipakai).
+
+    options (max_batch, commit_delay, timeout) hanya berlaku saat writer dibuat.
+    """
+    key = _writer_key(db_path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = _writers[key] = WriteQueue(db_path, **options)
+        return writer
+
+
+def close_writers():
+    """Tutup semua writer (menunggu operasi yang masih antri)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_writers)
+# Thread writer tidak ikut ke proses hasil fork (mis. worker rebuild paralel)
+os.register_at_fork(after_in_child=_writers.clear)
@@ -6,5 +6,6 @@ Berisi search engine dan indexing functionality untuk pencarian fakultas
 
 from .search_engine import FacultySearchEngine
 from .indexer import SearchIndexer
+from .analysis import normalize_text, tokenize
 
-__all__ = ['FacultySearchEngine', 'SearchIndexer']
\ No newline at end of file
+__all__ = ['FacultySearchEngine', 'SearchIndexer', 'normalize_text', 'tokenize']
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Text analysis bersama untuk SearchIndexer dan FacultySearchEngine
+
+Index dan query harus memakai normalisasi dan tokenisasi yang sama, supaya
+term di query bisa langsung dicari di term dictionary.
+"""
+import re
+from functools import lru_cache
+from typing import List, Optional, Set
+
+from .stemmer import stem
+
+# Indonesian + English stopwords (sama dengan yang dipakai indexer)
+INDEX_STOPWORDS = {
+    'dan', 'atau', 'yang', 'dari', 'di', 'ke', 'pada', 'untuk', 'dengan',
+    'adalah', 'ini', 'itu', 'akan', 'dapat', 'telah', 'sudah', 'oleh',
+    'dalam', 'sebagai', 'menjadi', 'karena', 'jika', 'saat', 'ketika',
+    'dimana', 'bagian', 'bagaimana', 'mengapa', 'siapa', 'kapan',
+    'sebuah', 'suatu', 'satu', 'dua', 'tiga', 'empat', 'lima',
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to',
+    'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'ada', 'tidak', 'bisa', 'hanya', 'juga', 'lebih', 'sama', 'lain'
+}
+
+# Kamus ekspansi term, dipakai index dan query dari satu tempat:
+#   singkatan fakultas -> bentuk panjang (menggantikan singkatan saat normalisasi)
+ABBREVIATIONS = {
+    'ft': 'fakultas teknik',
+    'fk': 'fakultas kedokteran',
+    'feb': 'fakultas ekonomi bisnis',
+    'fh': 'fakultas hukum',
+    'fisip': 'fakultas ilmu sosial politik',
+    'fib': 'fakultas ilmu budaya',
+    'fpsi': 'fakultas psikologi',
+    'fkg': 'fakultas kedokteran gigi',
+    'fkm': 'fakultas kesehatan masyarakat',
+    'fik': 'fakultas ilmu keperawatan',
+    'mipa': 'matematika ilmu pengetahuan alam',
+}
+
+#   term kanonik -> sinonim/terjemahan; indexer menulis term kanonik ke postings
+#   di posisi sinonimnya, jadi query "kedokteran" cukup lookup satu term
+SYNONYMS = {
+    'kedokteran': ['medical', 'medicine', 'dokter', 'medis'],
+    'teknik': ['engineering', 'engineer', 'teknologi', 'tech'],
+    'ekonomi': ['economy', 'business', 'bisnis', 'manajemen'],
+    'hukum': ['law', 'legal'],
+    'ilmu': ['science', 'sains'],
+    'komputer': ['computer', 'informatika', 'it'],
+    'sosial': ['social'],
+    'budaya': ['culture', 'cultural'],
+    'politik': ['political', 'politics'],
+    'matematika': ['math', 'mathematics'],
+    'psikologi': ['psychology', 'psych'],
+    'kesehatan': ['health'],
+    'gigi': ['dental', 'dentistry'],
+    'keperawatan': ['nursing'],
+    'vokasi': ['vocational']
+}
+
+# Dikompilasi jadi lookup per token (satu pass, tanpa regex per singkatan)
+_ABBREVIATION_TOKENS = {abbreviation: expansion.split() for abbreviation, expansion in ABBREVIATIONS.items()}
+CANONICAL_TERMS = {variant: canonical for canonical, variants in SYNONYMS.items() for variant in variants}
+
+# Naikkan jika normalisasi/ekspansi/stemming berubah: index dengan versi lain dibangun ulang
+ANALYZER_VERSION = 3
+
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+_TOKEN_PATTERN = re.compile(r'^[a-zA-Z0-9]+$')
+
+
+@lru_cache(maxsize=65536)
+def normalize_text(text: str) -> str:
+    """Lowercase, expand singkatan, buang karakter khusus (di-cache: nama program dll. sering berulang)"""
+    if not text:
+        return ''
+
+    words = []
+    for word in _NON_WORD_PATTERN.sub(' ', text.lower()).split():
+        expansion = _ABBREVIATION_TOKENS.get(word)
+        if expansion:
+            words.extend(expansion)
+        else:
+            words.append(word)
+    return ' '.join(words)
+
+
+def canonical_term(token: str) -> Optional[str]:
+    """Term kanonik untuk sinonim (None jika token bukan sinonim)"""
+    return CANONICAL_TERMS.get(token)
+
+
+def term_variants(token: str) -> List[str]:
+    """
+    Term tambahan yang diindeks di posisi token: term kanonik sinonimnya dan
+    kata dasar (stem) token maupun term kanoniknya, tanpa token itu sendiri.
+    """
+    canonical = canonical_term(token)
+    variants = []
+    for term in (canonical, stem(token), stem(canonical) if canonical else None):
+        if term and term != token and term not in variants:
+            variants.append(term)
+    return variants
+
+
+def tokenize(text: str, stopwords: Optional[Set[str]] = None) -> List[str]:
+    """Token (unigram) dalam urutan kemunculan, duplikat tetap dipertahankan"""
+    stopwords = INDEX_STOPWORDS if stopwords is None else stopwords
+    return [
+        word for word in normalize_text(text).split()
+        if len(word) >= 2 and word not in stopwords and not word.isdigit() and _TOKEN_PATTERN.match(word)
+    ]
@@ -0,0 +1,333 @@
+"""
+Index biner read-only untuk pencarian tanpa SQLite
+
+SearchIndexer.export_binary_index menulis snapshot inverted index (term
+dictionary, postings berskor dan tabel dokumen) ke satu file immutable;
+FacultySearchEngine membukanya dengan mmap. Term dicari dengan binary search
+langsung di halaman file dan postings dibaca sebagai array NumPy di atas
+buffer mmap (zero-copy), jadi tidak ada deserialisasi saat start dan page
+cache dipakai bersama oleh semua worker process.
+
+Selain postings, file menyimpan bitmap dokumen terkompresi (lihat bitmap.py)
+per (term, field), per field dan per faculty_type, supaya filter tipe,
+facet dan kombinasi boolean cukup operasi bitwise.
+
+Layout file (little-endian, tiap section rata 8 byte):
+    header    HEADER
+    meta      JSON (fields, types, generation, pengaturan index)
+    terms     TERM per term, urut byte UTF-8 term (= urutan BINARY SQLite)
+    postings  skor float64[P], dokumen uint32[P], field uint8[P]; postings satu
+              term berurutan, dokumen = nomor urut di tabel dokumen
+    docs      DOC per dokumen, urut (nama, id) supaya urutan nomor dokumen sama
+              dengan ORDER BY name
+    bitmaps   BITMAP per (term, field), urut term lalu kode field
+    facets    BITMAP per field (urutan meta fields) lalu per tipe (urutan meta types)
+    blobs     isi bitmap
+    strings   term dan baris dokumen (JSON) dalam UTF-8
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .bitmap import decode_bitmap, encode_bitmap, members, to_mask
+
+MAGIC = b'UIFX'
+VERSION = 2
+
+# magic, versi, jumlah term, jumlah dokumen, jumlah postings, offset+panjang meta,
+# offset terms/postings/docs/bitmaps/facets/blobs/strings
+HEADER = struct.Struct('<4sIIIQQQQQQQQQQ')
+# offset term di strings, panjang, posting pertama, jumlah posting, bitmap pertama, jumlah bitmap
+TERM = struct.Struct('<IIIIII')
+# faculty_id, offset baris dokumen di strings, panjang
+DOC = struct.Struct('<qII')
+# kode field, encoding container, panjang, offset di blobs
+BITMAP = struct.Struct('<BBxxII')
+
+
+def _align(buffer: bytearray, size: int = 8):
+    buffer.extend(b'\0' * (-len(buffer) % size))
+
+
+def write_binary_index(path: str, fields: Sequence[str], docs: Sequence[Dict],
+                       postings: Iterable[Tuple[str, int, str, float]], meta: Optional[Dict] = None) -> Dict[str, int]:
+    """
+    Tulis file index biner secara atomik (file sementara lalu os.replace, jadi
+    pembaca yang sedang mmap file lama tidak terganggu).
+
+    Args:
+        fields: nama field, kode field = posisi di list ini
+        docs: baris dokumen (minimal 'id', 'name' dan 'faculty_type'), dikembalikan apa adanya saat pencarian
+        postings: (term, faculty_id, field, skor) urut term
+        meta: info tambahan untuk header meta (mis. generation)
+
+    Returns jumlah term, dokumen, postings dan bitmap yang ditulis.
+    """
+    docs = sorted(docs, key=lambda doc: (doc['name'] or '', doc['id']))
+    doc_numbers = {doc['id']: number for number, doc in enumerate(docs)}
+    field_codes = {field: code for code, field in enumerate(fields)}
+    doc_count = len(docs)
+
+    terms, term_starts = [], []
+    scores, doc_ids, field_ids = [], [], []
+    for term, faculty_id, field, score in postings:
+        number = doc_numbers.get(faculty_id)
+        if number is None:
+            continue  # Dokumen tanpa baris fakultas (sudah dihapus)
+        if not terms or term != terms[-1]:
+            terms.append(term)
+            term_starts.append(len(scores))
+        scores.append(score)
+        doc_ids.append(number)
+        field_ids.append(field_codes[field])
+    term_starts.append(len(scores))
+    doc_ids = np.asarray(doc_ids, dtype='<u4')
+    field_ids = np.asarray(field_ids, dtype='u1')
+
+    blobs = bytearray()
+
+    def pack_bitmap(field_code: int, numbers: np.ndarray) -> bytes:
+        encoding, data = encode_bitmap(numbers, doc_count)
+        _align(blobs, 4)
+        record = BITMAP.pack(field_code, encoding, len(data), len(blobs))
+        blobs.extend(data)
+        return record
+
+    strings = bytearray()
+    term_table = bytearray()
+    bitmap_table = bytearray()
+    bitmap_count = 0
+    for index, term in enumerate(terms):
+        start, end = term_starts[index], term_starts[index + 1]
+        term_docs, term_fields = doc_ids[start:end], field_ids[start:end]
+        codes = np.unique(term_fields).tolist()
+        for code in codes:
+            bitmap_table += pack_bitmap(code, np.unique(term_docs[term_fields == code]))
+        encoded = term.encode('utf-8')
+        term_table += TERM.pack(len(strings), len(encoded), start, end - start, bitmap_count, len(codes))
+        bitmap_count += len(codes)
+        strings += encoded
+
+    types = sorted({doc['faculty_type'] for doc in docs if doc.get('faculty_type')})
+    doc_types = np.array([doc.get('faculty_type') or '' for doc in docs], dtype=object)
+    facet_table = bytearray()
+    for code in range(len(fields)):
+        facet_table += pack_bitmap(code, np.unique(doc_ids[field_ids == code]))
+    for faculty_type in types:
+        facet_table += pack_bitmap(0, np.flatnonzero(doc_types == faculty_type))
+
+    doc_table = bytearray()
+    for doc in docs:
+        row = json.dumps(doc, ensure_ascii=False, default=str).encode('utf-8')
+        doc_table += DOC.pack(doc['id'], len(strings), len(row))
+        strings += row
+
+    meta_bytes = json.dumps(dict(meta or {}, fields=list(fields), types=types)).encode('utf-8')
+    postings_bytes = (np.asarray(scores, dtype='<f8').tobytes() + doc_ids.tobytes() + field_ids.tobytes())
+    sections = [meta_bytes, term_table, postings_bytes, doc_table, bitmap_table, facet_table, blobs, strings]
+
+    body = bytearray()
+    offsets = []
+    for section in sections:
+        _align(body)
+        offsets.append(HEADER.size + len(body))
+        body += section
+
+    header = HEADER.pack(MAGIC, VERSION, len(terms), doc_count, len(scores),
+                         offsets[0], len(meta_bytes), *offsets[1:])
+
+    temp_path = f'{path}.tmp{os.getpid()}'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(temp_path, path)
+    return {'terms': len(terms), 'documents': doc_count, 'postings': len(scores),
+            'bitmaps': bitmap_count + len(fields) + len(types)}
+
+
+def read_meta(path: str) -> Optional[Dict]:
+    """Meta file index biner, None jika file tidak ada atau versinya lain"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return None
+            magic, version, *_, meta_offset, meta_length = HEADER.unpack(header)[:7]
+            if magic != MAGIC or version != VERSION:
+                return None
+            f.seek(meta_offset)
+            return json.loads(f.read(meta_length))
+    except (OSError, ValueError):
+        return None
+
+
+class BinaryIndex:
+    """File index biner yang di-mmap; semua lookup membaca langsung dari buffer mmap"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mm)
+
+        (magic, version, self.term_count, self.doc_count, posting_count, meta_offset, meta_length,
+         self._terms_offset, postings_offset, self._docs_offset, self._bitmaps_offset, self._facets_offset,
+         self._blobs_offset, self._strings_offset) = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Bukan index biner versi {VERSION}: {path}")
+
+        self.meta = json.loads(self._buffer[meta_offset:meta_offset + meta_length].tobytes())
+        self.fields = self.meta['fields']
+        self.types = self.meta['types']
+        self.field_codes = {field: code for code, field in enumerate(self.fields)}
+        self._type_codes = {faculty_type: code for code, faculty_type in enumerate(self.types)}
+        self._facets = {}  # Bitmap field/tipe (sedikit dan sering dipakai) di-cache sebagai int
+
+        # View NumPy di atas mmap, tanpa salinan
+        self._scores = np.frombuffer(self._mm, dtype='<f8', count=posting_count, offset=postings_offset)
+        self._docs = np.frombuffer(self._mm, dtype='<u4', count=posting_count, offset=postings_offset + 8 * posting_count)
+        self._fields = np.frombuffer(self._mm, dtype='u1', count=posting_count, offset=postings_offset + 12 * posting_count)
+
+    def _term(self, index: int) -> Tuple[bytes, int, int, int, int]:
+        """(term UTF-8, posting pertama, jumlah posting, bitmap pertama, jumlah bitmap)"""
+        offset, length, start, count, bitmap_start, bitmap_count = TERM.unpack_from(
+            self._mm, self._terms_offset + index * TERM.size)
+        offset += self._strings_offset
+        return self._mm[offset:offset + length], start, count, bitmap_start, bitmap_count
+
+    def _find(self, term: str) -> Optional[int]:
+        """Nomor term lewat binary search, None jika tidak ada"""
+        key = term.encode('utf-8')
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count and self._term(low)[0] == key:
+            return low
+        return None
+
+    def find(self, term: str) -> Optional[Tuple[int, int]]:
+        """(posting pertama, jumlah posting) term, None jika tidak ada"""
+        index = self._find(term)
+        return None if index is None else self._term(index)[1:3]
+
+    def __contains__(self, term: str) -> bool:
+        return self._find(term) is not None
+
+    def _bitmap(self, record_offset: int) -> Tuple[int, int]:
+        """(kode field, bitmap) dari record BITMAP di offset file"""
+        field_code, encoding, length, offset = BITMAP.unpack_from(self._mm, record_offset)
+        offset += self._blobs_offset
+        return field_code, decode_bitmap(encoding, self._buffer[offset:offset + length], self.doc_count)
+
+    def term_bitmap(self, term: str, fields: Optional[Tuple[str, ...]] = None) -> int:
+        """Dokumen yang memuat term (di salah satu fields jika diberikan)"""
+        index = self._find(term)
+        if index is None:
+            return 0
+        _, _, _, bitmap_start, bitmap_count = self._term(index)
+        codes = {self.field_codes[field] for field in fields if field in self.field_codes} if fields else None
+        bitmap = 0
+        for position in range(bitmap_start, bitmap_start + bitmap_count):
+            field_code, field_bitmap = self._bitmap(self._bitmaps_offset + position * BITMAP.size)
+            if codes is None or field_code in codes:
+                bitmap |= field_bitmap
+        return bitmap
+
+    def _facet(self, position: int) -> int:
+        bitmap = self._facets.get(position)
+        if bitmap is None:
+            bitmap = self._facets[position] = self._bitmap(self._facets_offset + position * BITMAP.size)[1]
+        return bitmap
+
+    def field_bitmap(self, field: str) -> int:
+        """Dokumen yang punya isi di field"""
+        code = self.field_codes.get(field)
+        return 0 if code is None else self._facet(code)
+
+    def type_bitmap(self, faculty_type: str) -> int:
+        """Dokumen dengan faculty_type ini"""
+        code = self._type_codes.get(faculty_type)
+        return 0 if code is None else self._facet(len(self.fields) + code)
+
+    def all_documents(self) -> int:
+        return (1 << self.doc_count) - 1
+
+    def match(self, terms: Iterable[str], fields: Optional[Tuple[str, ...]] = None) -> int:
+        """Dokumen yang memuat salah satu term (OR)"""
+        bitmap = 0
+        for term in set(terms):
+            bitmap |= self.term_bitmap(term, fields)
+        return bitmap
+
+    def facet_counts(self, bitmap: int) -> Dict[str, int]:
+        """Jumlah dokumen bitmap per faculty_type (tipe tanpa dokumen tidak ikut)"""
+        counts = {faculty_type: (bitmap & self.type_bitmap(faculty_type)).bit_count() for faculty_type in self.types}
+        return {faculty_type: count for faculty_type, count in counts.items() if count}
+
+    def document(self, number: int) -> Dict:
+        _, offset, length = DOC.unpack_from(self._mm, self._docs_offset + number * DOC.size)
+        offset += self._strings_offset
+        return json.loads(self._buffer[offset:offset + length].tobytes())
+
+    def documents(self, bitmap: int, limit: int) -> List[Dict]:
+        """Baris dokumen di bitmap urut nama (= urut nomor dokumen)"""
+        return [self.document(number) for number in members(bitmap, self.doc_count)[:limit].tolist()]
+
+    def search(self, terms: Iterable[str], limit: int, fields: Optional[Tuple[str, ...]] = None,
+               faculty_type: Optional[str] = None) -> List[Dict]:
+        """
+        Jumlah skor postings per dokumen untuk term yang diberikan, urut skor
+        tertinggi lalu nama (sama dengan FacultySearchEngine._index_search).
+
+        faculty_type menyaring dokumen lewat bitmap tipe sebelum skor dijumlahkan.
+        """
+        codes = [self.field_codes[field] for field in fields if field in self.field_codes] if fields else None
+        allowed = None
+        if faculty_type is not None:
+            type_bitmap = self.type_bitmap(faculty_type)
+            if not type_bitmap:
+                return []
+            allowed = to_mask(type_bitmap, self.doc_count)
+
+        doc_parts, score_parts = [], []
+        match_count = np.zeros(self.doc_count, dtype=np.int64)
+        for term in set(terms):
+            found = self.find(term)
+            if not found:
+                continue
+            start, count = found
+            docs, scores = self._docs[start:start + count], self._scores[start:start + count]
+            keep = None
+            if codes is not None:
+                keep = np.isin(self._fields[start:start + count], codes)
+            if allowed is not None:
+                keep = allowed[docs] if keep is None else keep & allowed[docs]
+            if keep is not None:
+                docs, scores = docs[keep], scores[keep]
+            if not len(docs):
+                continue
+            doc_parts.append(docs)
+            score_parts.append(scores)
+            match_count[np.unique(docs)] += 1
+
+        if not doc_parts:
+            return []
+        totals = np.bincount(np.concatenate(doc_parts), weights=np.concatenate(score_parts), minlength=self.doc_count)
+        hits = np.flatnonzero(match_count)
+        # Nomor dokumen sudah urut nama, jadi tie-break nama = nomor dokumen terkecil
+        ranked = hits[np.lexsort((hits, -totals[hits]))[:limit]]
+
+        results = []
+        for number in ranked.tolist():
+            row = self.document(number)
+            row['match_count'] = int(match_count[number])
+            row['final_score'] = float(totals[number])
+            results.append(row)
+        return results
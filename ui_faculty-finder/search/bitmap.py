@@ -0,0 +1,60 @@
+"""
+Bitmap dokumen untuk filter dan facet di index biner
+
+Bitmap di memori adalah int Python (bit i = dokumen nomor i), jadi operasi
+boolean filter cukup &, |, & ~ dan jumlah dokumen int.bit_count(), semuanya
+di C tanpa loop per dokumen.
+
+Di file, setiap bitmap disimpan dengan container yang lebih kecil (gaya
+roaring, tapi per bitmap bukan per chunk): array uint32 nomor dokumen yang
+urut untuk bitmap jarang, atau bitset padat (little-endian) untuk bitmap
+yang berisi lebih dari 1/32 dokumen.
+"""
+from typing import Tuple
+
+import numpy as np
+
+SPARSE = 0
+DENSE = 1
+
+# Di bawah batas ini bitmap jarang dibangun dengan shift langsung, di atasnya lewat packbits
+_SHIFT_LIMIT = 64
+
+
+def encode_bitmap(doc_numbers: np.ndarray, doc_count: int) -> Tuple[int, bytes]:
+    """(encoding, bytes) untuk nomor dokumen unik yang sudah urut"""
+    dense_size = (doc_count + 7) // 8
+    if 4 * len(doc_numbers) <= dense_size:
+        return SPARSE, np.asarray(doc_numbers, dtype='<u4').tobytes()
+    return DENSE, to_bytes(doc_numbers, doc_count)
+
+
+def to_bytes(doc_numbers: np.ndarray, doc_count: int) -> bytes:
+    """Bitset padat little-endian (byte 0 bit 0 = dokumen 0)"""
+    bits = np.zeros(doc_count, dtype=bool)
+    bits[doc_numbers] = True
+    return np.packbits(bits, bitorder='little').tobytes()
+
+
+def decode_bitmap(encoding: int, buffer, doc_count: int) -> int:
+    """Bitmap int dari container di file (buffer boleh memoryview/slice mmap)"""
+    if encoding == DENSE:
+        return int.from_bytes(buffer, 'little')
+    doc_numbers = np.frombuffer(buffer, dtype='<u4')
+    if len(doc_numbers) < _SHIFT_LIMIT:
+        bitmap = 0
+        for number in doc_numbers.tolist():
+            bitmap |= 1 << number
+        return bitmap
+    return int.from_bytes(to_bytes(doc_numbers, doc_count), 'little')
+
+
+def to_mask(bitmap: int, doc_count: int) -> np.ndarray:
+    """Bitmap int -> array bool per nomor dokumen (untuk menyaring postings)"""
+    packed = np.frombuffer(bitmap.to_bytes((doc_count + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(packed, count=doc_count, bitorder='little').view(bool)
+
+
+def members(bitmap: int, doc_count: int) -> np.ndarray:
+    """Nomor dokumen di bitmap, urut naik"""
+    return np.flatnonzero(to_mask(bitmap, doc_count))
@@ -2,40 +2,134 @@ import sqlite3
 import re
 import logging
 import time
-from typing import Dict, List, Set, Optional
-from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Set, Optional, Tuple
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from operator import itemgetter
 import math
 import threading
+import json
 from contextlib import contextmanager
 
+import numpy as np
+
+from database.cache import bump_data_version, create_data_version_table
+from database.models import content_hash
+from database.writer import get_writer
+
+from .analysis import ANALYZER_VERSION, INDEX_STOPWORDS, normalize_text, term_variants, tokenize
+from .binary_index import read_meta, write_binary_index
+from .stemmer import stem
+from .trigram import trigrams
+from .weighting import PostingsMatrix, TermWeighting
+
+# Indexer milik worker process rebuild paralel (diisi _init_worker)
+_worker_indexer = None
+
+
+def _init_worker(indexer: 'SearchIndexer'):
+    global _worker_indexer
+    _worker_indexer = indexer
+
+
+def _analyze_in_worker(batch: List[Tuple[int, Dict]]) -> Tuple[List[Tuple], Dict]:
+    return _worker_indexer.analyze_faculty_batch(batch)
+
+
 class SearchIndexer:
     """Indexer untuk membuat dan memelihara search index fakultas dengan handling database lock"""
     
-    def __init__(self, db_path: str):
+    # Field inverted index dan boost default-nya (diganti Config.SEARCH_FIELD_BOOSTS);
+    # boost disimpan sebagai weight index_fields dan sudah dikalikan ke skor postings
+    FIELD_BOOSTS = {
+        'name': 5.0,
+        'description': 2.0,
+        'program': 3.0,
+        'department': 2.5,
+        'contact': 1.0,
+        'type': 2.0
+    }
+    
+    # Kolom tabel FTS5 faculty_fts -> field (bobot bm25() per kolom = boost field-nya)
+    FTS_COLUMNS = {
+        'name': 'name',
+        'description': 'description',
+        'programs': 'program',
+        'departments': 'department',
+        'address': 'contact'
+    }
+    
+    # Parameter BM25
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    
+    # Tabel yang dibangun ulang di shadow table lalu di-swap (versi lama disimpan untuk rollback)
+    INDEX_TABLES = ('index_fields', 'index_keywords', 'index_entries', 'index_terms', 'index_postings',
+                    'index_documents', 'index_stats', 'index_trigrams', 'index_stems', 'index_checksums',
+                    'faculty_fts')
+    SHADOW_SUFFIX = '_shadow'
+    PREVIOUS_SUFFIX = '_previous'
+    
+    # (nama, tabel, kolom) secondary index tabel index
+    SECONDARY_INDEXES = [
+        ('idx_fields_faculty', 'index_fields', 'faculty_id'),
+        ('idx_entries_field', 'index_entries', 'field_id'),
+        ('idx_entries_keyword', 'index_entries', 'keyword_id'),
+        ('idx_postings_faculty', 'index_postings', 'faculty_id'),
+        ('idx_stats_value', 'index_stats', 'kind, value'),
+        ('idx_trigrams_term', 'index_trigrams', 'term_id'),
+    ]
+    
+    # Naikkan jika struktur tabel index berubah: index dengan format lain dibangun ulang
+    INDEX_FORMAT = 8
+    
+    # Urutan field = urutan teks, supaya sort per kode field sama dengan urutan primary key postings
+    FIELDS = sorted(FIELD_BOOSTS)
+    
+    def __init__(self, db_path: str, weighting: str = 'bm25', binary_index_path: Optional[str] = None,
+                 field_boosts: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            db_path: path database SQLite
+            weighting: skema bobot postings, 'bm25' atau 'tfidf' (lihat TermWeighting)
+            binary_index_path: jika diisi, snapshot index ditulis ulang ke file biner
+                read-only ini setiap kali index berubah (lihat export_binary_index)
+            field_boosts: boost per field (Config.SEARCH_FIELD_BOOSTS), menimpa FIELD_BOOSTS;
+                index dengan boost lain diskala ulang oleh ensure_index (reweight_index)
+        """
+        unknown = set(field_boosts or {}) - set(self.FIELD_BOOSTS)
+        if unknown:
+            raise ValueError(f"Unknown index fields in field_boosts: {sorted(unknown)} (expected {self.FIELDS})")
+        if any(boost <= 0 for boost in (field_boosts or {}).values()):
+            raise ValueError(f"Field boosts must be positive: {field_boosts}")
         self.db_path = db_path
+        self.binary_index_path = binary_index_path
         self.logger = logging.getLogger(__name__)
         self._lock = threading.RLock()  # Reentrant lock untuk thread safety
+        self.weighting = TermWeighting(weighting, k1=self.BM25_K1, b=self.BM25_B)
+        self.field_boosts = dict(self.FIELD_BOOSTS, **(field_boosts or {}))
+        self.boost_by_field = np.array([self.field_boosts[field] for field in self.FIELDS])
         
         # Indonesian stopwords - diperluas
-        self.stopwords = {
-            'dan', 'atau', 'yang', 'dari', 'di', 'ke', 'pada', 'untuk', 'dengan', 
-            'adalah', 'ini', 'itu', 'akan', 'dapat', 'telah', 'sudah', 'oleh',
-            'dalam', 'sebagai', 'menjadi', 'karena', 'jika', 'saat', 'ketika',
-            'dimana', 'bagian', 'bagaimana', 'mengapa', 'siapa', 'kapan',
-            'sebuah', 'suatu', 'satu', 'dua', 'tiga', 'empat', 'lima',
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 
-            'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-            'ada', 'tidak', 'bisa', 'hanya', 'juga', 'lebih', 'sama', 'lain'
-        }
+        self.stopwords = set(INDEX_STOPWORDS)
         
-        # Setup database connection parameters
+        # Setup database connection parameters (koneksi baca; semua penulisan lewat WriteQueue)
         self.db_timeout = 30.0  # 30 seconds timeout
-        self.max_retries = 3
         
         # Initialize database structure
         self._initialize_database()
     
+    def __getstate__(self):
+        # Lock tidak bisa di-pickle (indexer dikirim ke worker process saat rebuild paralel)
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
     @contextmanager
     def get_db_connection(self, timeout=None):
         """Context manager untuk database connection dengan proper handling"""
@@ -71,79 +165,196 @@ class SearchIndexer:
     def _initialize_database(self):
         """Initialize database structure jika belum ada"""
         try:
-            with self.get_db_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Create search_index table if not exists
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS search_index (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        faculty_id INTEGER NOT NULL,
-                        content_type TEXT NOT NULL,
-                        content TEXT,
-                        keywords TEXT,
-                        weight REAL DEFAULT 1.0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (faculty_id) REFERENCES faculties(id)
-                    )
-                ''')
-                
-                # Create indexes for better performance
-                indexes = [
-                    'CREATE INDEX IF NOT EXISTS idx_search_faculty_id ON search_index(faculty_id)',
-                    'CREATE INDEX IF NOT EXISTS idx_search_keywords ON search_index(keywords)',
-                    'CREATE INDEX IF NOT EXISTS idx_search_content_type ON search_index(content_type)',
-                    'CREATE INDEX IF NOT EXISTS idx_search_weight ON search_index(weight)',
-                    'CREATE INDEX IF NOT EXISTS idx_search_composite ON search_index(faculty_id, content_type, keywords)'
-                ]
-                
-                for index_sql in indexes:
-                    cursor.execute(index_sql)
-                
-                self.logger.info("Database structure initialized successfully")
-                
+            self._write(self._create_schema)
+            self.logger.info("Database structure initialized successfully")
+            
         except sqlite3.Error as e:
             self.logger.error(f"Error initializing database: {e}")
     
+    def _write(self, func, *args):
+        """Jalankan func(conn, *args) di WriteQueue database ini (satu-satunya writer) dan tunggu commit-nya"""
+        return get_writer(self.db_path).execute(func, *args)
+    
+    def _create_schema(self, conn):
+        """Tabel meta, index dan antrian index (operasi WriteQueue)"""
+        cursor = conn.cursor()
+        
+        # Versi analyzer, skema bobot dan generasi index yang sedang dipakai
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        
+        self._create_index_tables(cursor)
+        
+        # search_index lama (tabel dari DatabaseManager, content diduplikasi per keyword)
+        # diganti view di atas tabel ternormalisasi; isinya dibangun ulang oleh
+        # ensure_index karena INDEX_FORMAT berubah
+        for table in ('search_index', f'search_index{self.SHADOW_SUFFIX}', f'search_index{self.PREVIOUS_SUFFIX}'):
+            cursor.execute("SELECT type FROM sqlite_master WHERE name = ?", (table,))
+            row = cursor.fetchone()
+            if row and row[0] == 'table':
+                cursor.execute(f'DROP TABLE {table}')
+        self._create_search_index_view(cursor)
+        
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(index_documents)')}
+        if 'norm' not in columns:
+            cursor.execute('ALTER TABLE index_documents ADD COLUMN norm REAL NOT NULL DEFAULT 0')
+        
+        # Create indexes for better performance
+        self._create_secondary_indexes(cursor, self._index_generation(cursor))
+        
+        # Diisi trigger DatabaseManager saat data fakultas berubah
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS index_queue (
+                faculty_id INTEGER PRIMARY KEY,
+                queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Dinaikkan setiap index berubah (invalidasi QueryCache)
+        create_data_version_table(cursor)
+    
+    def _create_index_tables(self, cursor, suffix: str = ''):
+        """Buat tabel index (live, atau shadow/previous dengan suffix nama tabel)"""
+        # Index keyword ternormalisasi: teks field disimpan sekali di index_fields,
+        # keyword di-intern di index_keywords, index_entries hanya pasangan integer
+        # (dibaca lewat view search_index dengan kolom yang sama seperti dulu)
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_fields{suffix} (
+                id INTEGER PRIMARY KEY,
+                faculty_id INTEGER NOT NULL,
+                content_type TEXT NOT NULL,
+                content TEXT,
+                weight REAL NOT NULL DEFAULT 1.0
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_keywords{suffix} (
+                id INTEGER PRIMARY KEY,
+                keyword TEXT UNIQUE NOT NULL
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_entries{suffix} (
+                id INTEGER PRIMARY KEY,
+                field_id INTEGER NOT NULL,
+                keyword_id INTEGER NOT NULL
+            )
+        ''')
+        
+        # Inverted index: term dictionary, postings, dan panjang field per dokumen
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_terms{suffix} (
+                id INTEGER PRIMARY KEY,
+                term TEXT UNIQUE NOT NULL,
+                df INTEGER NOT NULL DEFAULT 0,
+                idf REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_postings{suffix} (
+                term_id INTEGER NOT NULL,
+                faculty_id INTEGER NOT NULL,
+                field TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                positions TEXT,
+                score REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (term_id, faculty_id, field)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_documents{suffix} (
+                faculty_id INTEGER NOT NULL,
+                field TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                norm REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (faculty_id, field)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Statistik index yang dijaga indexer saat menulis: ('total', entries/postings/documents/
+        # terms/faculties), ('content_type', tipe), ('keyword', keyword), ('faculty', faculty_id)
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_stats{suffix} (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                weight REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Trigram karakter term dictionary untuk pencarian kata parsial/typo (lihat trigram.py)
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_trigrams{suffix} (
+                trigram TEXT NOT NULL,
+                term_id INTEGER NOT NULL,
+                PRIMARY KEY (trigram, term_id)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Kamus kata -> kata dasar (stemmer.py) untuk term yang punya imbuhan, dipakai query
+        # supaya tidak perlu stemming ulang
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_stems{suffix} (
+                word TEXT PRIMARY KEY,
+                stem TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        
+        # Hash isi fakultas saat di-index (database.models.content_hash); dibandingkan dengan
+        # faculties.content_hash oleh find_stale_faculties untuk repair per fakultas
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS index_checksums{suffix} (
+                faculty_id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL
+            )
+        ''')
+        
+        # Backend FTS5 (FacultySearchEngine backend='fts5'): satu baris per fakultas,
+        # rowid = faculty_id, teks sudah dinormalisasi seperti index di atas
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS faculty_fts{suffix} USING fts5(
+                {", ".join(self.FTS_COLUMNS)},
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+        ''')
+    
+    def _create_search_index_view(self, cursor):
+        """View search_index (satu baris per keyword per field) di atas tabel index live"""
+        cursor.execute('''
+            CREATE VIEW IF NOT EXISTS search_index AS
+            SELECT e.id, f.faculty_id, f.content_type, f.content, k.keyword AS keywords, f.weight
+            FROM index_entries e
+            JOIN index_fields f ON f.id = e.field_id
+            JOIN index_keywords k ON k.id = e.keyword_id
+        ''')
+    
+    def _create_secondary_indexes(self, cursor, generation: int, suffix: str = ''):
+        """
+        Secondary index tabel index. Nama index diberi nomor generasi karena
+        nama index tidak ikut berubah saat tabel di-rename waktu swap.
+        """
+        for name, table, columns in self.SECONDARY_INDEXES:
+            index_name = f'{name}_g{generation}' if generation else name
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table}{suffix}({columns})')
+    
+    def _index_generation(self, cursor) -> int:
+        cursor.execute("SELECT value FROM index_meta WHERE key = 'generation'")
+        row = cursor.fetchone()
+        return int(row[0]) if row else 0
+    
     def extract_keywords(self, text: str) -> List[str]:
         """Extract dan bersihkan keywords dari teks dengan normalisasi yang lebih baik"""
         if not text:
             return []
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Replace common abbreviations and normalize
-        text = re.sub(r'\bft\b', 'fakultas teknik', text)
-        text = re.sub(r'\bfk\b', 'fakultas kedokteran', text)
-        text = re.sub(r'\bfeb\b', 'fakultas ekonomi bisnis', text)
-        text = re.sub(r'\bfh\b', 'fakultas hukum', text)
-        text = re.sub(r'\bfisip\b', 'fakultas ilmu sosial politik', text)
-        text = re.sub(r'\bfib\b', 'fakultas ilmu budaya', text)
-        text = re.sub(r'\bfpsi\b', 'fakultas psikologi', text)
-        text = re.sub(r'\bfkg\b', 'fakultas kedokteran gigi', text)
-        text = re.sub(r'\bfkm\b', 'fakultas kesehatan masyarakat', text)
-        text = re.sub(r'\bfik\b', 'fakultas ilmu keperawatan', text)
-        text = re.sub(r'\bmipa\b', 'matematika ilmu pengetahuan alam', text)
-        
-        # Remove special characters but keep spaces and alphanumeric
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # Multiple spaces to single space
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Split into words
-        words = text.split()
-        
-        # Filter and clean words
-        keywords = []
-        for word in words:
-            word = word.strip()
-            if (len(word) >= 2 and  # Allow 2-letter words for flexibility
-                word not in self.stopwords and 
-                not word.isdigit() and
-                re.match(r'^[a-zA-Z0-9]+$', word)):  # Allow alphanumeric
-                keywords.append(word)
+        # Normalisasi (lowercase, singkatan, karakter khusus) dan filter kata
+        keywords = tokenize(text, self.stopwords)
         
         # Add n-grams for better matching
         bigrams = []
@@ -151,8 +362,12 @@ class SearchIndexer:
             bigram = f"{keywords[i]} {keywords[i+1]}"
             bigrams.append(bigram)
         
-        # Combine unigrams and bigrams
-        all_keywords = keywords + bigrams
+        # Term kanonik sinonim (mis. "medical" -> "kedokteran") dan kata dasar (mis. "pendidikan" -> "didik"),
+        # supaya query tidak perlu OR per sinonim atau wildcard per imbuhan
+        variants = [term for keyword in keywords for term in term_variants(keyword)]
+        
+        # Combine unigrams, bigrams, canonical terms and stems
+        all_keywords = keywords + bigrams + variants
         
         # Remove duplicates while preserving order
         seen = set()
@@ -165,7 +380,12 @@ class SearchIndexer:
         return result
     
     def calculate_tf_idf(self, term: str, document_keywords: List[str], all_documents: List[List[str]]) -> float:
-        """Hitung TF-IDF score untuk term dalam dokumen"""
+        """
+        Hitung TF-IDF score untuk satu term dalam satu dokumen.
+
+        Hanya untuk perhitungan ad-hoc; index memakai TermWeighting yang
+        menghitung bobot seluruh postings sekaligus.
+        """
         if not document_keywords or not all_documents or not term:
             return 0.0
         
@@ -187,193 +407,1127 @@ class SearchIndexer:
             self.logger.warning(f"Error calculating TF-IDF for term '{term}': {e}")
             return 0.0
     
-    def create_search_index(self, faculty_id: int, faculty_data: Dict) -> bool:
-        """Buat search index untuk satu fakultas dengan retry mechanism"""
-        for attempt in range(self.max_retries):
-            try:
-                with self.get_db_connection() as conn:
-                    cursor = conn.cursor()
-                    
-                    # Begin transaction
-                    cursor.execute('BEGIN IMMEDIATE')
-                    
-                    try:
-                        # Hapus index lama untuk fakultas ini
-                        cursor.execute('DELETE FROM search_index WHERE faculty_id = ?', (faculty_id,))
-                        
-                        # Extract keywords dari berbagai field
-                        index_entries = []
-                        
-                        # Index nama fakultas (weight tinggi)
-                        if faculty_data.get('name'):
-                            keywords = self.extract_keywords(faculty_data['name'])
-                            for keyword in keywords:
-                                index_entries.append({
-                                    'faculty_id': faculty_id,
-                                    'content_type': 'name',
-                                    'content': faculty_data['name'],
-                                    'keyword': keyword,
-                                    'weight': 5.0  # Increased weight untuk nama
-                                })
-                        
-                        # Index deskripsi (weight medium)
-                        if faculty_data.get('description'):
-                            keywords = self.extract_keywords(faculty_data['description'])
-                            content_preview = faculty_data['description'][:200] + '...' if len(faculty_data['description']) > 200 else faculty_data['description']
-                            for keyword in keywords:
-                                index_entries.append({
-                                    'faculty_id': faculty_id,
-                                    'content_type': 'description',
-                                    'content': content_preview,
-                                    'keyword': keyword,
-                                    'weight': 2.0
-                                })
-                        
-                        # Index programs (weight medium-high)
-                        for program in faculty_data.get('programs', []):
-                            if program:  # Check if program is not empty
-                                keywords = self.extract_keywords(program)
-                                for keyword in keywords:
-                                    index_entries.append({
-                                        'faculty_id': faculty_id,
-                                        'content_type': 'program',
-                                        'content': program,
-                                        'keyword': keyword,
-                                        'weight': 3.0  # Increased weight untuk program
-                                    })
-                        
-                        # Index departments (weight medium)
-                        for department in faculty_data.get('departments', []):
-                            if department:  # Check if department is not empty
-                                keywords = self.extract_keywords(department)
-                                for keyword in keywords:
-                                    index_entries.append({
-                                        'faculty_id': faculty_id,
-                                        'content_type': 'department',
-                                        'content': department,
-                                        'keyword': keyword,
-                                        'weight': 2.5
-                                    })
-                        
-                        # Index contact info (weight low)
-                        contact = faculty_data.get('contact', {})
-                        if isinstance(contact, dict) and contact.get('address'):
-                            keywords = self.extract_keywords(contact['address'])
-                            for keyword in keywords:
-                                index_entries.append({
-                                    'faculty_id': faculty_id,
-                                    'content_type': 'contact',
-                                    'content': contact['address'],
-                                    'keyword': keyword,
-                                    'weight': 1.0
-                                })
-                        
-                        # Index faculty_type
-                        if faculty_data.get('faculty_type'):
-                            keywords = self.extract_keywords(faculty_data['faculty_type'])
-                            for keyword in keywords:
-                                index_entries.append({
-                                    'faculty_id': faculty_id,
-                                    'content_type': 'type',
-                                    'content': faculty_data['faculty_type'],
-                                    'keyword': keyword,  
-                                    'weight': 2.0
-                                })
-                        
-                        # Batch insert untuk performance
-                        if index_entries:
-                            cursor.executemany('''
-                                INSERT INTO search_index (faculty_id, content_type, content, keywords, weight)
-                                VALUES (?, ?, ?, ?, ?)
-                            ''', [
-                                (entry['faculty_id'], entry['content_type'], entry['content'], 
-                                 entry['keyword'], entry.get('weight', 1.0))
-                                for entry in index_entries
-                            ])
-                        
-                        # Commit transaction
-                        cursor.execute('COMMIT')
-                        
-                        self.logger.info(f"Search index created for faculty {faculty_id}: {len(index_entries)} entries")
-                        return True
-                        
-                    except Exception as e:
-                        cursor.execute('ROLLBACK')
-                        raise e
-                        
-            except sqlite3.OperationalError as e:
-                if "locked" in str(e).lower() and attempt < self.max_retries - 1:
-                    self.logger.warning(f"Database locked, retrying... (attempt {attempt + 1})")
-                    time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                    continue
-                else:
-                    self.logger.error(f"Error creating search index for faculty {faculty_id}: {e}")
-                    return False
-            except Exception as e:
-                self.logger.error(f"Error creating search index for faculty {faculty_id}: {e}")
-                return False
+    def _field_texts(self, faculty_data: Dict) -> Dict[str, List[str]]:
+        """Teks per field dokumen fakultas untuk inverted index"""
+        contact = faculty_data.get('contact') or {}
+        return {
+            'name': [faculty_data.get('name') or ''],
+            'description': [faculty_data.get('description') or ''],
+            'program': [program for program in faculty_data.get('programs', []) if program],
+            'department': [department for department in faculty_data.get('departments', []) if department],
+            'contact': [contact.get('address') or ''] if isinstance(contact, dict) else [],
+            'type': [faculty_data.get('faculty_type') or '']
+        }
+    
+    def analyze_document(self, faculty_data: Dict) -> Tuple[Dict[str, int], Dict[Tuple[str, str], List[int]]]:
+        """
+        Tokenisasi semua field satu fakultas.
         
-        return False
+        Returns:
+            (panjang token per field, posisi token per (term, field))
+        """
+        lengths = {}
+        positions = defaultdict(list)
+        
+        for field, texts in self._field_texts(faculty_data).items():
+            position = 0
+            token_count = 0
+            for text in texts:
+                for token in tokenize(text, self.stopwords):
+                    positions[(token, field)].append(position)
+                    for variant in term_variants(token):
+                        # Term kanonik/stem di posisi yang sama, tidak menambah panjang field
+                        positions[(variant, field)].append(position)
+                    position += 1
+                    token_count += 1
+                position += 1  # Jeda antar nilai (mis. antar program) agar frasa tidak menyambung
+            if token_count:
+                lengths[field] = token_count
+        
+        return lengths, dict(positions)
+    
+    def _lookup_term_ids(self, cursor, terms: Iterable[str]) -> Dict[str, int]:
+        """term -> term_id dari term dictionary"""
+        return self._lookup_ids(cursor, 'index_terms', 'term', terms)
+    
+    def _lookup_ids(self, cursor, table: str, column: str, values: Iterable[str]) -> Dict[str, int]:
+        """nilai -> id dari tabel dictionary (index_terms, index_keywords)"""
+        values = list(values)
+        ids = {}
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            cursor.execute(f'SELECT {column}, id FROM {table} WHERE {column} IN ({",".join("?" * len(chunk))})', chunk)
+            ids.update(cursor.fetchall())
+        return ids
+    
+    def _write_postings(self, cursor, faculty_id: int, faculty_data: Dict, stats: Dict) -> Set[int]:
+        """
+        Tulis ulang postings + panjang dokumen satu fakultas, return term_id yang terpengaruh.
+        
+        Perubahan jumlah postings/dokumen/term dicatat di stats (lihat _write_stats).
+        """
+        cursor.execute('SELECT DISTINCT term_id FROM index_postings WHERE faculty_id = ?', (faculty_id,))
+        affected_terms = {row[0] for row in cursor.fetchall()}
+        
+        cursor.execute('DELETE FROM index_postings WHERE faculty_id = ?', (faculty_id,))
+        self._count(stats, 'total', 'postings', -cursor.rowcount)
+        cursor.execute('DELETE FROM index_documents WHERE faculty_id = ?', (faculty_id,))
+        self._count(stats, 'total', 'documents', -1 if cursor.rowcount else 0)
+        
+        lengths, postings = self.analyze_document(faculty_data)
+        if not postings:
+            return affected_terms
+        
+        terms = sorted({term for term, _ in postings})
+        term_ids = self._lookup_term_ids(cursor, terms)
+        new_terms = [term for term in terms if term not in term_ids]
+        if new_terms:
+            cursor.executemany('INSERT INTO index_terms (term) VALUES (?)', [(term,) for term in new_terms])
+            self._count(stats, 'total', 'terms', len(new_terms))
+            new_term_ids = self._lookup_term_ids(cursor, new_terms)
+            self._write_trigrams(cursor, new_term_ids.items())
+            self._write_stems(cursor, new_terms)
+            term_ids.update(new_term_ids)
+        self._count(stats, 'total', 'postings', len(postings))
+        self._count(stats, 'total', 'documents', 1)
+        
+        cursor.executemany('INSERT INTO index_documents (faculty_id, field, length) VALUES (?, ?, ?)',
+                           [(faculty_id, field, length) for field, length in lengths.items()])
+        cursor.executemany('''
+            INSERT INTO index_postings (term_id, faculty_id, field, tf, positions)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (term_ids[term], faculty_id, field, len(term_positions), ','.join(map(str, term_positions)))
+            for (term, field), term_positions in postings.items()
+        ])
+        
+        return affected_terms | set(term_ids.values())
+    
+    def _write_trigrams(self, cursor, terms: Iterable[Tuple[str, int]], suffix: str = ''):
+        """Tulis trigram term baru (term, term_id) ke index_trigrams"""
+        cursor.executemany(f'INSERT INTO index_trigrams{suffix} (trigram, term_id) VALUES (?, ?)', [
+            (trigram, term_id) for term, term_id in terms for trigram in trigrams(term)
+        ])
+    
+    def _write_stems(self, cursor, terms: Iterable[str], suffix: str = ''):
+        """Tulis kata dasar term baru yang berimbuhan ke index_stems"""
+        cursor.executemany(f'INSERT OR IGNORE INTO index_stems{suffix} (word, stem) VALUES (?, ?)', [
+            (term, term_stem) for term, term_stem in ((term, stem(term)) for term in terms) if term_stem != term
+        ])
+    
+    @staticmethod
+    def _count(stats: Dict, kind: str, key: str, value: int, weight: float = 0.0):
+        counter = stats.setdefault((kind, key), [0, 0.0])
+        counter[0] += value
+        counter[1] += weight
+    
+    def _count_entries(self, stats: Dict, entries: Iterable[Tuple], sign: int = 1):
+        """Catat baris search_index (faculty_id, content_type, content, keyword, weight) di stats"""
+        for faculty_id, content_type, _, keyword, weight in entries:
+            weight = sign * (weight or 0.0)
+            self._count(stats, 'total', 'entries', sign)
+            self._count(stats, 'content_type', content_type, sign, weight)
+            self._count(stats, 'keyword', keyword or '', sign, weight)
+            self._count(stats, 'faculty', str(faculty_id), sign)
+    
+    def _write_stats(self, cursor, stats: Dict, suffix: str = ''):
+        """Terapkan delta counter ke index_stats; counter yang jadi 0 dihapus (kecuali total)"""
+        cursor.executemany(f'''
+            INSERT INTO index_stats{suffix} (kind, key, value, weight) VALUES (?, ?, ?, ?)
+            ON CONFLICT (kind, key) DO UPDATE SET value = value + excluded.value, weight = weight + excluded.weight
+        ''', [(kind, key, value, weight) for (kind, key), (value, weight) in stats.items() if value or weight])
+        cursor.executemany(f"DELETE FROM index_stats{suffix} WHERE kind = ? AND key = ? AND value <= 0 AND kind != 'total'",
+                           [(kind, key) for (kind, key), (value, _) in stats.items() if value < 0])
+    
+    def _read_stat(self, cursor, kind: str, key: str, suffix: str = '') -> int:
+        cursor.execute(f'SELECT value FROM index_stats{suffix} WHERE kind = ? AND key = ?', (kind, key))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
+    @staticmethod
+    def _field_entries(faculty_id: int, fields: Iterable[Tuple]) -> Iterator[Tuple]:
+        """Baris search_index (faculty_id, content_type, content, keyword, weight) dari field index"""
+        for content_type, content, weight, keywords in fields:
+            for keyword in keywords:
+                yield faculty_id, content_type, content, keyword, weight
+    
+    def _replace_fields(self, cursor, faculty_id: int, fields: List[Tuple], stats: Dict):
+        """Ganti field + keyword index satu fakultas dan catat perubahannya di stats"""
+        cursor.execute('''
+            SELECT faculty_id, content_type, content, keywords, weight FROM search_index WHERE faculty_id = ?
+        ''', (faculty_id,))
+        old_entries = cursor.fetchall()
+        self._count_entries(stats, old_entries, sign=-1)
+        entries = list(self._field_entries(faculty_id, fields))
+        self._count(stats, 'total', 'faculties', int(bool(entries)) - int(bool(old_entries)))
+        self._count_entries(stats, entries)
+        
+        cursor.execute('''
+            SELECT DISTINCT e.keyword_id FROM index_entries e
+            JOIN index_fields f ON f.id = e.field_id
+            WHERE f.faculty_id = ?
+        ''', (faculty_id,))
+        old_keyword_ids = {row[0] for row in cursor.fetchall()}
+        cursor.execute('''
+            DELETE FROM index_entries WHERE field_id IN (SELECT id FROM index_fields WHERE faculty_id = ?)
+        ''', (faculty_id,))
+        cursor.execute('DELETE FROM index_fields WHERE faculty_id = ?', (faculty_id,))
+        
+        keywords = sorted({keyword for *_, field_keywords in fields for keyword in field_keywords})
+        cursor.executemany('INSERT OR IGNORE INTO index_keywords (keyword) VALUES (?)', [(keyword,) for keyword in keywords])
+        keyword_ids = self._lookup_ids(cursor, 'index_keywords', 'keyword', keywords)
+        
+        # Teks tiap field disimpan sekali, keyword-nya hanya sebagai pasangan id
+        entry_rows = []
+        for content_type, content, weight, field_keywords in fields:
+            cursor.execute('''
+                INSERT INTO index_fields (faculty_id, content_type, content, weight) VALUES (?, ?, ?, ?)
+            ''', (faculty_id, content_type, content, weight))
+            field_id = cursor.lastrowid
+            entry_rows.extend((field_id, keyword_ids[keyword]) for keyword in field_keywords)
+        cursor.executemany('INSERT INTO index_entries (field_id, keyword_id) VALUES (?, ?)', entry_rows)
+        
+        # Keyword yang tidak dipakai fakultas mana pun lagi dikeluarkan dari dictionary
+        cursor.executemany('''
+            DELETE FROM index_keywords WHERE id = ? AND NOT EXISTS (SELECT 1 FROM index_entries WHERE keyword_id = ?)
+        ''', [(keyword_id, keyword_id) for keyword_id in old_keyword_ids - set(keyword_ids.values())])
+    
+    def fts_row(self, faculty_data: Dict) -> Optional[Tuple[str, ...]]:
+        """Isi kolom faculty_fts untuk satu fakultas (None jika fakultas tidak ada)"""
+        if not faculty_data:
+            return None
+        texts = self._field_texts(faculty_data)
+        return tuple('\n'.join(normalize_text(text) for text in texts[field] if text)
+                     for field in self.FTS_COLUMNS.values())
+    
+    def _write_fts(self, cursor, faculty_id: int, faculty_data: Dict):
+        """Tulis ulang baris faculty_fts satu fakultas (dihapus jika fakultas sudah tidak ada)"""
+        cursor.execute('DELETE FROM faculty_fts WHERE rowid = ?', (faculty_id,))
+        row = self.fts_row(faculty_data)
+        if row:
+            cursor.execute(f'''
+                INSERT INTO faculty_fts (rowid, {", ".join(self.FTS_COLUMNS)})
+                VALUES (?, {", ".join("?" * len(self.FTS_COLUMNS))})
+            ''', (faculty_id, *row))
+    
+    def _write_checksum(self, cursor, faculty_id: int, faculty_data: Dict):
+        """Catat hash isi yang baru di-index (dihapus jika fakultas sudah tidak ada)"""
+        if not faculty_data:
+            cursor.execute('DELETE FROM index_checksums WHERE faculty_id = ?', (faculty_id,))
+            return
+        document_hash = content_hash(faculty_data)
+        cursor.execute('INSERT OR REPLACE INTO index_checksums (faculty_id, content_hash) VALUES (?, ?)',
+                       (faculty_id, document_hash))
+        # Data yang baru di-index adalah isi sekarang, jadi hash sumber yang kosong
+        # (data ditulis di luar Faculty) ikut diisi
+        cursor.execute('UPDATE faculties SET content_hash = ? WHERE id = ? AND content_hash IS NOT ?',
+                       (document_hash, faculty_id, document_hash))
+    
+    def _scoring_state(self, cursor) -> Tuple[int, List[float]]:
+        """Jumlah dokumen dan rata-rata panjang field: dipakai idf dan normalisasi panjang semua postings"""
+        return self._read_stat(cursor, 'total', 'documents'), self._average_field_lengths(cursor).tolist()
+    
+    def _update_scores(self, cursor, term_ids: Optional[Set[int]] = None, faculty_ids: Optional[List[int]] = None,
+                       scoring_state: Optional[Tuple[int, List[float]]] = None):
+        """
+        Hitung ulang df/idf dan skor (BM25/TF-IDF) yang disimpan di postings.
+        
+        Tanpa argumen semua term dan postings dihitung ulang. Dengan term_ids dan
+        faculty_ids (fakultas yang di-index ulang) df/idf term itu dihitung ulang,
+        lalu semua postings fakultas itu dan fakultas lain yang memuat term itu
+        (idf-nya berubah; untuk TF-IDF juga norm dokumennya) diskor ulang.
+        
+        scoring_state: _scoring_state() sebelum perubahan. Jika jumlah dokumen atau
+        rata-rata panjang field berubah, skor semua postings ikut berubah, jadi
+        semuanya dihitung ulang; tanpa scoring_state juga dihitung ulang semua.
+        """
+        if term_ids is not None and (scoring_state is None or scoring_state != self._scoring_state(cursor)):
+            term_ids = faculty_ids = None
+        
+        if term_ids is None:
+            cursor.execute('SELECT term_id, COUNT(DISTINCT faculty_id) FROM index_postings GROUP BY term_id')
+            document_frequencies = dict(cursor.fetchall())
+            cursor.execute('SELECT id FROM index_terms')
+            term_ids = [row[0] for row in cursor.fetchall()]
+        else:
+            term_ids = list(term_ids)
+            document_frequencies = {}
+            for start in range(0, len(term_ids), 500):
+                chunk = term_ids[start:start + 500]
+                cursor.execute(f'''
+                    SELECT term_id, COUNT(DISTINCT faculty_id) FROM index_postings
+                    WHERE term_id IN ({",".join("?" * len(chunk))}) GROUP BY term_id
+                ''', chunk)
+                document_frequencies.update(cursor.fetchall())
+        
+        self._write_term_statistics(cursor, term_ids, document_frequencies)
+        if faculty_ids is not None:
+            affected_faculties = set(faculty_ids)
+            for start in range(0, len(term_ids), 500):
+                chunk = term_ids[start:start + 500]
+                cursor.execute(f'''
+                    SELECT DISTINCT faculty_id FROM index_postings WHERE term_id IN ({",".join("?" * len(chunk))})
+                ''', chunk)
+                affected_faculties.update(row[0] for row in cursor.fetchall())
+            faculty_ids = sorted(affected_faculties)
+        self._score_postings(cursor, faculty_ids)
+    
+    def _write_term_statistics(self, cursor, term_ids: Iterable[int], document_frequencies: Dict[int, int],
+                               suffix: str = '') -> np.ndarray:
+        """
+        Simpan df/idf per term; term yang tidak punya postings lagi dihapus dari dictionary.
+        
+        Returns idf diindeks term_id (0 untuk term di luar term_ids).
+        """
+        total_docs = self._read_stat(cursor, 'total', 'documents', suffix)
+        
+        term_ids = np.fromiter(term_ids, dtype=np.int64)
+        df = np.fromiter((document_frequencies.get(term_id, 0) for term_id in term_ids.tolist()),
+                         dtype=np.int64, count=len(term_ids))
+        idf = self.weighting.idf(df, total_docs)
+        
+        cursor.executemany(f'UPDATE index_terms{suffix} SET df = ?, idf = ? WHERE id = ?',
+                           zip(df.tolist(), idf.tolist(), term_ids.tolist()))
+        cursor.execute(f'''
+            DELETE FROM index_trigrams{suffix}
+            WHERE term_id IN (SELECT id FROM index_terms{suffix} WHERE df = 0)
+        ''')
+        cursor.execute(f'DELETE FROM index_stems{suffix} WHERE word IN (SELECT term FROM index_terms{suffix} WHERE df = 0)')
+        cursor.execute(f'DELETE FROM index_terms{suffix} WHERE df = 0')
+        if cursor.rowcount:
+            self._write_stats(cursor, {('total', 'terms'): [-cursor.rowcount, 0.0]}, suffix)
+        
+        idf_by_term = np.zeros(int(term_ids.max()) + 1 if len(term_ids) else 0)
+        idf_by_term[term_ids] = idf
+        return idf_by_term
+    
+    def _average_field_lengths(self, cursor, suffix: str = '') -> np.ndarray:
+        """Rata-rata panjang per field (diindeks posisi field di FIELDS)"""
+        avg_lengths = np.zeros(len(self.FIELDS))
+        cursor.execute(f'SELECT field, AVG(length) FROM index_documents{suffix} GROUP BY field')
+        for field, avg_length in cursor.fetchall():
+            if field in self.FIELD_BOOSTS:
+                avg_lengths[self.FIELDS.index(field)] = avg_length
+        return avg_lengths
+    
+    def _read_postings(self, cursor, faculty_ids: Optional[List[int]] = None) -> Tuple[np.ndarray, ...]:
+        """Postings (semua, atau fakultas tertentu) sebagai kolom array plus idf dan panjang field"""
+        query = '''
+            SELECT p.term_id, p.faculty_id, p.field, p.tf, d.length, t.idf
+            FROM index_postings p
+            JOIN index_terms t ON t.id = p.term_id
+            JOIN index_documents d ON d.faculty_id = p.faculty_id AND d.field = p.field
+        '''
+        if faculty_ids is None:
+            rows = cursor.execute(query).fetchall()
+        else:
+            rows = []
+            for start in range(0, len(faculty_ids), 500):
+                batch = list(faculty_ids[start:start + 500])
+                cursor.execute(query + f' WHERE p.faculty_id IN ({",".join("?" * len(batch))})', batch)
+                rows.extend(cursor.fetchall())
+        
+        field_codes = {field: code for code, field in enumerate(self.FIELDS)}
+        columns = list(zip(*rows)) or [()] * 6
+        return (
+            np.array(columns[0], dtype=np.int64),
+            np.array(columns[1], dtype=np.int64),
+            np.array([field_codes[field] for field in columns[2]], dtype=np.int64),
+            np.array(columns[3], dtype=np.int64),
+            np.array(columns[4], dtype=np.int64),
+            np.array(columns[5], dtype=np.float64)
+        )
+    
+    def _score_postings(self, cursor, faculty_ids: Optional[List[int]] = None,
+                        postings: Optional[Tuple[np.ndarray, ...]] = None, suffix: str = ''):
+        """
+        Hitung bobot postings (semua, atau fakultas tertentu) secara vectorized
+        lewat TermWeighting, lalu tulis skor dan L2 norm dokumen ke index.
+        
+        postings: kolom (term_id, faculty_id, field, tf, panjang, idf) yang
+        sudah ada di memori (rebuild); jika None dibaca dari database.
+        suffix: tulis ke tabel shadow (rebuild) alih-alih tabel live.
+        """
+        if postings is None:
+            postings = self._read_postings(cursor, faculty_ids)
+        term_ids, posting_faculties, field_ids, tfs, lengths, idf = postings
+        
+        scores, documents, norms = self.weighting.score(
+            posting_faculties, field_ids, tfs, lengths, idf, self._average_field_lengths(cursor, suffix), self.boost_by_field
+        )
+        
+        # Urutan primary key: update B-tree WITHOUT ROWID berjalan berurutan
+        order = np.lexsort((field_ids, posting_faculties, term_ids))
+        cursor.executemany(f'UPDATE index_postings{suffix} SET score = ? WHERE term_id = ? AND faculty_id = ? AND field = ?', zip(
+            scores[order].tolist(), term_ids[order].tolist(), posting_faculties[order].tolist(),
+            (self.FIELDS[code] for code in field_ids[order].tolist())
+        ))
+        cursor.executemany(f'UPDATE index_documents{suffix} SET norm = ? WHERE faculty_id = ? AND field = ?', zip(
+            norms.tolist(), documents[0].tolist(), (self.FIELDS[code] for code in documents[1].tolist())
+        ))
+    
+    def refresh_scores(self) -> bool:
+        """Hitung ulang semua df/idf dan skor postings dalam satu transaksi"""
+        def refresh(conn):
+            self._update_scores(conn.cursor())
+            conn.execute("DELETE FROM index_meta WHERE key = 'scores_stale'")
+            bump_data_version(conn)
+        
+        try:
+            self._write(refresh)
+        except Exception as e:
+            self.logger.error(f"Error refreshing BM25 scores: {e}")
+            return False
+        
+        self.export_binary_index()
+        return True
+    
+    def build_index_fields(self, faculty_data: Dict) -> List[Tuple[str, str, float, List[str]]]:
+        """Field index satu fakultas: (content_type, content, weight, keywords) per nilai field"""
+        index_fields = []
+        
+        # weight tiap field = boost-nya (field_boosts)
+        boosts = self.field_boosts
+        
+        # Index nama fakultas
+        if faculty_data.get('name'):
+            keywords = self.extract_keywords(faculty_data['name'])
+            if keywords:
+                index_fields.append(('name', faculty_data['name'], boosts['name'], keywords))
+        
+        # Index deskripsi
+        if faculty_data.get('description'):
+            keywords = self.extract_keywords(faculty_data['description'])
+            content_preview = faculty_data['description'][:200] + '...' if len(faculty_data['description']) > 200 else faculty_data['description']
+            if keywords:
+                index_fields.append(('description', content_preview, boosts['description'], keywords))
+        
+        # Index programs
+        for program in faculty_data.get('programs', []):
+            if program:  # Check if program is not empty
+                keywords = self.extract_keywords(program)
+                if keywords:
+                    index_fields.append(('program', program, boosts['program'], keywords))
+        
+        # Index departments
+        for department in faculty_data.get('departments', []):
+            if department:  # Check if department is not empty
+                keywords = self.extract_keywords(department)
+                if keywords:
+                    index_fields.append(('department', department, boosts['department'], keywords))
+        
+        # Index contact info
+        contact = faculty_data.get('contact', {})
+        if isinstance(contact, dict) and contact.get('address'):
+            keywords = self.extract_keywords(contact['address'])
+            if keywords:
+                index_fields.append(('contact', contact['address'], boosts['contact'], keywords))
+        
+        # Index faculty_type
+        if faculty_data.get('faculty_type'):
+            keywords = self.extract_keywords(faculty_data['faculty_type'])
+            if keywords:
+                index_fields.append(('type', faculty_data['faculty_type'], boosts['type'], keywords))
+        
+        return index_fields
+    
+    def build_index_entries(self, faculty_id: int, faculty_data: Dict) -> List[Dict]:
+        """Entry search_index (satu per keyword per field) untuk satu fakultas"""
+        return [
+            {'faculty_id': faculty_id, 'content_type': content_type, 'content': content, 'keyword': keyword, 'weight': weight}
+            for _, content_type, content, keyword, weight
+            in self._field_entries(faculty_id, self.build_index_fields(faculty_data))
+        ]
+    
+    def create_search_index(self, faculty_id: int, faculty_data: Dict, update_scores: bool = True) -> bool:
+        """
+        Buat search index untuk satu fakultas dalam satu operasi WriteQueue
+        (writer tunggal, jadi tidak ada retry karena database locked)
+        
+        update_scores=False melewati perhitungan skor (dipakai rebuild, yang
+        menghitung semua skor sekali di akhir lewat refresh_scores()).
+        """
+        index_fields = self.build_index_fields(faculty_data)
+        
+        def write(conn):
+            cursor = conn.cursor()
+            stats = {}
+            scoring_state = self._scoring_state(cursor) if update_scores else None
+            
+            # Ganti index lama fakultas ini (batch insert untuk performance)
+            self._replace_fields(cursor, faculty_id, index_fields, stats)
+            
+            # Inverted index (term dictionary + postings) dan baris FTS5
+            affected_terms = self._write_postings(cursor, faculty_id, faculty_data, stats)
+            self._write_fts(cursor, faculty_id, faculty_data)
+            self._write_checksum(cursor, faculty_id, faculty_data)
+            self._write_stats(cursor, stats)
+            if update_scores:
+                self._update_scores(cursor, term_ids=affected_terms, faculty_ids=[faculty_id],
+                                    scoring_state=scoring_state)
+            bump_data_version(conn)
+        
+        try:
+            self._write(write)
+        except Exception as e:
+            self.logger.error(f"Error creating search index for faculty {faculty_id}: {e}")
+            return False
+        
+        if update_scores:
+            self.export_binary_index()
+        self.logger.info(f"Search index created for faculty {faculty_id}: {sum(len(keywords) for *_, keywords in index_fields)} entries")
+        return True
+    
+    def iter_faculty_documents(self, conn, faculty_ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Dict]]:
+        """
+        Stream fakultas lengkap dengan programs, departments dan contact.
+        
+        Empat query set-based yang diurutkan per faculty_id lalu di-merge,
+        bukan empat query (dan satu koneksi) per fakultas. faculty_ids
+        membatasi ke fakultas tertentu (lewat tabel temp).
+        """
+        faculty_filter = child_filter = ''
+        if faculty_ids is not None:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS index_batch (faculty_id INTEGER PRIMARY KEY)')
+            conn.execute('DELETE FROM temp.index_batch')
+            conn.executemany('INSERT OR IGNORE INTO temp.index_batch (faculty_id) VALUES (?)',
+                             ((faculty_id,) for faculty_id in faculty_ids))
+            faculty_filter = 'WHERE id IN (SELECT faculty_id FROM temp.index_batch)'
+            child_filter = 'AND faculty_id IN (SELECT faculty_id FROM temp.index_batch)'
+        
+        def grouped(rows):
+            # Grup harus di-list sebelum groupby maju ke grup berikutnya
+            return ((faculty_id, [row[1] for row in group]) for faculty_id, group in groupby(rows, key=itemgetter(0)))
+        
+        programs = grouped(conn.execute(
+            f"SELECT faculty_id, name FROM programs WHERE name IS NOT NULL AND name != '' {child_filter} ORDER BY faculty_id, id"
+        ))
+        departments = grouped(conn.execute(
+            f"SELECT faculty_id, name FROM departments WHERE name IS NOT NULL AND name != '' {child_filter} ORDER BY faculty_id, id"
+        ))
+        contacts = iter(conn.execute(
+            f'SELECT faculty_id, email, phone, address FROM contacts WHERE faculty_id IS NOT NULL {child_filter} ORDER BY faculty_id'
+        ))
+        
+        def take(stream, pending, faculty_id):
+            """(item milik faculty_id atau None, item berikutnya yang belum dipakai)"""
+            while pending is not None and pending[0] < faculty_id:
+                pending = next(stream, None)
+            if pending is not None and pending[0] == faculty_id:
+                return pending, next(stream, None)
+            return None, pending
+        
+        pending_programs = next(programs, None)
+        pending_departments = next(departments, None)
+        pending_contact = next(contacts, None)
+        
+        for faculty_id, name, url, description, faculty_type in conn.execute(
+            f'SELECT id, name, url, description, faculty_type FROM faculties {faculty_filter} ORDER BY id'
+        ):
+            program_group, pending_programs = take(programs, pending_programs, faculty_id)
+            department_group, pending_departments = take(departments, pending_departments, faculty_id)
+            contact_row, pending_contact = take(contacts, pending_contact, faculty_id)
+            
+            yield faculty_id, {
+                'id': faculty_id,
+                'name': name,
+                'url': url,
+                'description': description,
+                'faculty_type': faculty_type,
+                'programs': program_group[1] if program_group else [],
+                'departments': department_group[1] if department_group else [],
+                'contact': dict(zip(('email', 'phone', 'address'), contact_row[1:])) if contact_row else {}
+            }
     
-    def rebuild_all_indexes(self) -> Dict[str, int]:
-        """Rebuild semua search indexes dengan better error handling"""
+    def analyze_faculty_batch(self, batch: List[Tuple[int, Dict]]) -> Tuple[List[Tuple], Dict]:
+        """
+        Tokenisasi satu batch fakultas tanpa akses database (bisa jalan di worker process).
+        
+        Semua kerja per dokumen yang tidak butuh id dari database dilakukan di sini
+        (termasuk format posisi postings dan delta index_stats), supaya writer
+        tunggal di rebuild hanya memberi id dan insert.
+        
+        Returns:
+            (list of (faculty_id, field index, panjang field, postings (term, field, tf, posisi),
+            baris FTS5, hash isi), delta statistik batch untuk _write_stats)
+        """
+        analyzed = []
+        stats = {}
+        for faculty_id, faculty_data in batch:
+            lengths, positions = self.analyze_document(faculty_data)
+            fields = self.build_index_fields(faculty_data)
+            postings = [(term, field, len(term_positions), ','.join(map(str, term_positions)))
+                        for (term, field), term_positions in positions.items()]
+            analyzed.append((faculty_id, fields, lengths, postings, self.fts_row(faculty_data),
+                             content_hash(faculty_data)))
+            
+            entries = list(self._field_entries(faculty_id, fields))
+            self._count_entries(stats, entries)
+            self._count(stats, 'total', 'faculties', int(bool(entries)))
+            self._count(stats, 'total', 'documents', int(bool(lengths)))
+            self._count(stats, 'total', 'postings', len(postings))
+        return analyzed, stats
+    
+    def _load_analyzed_batch(self, cursor, batch: Tuple[List[Tuple], Dict], term_ids: Dict[str, int],
+                             keyword_ids: Dict[str, int], matrix: PostingsMatrix, suffix: str = '') -> int:
+        """
+        Insert satu batch hasil analyze_faculty_batch (field, keyword dan term baru,
+        dokumen, postings, baris FTS5, hash isi) dengan executemany, dan catat postings-nya di
+        document-term matrix untuk pembobotan. term_ids dan keyword_ids adalah
+        dictionary yang sudah dimuat (id baru diberikan di sini).
+        """
+        analyzed, stats = batch
+        fields, new_keywords, entries, new_terms, documents, postings, fts_rows = [], [], [], [], [], [], []
+        checksums = []
+        cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM index_fields{suffix}')
+        field_id = cursor.fetchone()[0]
+        
+        for faculty_id, faculty_fields, lengths, faculty_postings, fts_row, document_hash in analyzed:
+            fts_rows.append((faculty_id, *fts_row))
+            checksums.append((faculty_id, document_hash))
+            for content_type, content, weight, keywords in faculty_fields:
+                field_id += 1
+                fields.append((field_id, faculty_id, content_type, content, weight))
+                for keyword in keywords:
+                    keyword_id = keyword_ids.get(keyword)
+                    if keyword_id is None:
+                        keyword_id = keyword_ids[keyword] = len(keyword_ids) + 1
+                        new_keywords.append((keyword_id, keyword))
+                    entries.append((field_id, keyword_id))
+            documents.extend((faculty_id, field, length) for field, length in lengths.items())
+            
+            for term, field, tf, positions in faculty_postings:
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(term_ids) + 1
+                    new_terms.append((term_id, term))
+                postings.append((term_id, faculty_id, field, tf, positions))
+                matrix.add(term_id, faculty_id, field, tf, lengths[field])
+        
+        cursor.executemany(f'''
+            INSERT INTO index_fields{suffix} (id, faculty_id, content_type, content, weight) VALUES (?, ?, ?, ?, ?)
+        ''', fields)
+        cursor.executemany(f'INSERT INTO index_keywords{suffix} (id, keyword) VALUES (?, ?)', new_keywords)
+        cursor.executemany(f'INSERT INTO index_entries{suffix} (field_id, keyword_id) VALUES (?, ?)', entries)
+        cursor.executemany(f'INSERT INTO index_terms{suffix} (id, term) VALUES (?, ?)', new_terms)
+        self._write_trigrams(cursor, ((term, term_id) for term_id, term in new_terms), suffix)
+        self._write_stems(cursor, (term for _, term in new_terms), suffix)
+        cursor.executemany(f'INSERT INTO index_documents{suffix} (faculty_id, field, length) VALUES (?, ?, ?)', documents)
+        cursor.executemany(f'''
+            INSERT INTO index_postings{suffix} (term_id, faculty_id, field, tf, positions)
+            VALUES (?, ?, ?, ?, ?)
+        ''', postings)
+        cursor.executemany(f'''
+            INSERT INTO faculty_fts{suffix} (rowid, {", ".join(self.FTS_COLUMNS)})
+            VALUES (?, {", ".join("?" * len(self.FTS_COLUMNS))})
+        ''', fts_rows)
+        cursor.executemany(f'INSERT INTO index_checksums{suffix} (faculty_id, content_hash) VALUES (?, ?)', checksums)
+        
+        self._count(stats, 'total', 'terms', len(new_terms))
+        self._write_stats(cursor, stats, suffix)
+        
+        return len(analyzed)
+    
+    def _analyze_batches(self, batches: Iterable[List], workers: int) -> Iterator[Tuple[List[Tuple], Dict]]:
+        """
+        Tokenisasi batch secara berurutan, atau paralel di process pool (urutan hasil tetap).
+        
+        Indexer dikirim sekali ke setiap worker lewat initializer, bukan per batch.
+        """
+        if workers <= 1:
+            yield from map(self.analyze_faculty_batch, batches)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            for batch in batches:
+                pending.append(executor.submit(_analyze_in_worker, batch))
+                if len(pending) >= workers * 2:  # Batasi batch yang tertahan di memori
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    @staticmethod
+    def _batched(items: Iterable, size: int) -> Iterator[List]:
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            yield batch
+    
+    def rebuild_all_indexes(self, workers: int = 1, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Rebuild semua search indexes di shadow table lalu swap secara atomik.
+        
+        Data fakultas di-stream dari satu snapshot baca dengan beberapa query
+        set-based, ditokenisasi di memori (paralel jika workers > 1) lalu dimuat
+        ke tabel *_shadow per batch; bobot postings dihitung sekali di akhir
+        secara vectorized (TermWeighting). Selama itu tabel live tidak disentuh,
+        jadi pencarian tetap memakai index lama yang lengkap. Swap hanya
+        rename tabel dalam satu transaksi pendek; index lama disimpan sebagai
+        *_previous untuk rollback_index().
+        
+        Perubahan data selama rebuild tetap di index_queue dan diproses ke
+        index baru setelah swap.
+        
+        Args:
+            workers: jumlah worker process untuk tokenisasi (1 = tanpa process pool)
+            batch_size: jumlah fakultas per batch tokenisasi/insert
+        """
         results = {'success': 0, 'failed': 0, 'total_entries': 0}
+        start_time = time.time()
+        shadow = self.SHADOW_SUFFIX
+        
+        def start(conn):
+            cursor = conn.cursor()
+            # Selama penanda ini ada, process_index_queue tidak mengeluarkan entry dari antrian
+            cursor.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('rebuild_started', ?)",
+                           (time.strftime('%Y-%m-%d %H:%M:%S'),))
+            # Antrian yang ada sudah tercakup snapshot rebuild (dikembalikan jika rebuild gagal)
+            cursor.execute('SELECT faculty_id FROM index_queue')
+            claimed = cursor.fetchall()
+            cursor.execute('DELETE FROM index_queue')
+            self._drop_index_tables(cursor, shadow)  # Sisa rebuild yang gagal
+            self._create_index_tables(cursor, shadow)
+            # Generasi baru di atas live dan previous (setelah rollback previous bisa lebih baru)
+            cursor.execute("""
+                SELECT COALESCE(MAX(CAST(value AS INTEGER)), 0) FROM index_meta
+                WHERE key IN ('generation', 'previous.generation')
+            """)
+            return cursor.fetchone()[0] + 1, claimed
+        
+        def score(conn):
+            cursor = conn.cursor()
+            # Secondary index dibuat setelah load (lebih cepat dari update per baris)
+            self._create_secondary_indexes(cursor, generation, shadow)
+            
+            # Bobot butuh statistik seluruh korpus: df, idf, skor dan norm
+            # dihitung sekali di akhir dari matrix di memori
+            posting_terms, posting_faculties, field_ids, tfs, lengths = matrix.arrays()
+            idf_by_term = self._write_term_statistics(
+                cursor, term_ids.values(),
+                self.weighting.document_frequencies(posting_terms, posting_faculties), shadow
+            )
+            self._score_postings(cursor, postings=(
+                posting_terms, posting_faculties, field_ids, tfs, lengths, idf_by_term[posting_terms]
+            ), suffix=shadow)
+        
+        def swap(conn):
+            cursor = conn.cursor()
+            self._swap_index_tables(cursor, generation)
+            # Hash sumber yang kosong (data ditulis di luar Faculty) diisi dari snapshot rebuild,
+            # kecuali fakultas yang berubah sesudah snapshot (masih di index_queue)
+            cursor.execute('''
+                UPDATE faculties SET content_hash = (
+                    SELECT content_hash FROM index_checksums c WHERE c.faculty_id = faculties.id
+                )
+                WHERE content_hash IS NULL AND id NOT IN (SELECT faculty_id FROM index_queue)
+            ''')
+            bump_data_version(conn)
+        
+        def abort(conn):
+            cursor = conn.cursor()
+            self._drop_index_tables(cursor, shadow)
+            cursor.execute("DELETE FROM index_meta WHERE key = 'rebuild_started'")
+            cursor.executemany('INSERT OR IGNORE INTO index_queue (faculty_id) VALUES (?)', claimed)
         
         try:
-            with self.get_db_connection(timeout=60.0) as conn:  # Longer timeout for rebuild
-                cursor = conn.cursor()
-                
-                # Begin transaction
-                cursor.execute('BEGIN IMMEDIATE')
+            # Penulisan lewat WriteQueue: satu transaksi pendek per langkah/batch, jadi
+            # penulisan lain (import, antrian index) diselingi di antaranya selama rebuild
+            with self.get_db_connection(timeout=60.0) as reader:
+                generation, claimed = self._write(start)
                 
                 try:
-                    # Clear existing search index
-                    cursor.execute('DELETE FROM search_index')
-                    self.logger.info("Cleared existing search index")
-                    
-                    # Get all faculties
-                    cursor.execute('SELECT id FROM faculties ORDER BY id')
-                    faculty_ids = [row[0] for row in cursor.fetchall()]
-                    
-                    cursor.execute('COMMIT')
+                    # Snapshot baca (WAL): perubahan setelah titik ini masuk index_queue
+                    reader.execute('BEGIN')
+                    reader.execute('SELECT COUNT(*) FROM faculties').fetchone()
                     
-                    self.logger.info(f"Found {len(faculty_ids)} faculties to index")
+                    term_ids, keyword_ids = {}, {}
+                    matrix = PostingsMatrix(self.FIELDS)
+                    batches = self._batched(self.iter_faculty_documents(reader), batch_size)
                     
-                    # Process each faculty individually to avoid long transactions
-                    for faculty_id in faculty_ids:
-                        try:
-                            faculty_data = self._get_complete_faculty_data(faculty_id)
-                            if faculty_data and faculty_data.get('name'):  # Ensure we have basic data
-                                if self.create_search_index(faculty_id, faculty_data):
-                                    results['success'] += 1
-                                    if results['success'] % 10 == 0:  # Progress logging
-                                        self.logger.info(f"Indexed {results['success']} faculties...")
-                                else:
-                                    results['failed'] += 1
-                            else:
-                                self.logger.warning(f"No data found for faculty {faculty_id}")
-                                results['failed'] += 1
-                                
-                        except Exception as e:
-                            self.logger.error(f"Error processing faculty {faculty_id}: {e}")
-                            results['failed'] += 1
-                    
-                    # Count total entries created
-                    with self.get_db_connection() as count_conn:
-                        count_cursor = count_conn.cursor()
-                        count_cursor.execute('SELECT COUNT(*) FROM search_index')
-                        results['total_entries'] = count_cursor.fetchone()[0]
-                    
-                    self.logger.info(f"Index rebuild completed: {results}")
-                    return results
-                    
-                except Exception as e:
-                    cursor.execute('ROLLBACK')
-                    raise e
+                    for analyzed in self._analyze_batches(batches, workers):
+                        results['success'] += self._write(lambda conn: self._load_analyzed_batch(
+                            conn.cursor(), analyzed, term_ids, keyword_ids, matrix, shadow
+                        ))
+                        self.logger.info(f"Indexed {results['success']} faculties...")
+                    reader.execute('COMMIT')
                     
+                    self._write(score)
+                    self._write(swap)
+                
+                except Exception:
+                    if reader.in_transaction:
+                        reader.execute('ROLLBACK')
+                    self._write(abort)
+                    raise
+                
+                cursor = reader.cursor()
+                results['total_entries'] = self._read_stat(cursor, 'total', 'entries')
+                results['total_postings'] = self._read_stat(cursor, 'total', 'postings')
+                results['generation'] = generation
+                results['duration'] = round(time.time() - start_time, 2)
+                
+                self.logger.info(f"Index rebuild completed: {results}")
+        
         except Exception as e:
             self.logger.error(f"Error rebuilding search indexes: {e}")
             return results
+        
+        # Perubahan selama rebuild (tidak ada di snapshot) diterapkan ke index baru; file
+        # biner ditulis di sini hanya jika antrian kosong (jika tidak, process_index_queue menulisnya)
+        queued = self.process_index_queue()
+        if not (queued['reindexed'] or queued['removed']):
+            self.export_binary_index()
+        return results
+    
+    def _drop_index_tables(self, cursor, suffix: str):
+        for table in self.INDEX_TABLES:
+            cursor.execute(f'DROP TABLE IF EXISTS {table}{suffix}')
+    
+    def _swap_index_tables(self, cursor, generation: int):
+        """
+        Jadikan tabel shadow live (di dalam transaksi pemanggil): live -> *_previous,
+        *_shadow -> live. Hanya rename, jadi transaksinya singkat.
+        """
+        self._drop_index_tables(cursor, self.PREVIOUS_SUFFIX)
+        # View dibuat ulang: rename tabel ikut mengubah tabel yang dirujuk view
+        cursor.execute('DROP VIEW IF EXISTS search_index')
+        for table in self.INDEX_TABLES:
+            cursor.execute(f'ALTER TABLE {table} RENAME TO {table}{self.PREVIOUS_SUFFIX}')
+            cursor.execute(f'ALTER TABLE {table}{self.SHADOW_SUFFIX} RENAME TO {table}')
+        self._create_search_index_view(cursor)
+        
+        # Pengaturan index live lama ikut disimpan untuk rollback
+        cursor.execute("DELETE FROM index_meta WHERE key LIKE 'previous.%' OR key = 'rebuild_started'")
+        cursor.execute("INSERT INTO index_meta (key, value) SELECT 'previous.' || key, value FROM index_meta")
+        cursor.execute("DELETE FROM index_meta WHERE key = 'scores_stale'")  # Index baru diskor penuh
+        settings = dict(self.index_settings(), generation=str(generation), field_boosts=self._boosts_setting())
+        cursor.executemany('INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)', settings.items())
+    
+    def rollback_index(self) -> bool:
+        """
+        Kembalikan index sebelum rebuild terakhir (tukar live dengan *_previous).
+        
+        Index yang dikembalikan berisi data saat index itu dibangun; perubahan
+        fakultas sesudahnya tidak diterapkan ulang. Boost field-nya ikut kembali
+        ke boost saat itu, jadi setelah swap skor diskala ulang ke field_boosts
+        config (reweight_index) sebelum index biner ditulis.
+        """
+        def swap(conn) -> bool:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM index_meta WHERE key = 'rebuild_started'")
+            if cursor.fetchone():
+                raise RuntimeError("rebuild sedang berjalan")
+            
+            cursor.execute(f'''
+                SELECT COUNT(*) FROM sqlite_master
+                WHERE type = 'table' AND name IN ({",".join("?" * len(self.INDEX_TABLES))})
+            ''', [f'{table}{self.PREVIOUS_SUFFIX}' for table in self.INDEX_TABLES])
+            if cursor.fetchone()[0] != len(self.INDEX_TABLES):
+                return False
+            
+            # live -> shadow (sementara), previous -> live, shadow -> previous
+            self._drop_index_tables(cursor, self.SHADOW_SUFFIX)
+            cursor.execute('DROP VIEW IF EXISTS search_index')
+            for table in self.INDEX_TABLES:
+                cursor.execute(f'ALTER TABLE {table} RENAME TO {table}{self.SHADOW_SUFFIX}')
+                cursor.execute(f'ALTER TABLE {table}{self.PREVIOUS_SUFFIX} RENAME TO {table}')
+                cursor.execute(f'ALTER TABLE {table}{self.SHADOW_SUFFIX} RENAME TO {table}{self.PREVIOUS_SUFFIX}')
+            self._create_search_index_view(cursor)
+            
+            # Tukar pengaturan live <-> previous.* (lewat prefix sementara, key adalah primary key)
+            cursor.execute("UPDATE index_meta SET key = 'swap.' || substr(key, 10) WHERE key LIKE 'previous.%'")
+            cursor.execute("UPDATE index_meta SET key = 'previous.' || key WHERE key NOT LIKE 'swap.%'")
+            cursor.execute("UPDATE index_meta SET key = substr(key, 6) WHERE key LIKE 'swap.%'")
+            bump_data_version(conn)
+            return True
+        
+        try:
+            if not self._write(swap):
+                self.logger.warning("Tidak ada index sebelumnya untuk rollback")
+                return False
+            
+            self.logger.info("Search index dikembalikan ke versi sebelumnya")
+            # reweight_index menulis index biner sendiri jika ada boost yang berubah
+            if not self.reweight_index():
+                self.export_binary_index()
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Error rolling back search index: {e}")
+            return False
+    
+    def reindex_faculties(self, conn, faculty_ids: List[int], affected_terms: Optional[Set[int]] = None) -> int:
+        """
+        Re-index fakultas tertentu di dalam transaksi yang sedang berjalan.
+        
+        Fakultas yang sudah tidak ada (dihapus) dibersihkan dari index.
+        affected_terms: jika diberikan, skor tidak dihitung di sini; term yang
+        berubah ditambahkan ke set ini untuk satu _update_scores di akhir
+        (process_index_queue). Returns jumlah fakultas yang masih ada dan di-index ulang.
+        """
+        cursor = conn.cursor()
+        documents = dict(self.iter_faculty_documents(conn, faculty_ids))
+        update_scores = affected_terms is None
+        affected_terms = set() if update_scores else affected_terms
+        stats = {}
+        scoring_state = self._scoring_state(cursor) if update_scores else None
+        
+        for faculty_id in faculty_ids:
+            faculty_data = documents.get(faculty_id, {})
+            self._replace_fields(cursor, faculty_id, self.build_index_fields(faculty_data), stats)
+            affected_terms |= self._write_postings(cursor, faculty_id, faculty_data, stats)
+            self._write_fts(cursor, faculty_id, faculty_data)
+            self._write_checksum(cursor, faculty_id, faculty_data)
+        
+        # Statistik ditulis sebelum skor: jumlah dokumen dipakai untuk idf
+        self._write_stats(cursor, stats)
+        if update_scores:
+            self._update_scores(cursor, term_ids=affected_terms, faculty_ids=list(faculty_ids),
+                                scoring_state=scoring_state)
+        return len(documents)
+    
+    def process_index_queue(self, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Incremental indexing: re-index hanya fakultas yang ditandai di index_queue.
+        
+        Setiap batch di-index dan dikeluarkan dari antrian dalam satu transaksi,
+        jadi perubahan yang masuk antrian tidak pernah hilang. Selama rebuild
+        berjalan index live tetap diperbarui, tapi entry dibiarkan di antrian
+        supaya juga diterapkan ke index baru setelah swap.
+        
+        Skor dihitung sekali setelah batch terakhir (_update_scores atas semua
+        term yang berubah, atau semua postings jika jumlah dokumen/rata-rata
+        panjang field berubah). Sampai itu index_meta berisi 'scores_stale';
+        jika proses berhenti di tengah, ensure_index menghitung ulang semua skor.
+        """
+        results = {'reindexed': 0, 'removed': 0}
+        last_id = None
+        queued_ids, affected_terms = [], set()
+        scoring_state = []  # _scoring_state() sebelum batch pertama
+        
+        def reindex_batch(conn) -> Tuple[List[int], int]:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT faculty_id FROM index_queue WHERE ? IS NULL OR faculty_id > ?
+                ORDER BY faculty_id LIMIT ?
+            ''', (last_id, last_id, batch_size))
+            faculty_ids = [row[0] for row in cursor.fetchall()]
+            if not faculty_ids:
+                return faculty_ids, 0
+            
+            if not scoring_state:
+                scoring_state.append(self._scoring_state(cursor))
+            cursor.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('scores_stale', '1')")
+            reindexed = self.reindex_faculties(conn, faculty_ids, affected_terms)
+            bump_data_version(conn)
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM index_meta WHERE key = 'rebuild_started')")
+            if not cursor.fetchone()[0]:
+                cursor.executemany('DELETE FROM index_queue WHERE faculty_id = ?',
+                                   [(faculty_id,) for faculty_id in faculty_ids])
+            return faculty_ids, reindexed
+        
+        def score(conn):
+            self._update_scores(conn.cursor(), term_ids=affected_terms, faculty_ids=queued_ids,
+                                scoring_state=scoring_state[0])
+            conn.execute("DELETE FROM index_meta WHERE key = 'scores_stale'")
+            bump_data_version(conn)
+        
+        try:
+            # Satu operasi WriteQueue per batch (index dan antrian berubah bersama)
+            while True:
+                faculty_ids, reindexed = self._write(reindex_batch)
+                if not faculty_ids:
+                    break
+                
+                last_id = faculty_ids[-1]
+                queued_ids.extend(faculty_ids)
+                results['reindexed'] += reindexed
+                results['removed'] += len(faculty_ids) - reindexed
+        
+        except Exception as e:
+            self.logger.error(f"Error processing index queue: {e}")
+        
+        # Batch yang sudah di-commit tetap diskor, juga jika batch berikutnya gagal
+        if queued_ids:
+            try:
+                self._write(score)
+            except Exception as e:
+                self.logger.error(f"Error scoring incremental index update: {e}")
+            self.logger.info(f"Incremental index update: {results}")
+            self.export_binary_index()
+        
+        return results
+    
+    def export_binary_index(self, path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Tulis snapshot index live (term dictionary, postings berskor, baris
+        fakultas dan bitmap dokumen per term/field/faculty_type) ke file biner
+        read-only untuk FacultySearchEngine (lihat binary_index.py).
+        
+        path default binary_index_path; tanpa keduanya tidak melakukan apa-apa.
+        Returns jumlah term, dokumen dan postings yang ditulis.
+        """
+        path = path or self.binary_index_path
+        if not path:
+            return {}
+        
+        try:
+            with self.get_db_connection() as conn:
+                cursor = conn.cursor()
+                # Dokumen dan postings dari satu snapshot baca
+                cursor.execute('BEGIN')
+                try:
+                    cursor.execute("SELECT key, value FROM index_meta WHERE key IN ('generation', 'field_boosts')")
+                    meta = dict(self.index_settings(), generation='0', field_boosts=self._boosts_setting())
+                    meta.update(cursor.fetchall())
+                    
+                    # Semua fakultas (juga yang tanpa postings), supaya filter tipe lewat bitmap lengkap
+                    cursor.execute('SELECT id, name, url, description, faculty_type, created_at FROM faculties')
+                    columns = [column[0] for column in cursor.description]
+                    docs = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                    
+                    cursor.execute('''
+                        SELECT t.term, p.faculty_id, p.field, p.score
+                        FROM index_postings p
+                        JOIN index_terms t ON t.id = p.term_id
+                        ORDER BY t.term
+                    ''')
+                    written = write_binary_index(path, self.FIELDS, docs, cursor, meta)
+                finally:
+                    cursor.execute('COMMIT')
+            
+            # FacultySearchEngine memuat file baru saat pencarian berikutnya; hasil cache
+            # yang dihitung dari file lama (sesudah commit index, sebelum file ini) dibuang
+            self._write(bump_data_version)
+            self.logger.info(f"Binary index written to {path}: {written}")
+            return written
+        
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"Error exporting binary index: {e}")
+            return {}
+    
+    def pending_reindex_count(self) -> int:
+        """Jumlah fakultas yang menunggu di-index ulang"""
+        try:
+            with self.get_db_connection() as conn:
+                return conn.execute('SELECT COUNT(*) FROM index_queue').fetchone()[0]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error counting index queue: {e}")
+            return 0
+    
+    def index_settings(self) -> Dict[str, str]:
+        """Pengaturan yang menentukan isi index (disimpan di index_meta saat rebuild)"""
+        return {'analyzer_version': str(ANALYZER_VERSION), 'weighting': self.weighting.scheme,
+                'format': str(self.INDEX_FORMAT)}
+    
+    def _boosts_setting(self) -> str:
+        """field_boosts dalam bentuk yang disimpan di index_meta"""
+        return json.dumps(self.field_boosts, sort_keys=True)
+    
+    def reweight_index(self) -> Dict[str, float]:
+        """
+        Terapkan field_boosts ke index yang sudah ada tanpa tokenisasi ulang.
+        
+        Skor postings = boost field x bobot dasar (lihat TermWeighting), jadi
+        postings field yang boost-nya berubah cukup dikalikan boost baru / boost
+        lama dalam satu UPDATE per field; weight index_fields dan index_stats ikut
+        diperbarui. Returns faktor skala per field yang berubah.
+        """
+        def reweight(conn):
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM index_meta WHERE key = 'field_boosts'")
+            row = cursor.fetchone()
+            old_boosts = dict(self.FIELD_BOOSTS, **(json.loads(row[0]) if row else {}))
+            factors = {field: boost / old_boosts[field] for field, boost in self.field_boosts.items()
+                       if boost != old_boosts[field]}
+            
+            for field, factor in factors.items():
+                boost = self.field_boosts[field]
+                cursor.execute('UPDATE index_postings SET score = score * ? WHERE field = ?', (factor, field))
+                cursor.execute("UPDATE index_stats SET weight = value * ? WHERE kind = 'content_type' AND key = ?",
+                               (boost, field))
+                # Bobot keyword = jumlah weight entry-nya: tambah selisih boost x jumlah entry di field ini
+                cursor.execute('''
+                    UPDATE index_stats SET weight = weight + ? * counts.entries
+                    FROM (
+                        SELECT k.keyword, COUNT(*) AS entries FROM index_fields f
+                        JOIN index_entries e ON e.field_id = f.id
+                        JOIN index_keywords k ON k.id = e.keyword_id
+                        WHERE f.content_type = ?
+                        GROUP BY k.keyword
+                    ) AS counts
+                    WHERE index_stats.kind = 'keyword' AND index_stats.key = counts.keyword
+                ''', (boost - old_boosts[field], field))
+                cursor.execute('UPDATE index_fields SET weight = ? WHERE content_type = ?', (boost, field))
+            cursor.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('field_boosts', ?)",
+                           (self._boosts_setting(),))
+            if factors:
+                bump_data_version(conn)
+            return factors
+        
+        try:
+            factors = self._write(reweight)
+        except Exception as e:
+            self.logger.error(f"Error reweighting search index: {e}")
+            return {}
+        
+        if factors:
+            self.logger.info(f"Index reweighted: {factors}")
+            self.export_binary_index()
+        return factors
+    
+    def ensure_index(self, workers: int = 1) -> bool:
+        """
+        Bangun inverted index jika masih kosong padahal sudah ada data fakultas,
+        atau jika dibangun dengan analyzer/skema bobot lain; skala ulang skor jika
+        hanya boost field yang berubah (reweight_index), atau hitung ulang semua
+        skor jika update incremental terhenti sebelum skornya dihitung; selain itu
+        proses perubahan yang masih ada di index_queue dan perbaiki fakultas yang
+        index-nya tidak cocok dengan datanya (repair_search_index).
+        
+        workers diteruskan ke rebuild_all_indexes. Returns True jika index dibangun penuh.
+        """
+        try:
+            with self.get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT EXISTS(SELECT 1 FROM faculties), EXISTS(SELECT 1 FROM index_postings)')
+                has_faculties, has_postings = cursor.fetchone()
+                cursor.execute('SELECT key, value FROM index_meta')
+                settings = dict(cursor.fetchall())
+        except sqlite3.Error as e:
+            self.logger.error(f"Error checking inverted index: {e}")
+            return False
+        
+        if has_faculties and not has_postings:
+            self.logger.info("Inverted index kosong, membangun index...")
+            self.rebuild_all_indexes(workers=workers)
+            return True
+        
+        if has_faculties and any(settings.get(key) != value for key, value in self.index_settings().items()):
+            self.logger.info("Index dibangun dengan analyzer/skema bobot lain, membangun ulang index...")
+            self.rebuild_all_indexes(workers=workers)
+            return True
+        
+        if has_postings and settings.get('field_boosts') != self._boosts_setting():
+            self.logger.info("Boost field berubah, menskala ulang skor index...")
+            self.reweight_index()
+            settings['field_boosts'] = self._boosts_setting()
+        
+        if has_postings and settings.get('scores_stale'):
+            self.logger.info("Skor index belum dihitung ulang setelah update incremental, menghitung ulang...")
+            self.refresh_scores()
+        
+        queued = self.repair_search_index()
+        if self.binary_index_path and not (queued['reindexed'] or queued['removed']):
+            # File biner belum ada, format lama, atau dari generasi/boost index lain
+            meta = read_meta(self.binary_index_path)
+            if meta is None or any(meta.get(key) != settings.get(key, default)
+                                   for key, default in (('generation', '0'), ('field_boosts', None))):
+                self.export_binary_index()
+        return False
     
     def _get_complete_faculty_data(self, faculty_id: int) -> Dict:
         """Ambil data lengkap fakultas untuk indexing dengan better error handling"""
@@ -411,46 +1565,99 @@ class SearchIndexer:
             self.logger.error(f"Error getting faculty data for indexing faculty {faculty_id}: {e}")
             return {}
     
+    def _read_stats(self, cursor) -> Dict[str, int]:
+        cursor.execute("SELECT key, value FROM index_stats WHERE kind = 'total'")
+        return dict(cursor.fetchall())
+    
     def verify_search_index(self) -> Dict:
-        """Verify integrity of search index"""
+        """Verify integrity of search index (dibaca dari index_stats, tanpa scan tabel index)"""
         try:
             with self.get_db_connection() as conn:
                 cursor = conn.cursor()
                 
-                verification = {}
-                
-                # Check total entries
-                cursor.execute('SELECT COUNT(*) FROM search_index')
-                verification['total_entries'] = cursor.fetchone()[0]
+                totals = self._read_stats(cursor)
+                cursor.execute('SELECT COUNT(*) FROM faculties')
+                total_faculties = cursor.fetchone()[0]
                 
-                # Check faculties with no index
-                cursor.execute('''
-                    SELECT COUNT(*) FROM faculties f
-                    WHERE NOT EXISTS (SELECT 1 FROM search_index si WHERE si.faculty_id = f.id)
-                ''')
-                verification['unindexed_faculties'] = cursor.fetchone()[0]
-                
-                # Check empty keywords
-                cursor.execute('SELECT COUNT(*) FROM search_index WHERE keywords IS NULL OR keywords = ""')
-                verification['empty_keywords'] = cursor.fetchone()[0]
+                verification = {
+                    'total_entries': totals.get('entries', 0),
+                    'unindexed_faculties': max(total_faculties - totals.get('faculties', 0), 0),
+                    'empty_keywords': self._read_stat(cursor, 'keyword', ''),
+                }
                 
                 # Check content type distribution
-                cursor.execute('''
-                    SELECT content_type, COUNT(*) as count
-                    FROM search_index
-                    GROUP BY content_type
-                    ORDER BY count DESC
-                ''')
+                cursor.execute("""
+                    SELECT key, value FROM index_stats
+                    WHERE kind = 'content_type'
+                    ORDER BY value DESC
+                """)
                 verification['content_type_distribution'] = {row[0]: row[1] for row in cursor.fetchall()}
                 
+                # Inverted index
+                verification['total_postings'] = totals.get('postings', 0)
+                verification['total_terms'] = totals.get('terms', 0)
+                verification['unindexed_documents'] = max(total_faculties - totals.get('documents', 0), 0)
+                verification['stale_faculties'] = len(self.find_stale_faculties(cursor))
+                
                 return verification
                 
         except sqlite3.Error as e:
             self.logger.error(f"Error verifying search index: {e}")
             return {}
     
+    def find_stale_faculties(self, cursor=None) -> List[int]:
+        """
+        Fakultas yang index-nya tidak cocok dengan datanya: hash isi berbeda atau
+        kosong, belum di-index, atau masih di index padahal sudah dihapus.
+        
+        Satu join lewat primary key faculties dan index_checksums, tanpa membaca
+        postings atau data fakultas.
+        """
+        query = '''
+            SELECT f.id FROM faculties f
+            LEFT JOIN index_checksums c ON c.faculty_id = f.id
+            WHERE c.content_hash IS NULL OR c.content_hash IS NOT f.content_hash
+            UNION ALL
+            SELECT c.faculty_id FROM index_checksums c
+            LEFT JOIN faculties f ON f.id = c.faculty_id
+            WHERE f.id IS NULL
+        '''
+        if cursor is not None:
+            return [row[0] for row in cursor.execute(query)]
+        try:
+            with self.get_db_connection() as conn:
+                return [row[0] for row in conn.execute(query)]
+        except sqlite3.Error as e:
+            self.logger.error(f"Error checking index checksums: {e}")
+            return []
+    
+    def repair_search_index(self) -> Dict[str, int]:
+        """
+        Verify + repair per fakultas: hasil find_stale_faculties dimasukkan ke
+        index_queue lalu di-index ulang oleh process_index_queue, tanpa rebuild penuh.
+        
+        Returns hasil process_index_queue ditambah jumlah fakultas yang tidak cocok ('stale').
+        """
+        stale = self.find_stale_faculties()
+        if stale:
+            self.logger.warning(f"{len(stale)} faculties out of sync with the search index, re-indexing them")
+            try:
+                self._write(lambda conn: conn.executemany('INSERT OR IGNORE INTO index_queue (faculty_id) VALUES (?)',
+                                                          [(faculty_id,) for faculty_id in stale]))
+            except sqlite3.Error as e:
+                self.logger.error(f"Error queueing stale faculties: {e}")
+        
+        results = self.process_index_queue()
+        results['stale'] = len(stale)
+        return results
+    
     def get_search_statistics(self) -> Dict:
-        """Dapatkan statistik search index yang lebih comprehensive"""
+        """
+        Dapatkan statistik search index yang lebih comprehensive.
+        
+        Semua angka dibaca dari index_stats yang dijaga indexer saat menulis,
+        jadi biayanya tidak bergantung pada ukuran index.
+        """
         try:
             with self.get_db_connection() as conn:
                 cursor = conn.cursor()
@@ -458,46 +1665,42 @@ class SearchIndexer:
                 stats = {}
                 
                 # Total entries
-                cursor.execute('SELECT COUNT(*) FROM search_index')
-                stats['total_entries'] = cursor.fetchone()[0]
+                stats['total_entries'] = self._read_stat(cursor, 'total', 'entries')
                 
                 # Entries by content type
                 cursor.execute('''
-                    SELECT content_type, COUNT(*) as count, AVG(weight) as avg_weight
-                    FROM search_index 
-                    GROUP BY content_type
-                    ORDER BY count DESC
+                    SELECT key, value, weight FROM index_stats
+                    WHERE kind = 'content_type'
+                    ORDER BY value DESC
                 ''')
                 stats['by_content_type'] = {
-                    row[0]: {'count': row[1], 'avg_weight': round(row[2], 2)} 
+                    row[0]: {'count': row[1], 'avg_weight': round(row[2] / row[1], 2)} 
                     for row in cursor.fetchall()
                 }
                 
                 # Most common keywords
                 cursor.execute('''
-                    SELECT keywords, COUNT(*) as frequency, AVG(weight) as avg_weight
-                    FROM search_index 
-                    WHERE keywords IS NOT NULL AND keywords != ""
-                    GROUP BY keywords 
-                    ORDER BY frequency DESC 
+                    SELECT key, value, weight FROM index_stats
+                    WHERE kind = 'keyword' AND key != ''
+                    ORDER BY value DESC 
                     LIMIT 20
                 ''')
                 stats['top_keywords'] = [
                     {
                         'keyword': row[0], 
                         'frequency': row[1], 
-                        'avg_weight': round(row[2], 2)
+                        'avg_weight': round(row[2] / row[1], 2)
                     } 
                     for row in cursor.fetchall()
                 ]
                 
                 # Faculties with most index entries
                 cursor.execute('''
-                    SELECT si.faculty_id, f.name, COUNT(*) as entries 
-                    FROM search_index si
-                    JOIN faculties f ON si.faculty_id = f.id
-                    GROUP BY si.faculty_id, f.name
-                    ORDER BY entries DESC 
+                    SELECT f.id, f.name, s.value
+                    FROM index_stats s
+                    JOIN faculties f ON f.id = CAST(s.key AS INTEGER)
+                    WHERE s.kind = 'faculty'
+                    ORDER BY s.value DESC 
                     LIMIT 10
                 ''')
                 stats['top_indexed_faculties'] = [
@@ -516,7 +1719,6 @@ class SearchIndexer:
             return {}
 
 
-# Utility functions
 def test_indexer():
     """Test function untuk indexer"""
     import os
@@ -537,12 +1739,17 @@ def test_indexer():
     print(f"Total entries: {verification.get('total_entries', 0)}")
     print(f"Unindexed faculties: {verification.get('unindexed_faculties', 0)}")
     print(f"Empty keywords: {verification.get('empty_keywords', 0)}")
+    print(f"Stale faculties: {verification.get('stale_faculties', 0)}")
     
-    # Test rebuild if needed
-    if verification.get('total_entries', 0) == 0 or verification.get('unindexed_faculties', 0) > 0:
+    # Rebuild penuh hanya jika index kosong; fakultas yang tidak cocok diperbaiki satu per satu
+    if verification.get('total_entries', 0) == 0:
         print("\n🔄 Rebuilding search index...")
         results = indexer.rebuild_all_indexes()
         print(f"Rebuild results: {results}")
+    elif verification.get('stale_faculties', 0) > 0:
+        print("\n🔧 Repairing stale faculties...")
+        results = indexer.repair_search_index()
+        print(f"Repair results: {results}")
     
     # Show statistics
     print("\n📈 Search Index Statistics:")
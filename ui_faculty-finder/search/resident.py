@@ -0,0 +1,306 @@
+"""
+Snapshot data pencarian yang resident di memori
+
+Korpus UI (puluhan sampai beberapa ribu fakultas/program) muat seluruhnya di
+memori proses: baris fakultas beserta program, departemen, kontak dan rute
+(sudah dalam bentuk hasil enrich), term dictionary, postings berskor, kamus
+stem dan index trigram. ResidentSnapshot dimuat dari SQLite dalam satu
+transaksi baca lalu tidak pernah diubah; FacultySearchEngine (resident=True)
+menjawab pencarian, saran, daftar per tipe dan facet dari snapshot ini tanpa
+membuka koneksi SQLite, dan menggantinya dengan snapshot baru (satu
+assignment referensi) saat data_version database berubah.
+
+Postings disimpan seperti index biner (binary_index.py): array NumPy skor,
+nomor dokumen dan kode field, postings satu term berurutan. Nomor dokumen =
+urutan (nama, id), jadi tie-break ORDER BY name cukup nomor dokumen terkecil.
+"""
+import sqlite3
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .analysis import tokenize
+from .stemmer import stem
+from .trigram import edit_distance, max_edits, min_shared_trigrams, trigrams
+
+# Kolom baris hasil pencarian (sama dengan SELECT FacultySearchEngine._index_search)
+RESULT_COLUMNS = ('id', 'name', 'url', 'description', 'faculty_type', 'created_at')
+
+
+def data_version(conn: sqlite3.Connection) -> int:
+    """PRAGMA data_version: berubah setiap kali koneksi lain (juga dari proses lain) commit"""
+    return conn.execute('PRAGMA data_version').fetchone()[0]
+
+
+class ResidentSnapshot:
+    """Snapshot read-only fakultas dan inverted index di memori"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """Muat snapshot lewat conn dalam satu transaksi baca (isi konsisten satu titik waktu)"""
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('BEGIN')
+        try:
+            self._load_faculties(cursor)
+            self._load_index(cursor)
+        finally:
+            cursor.execute('COMMIT')
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def has_postings(self) -> bool:
+        return bool(len(self._scores))
+
+    @staticmethod
+    def _grouped(cursor, query: str) -> Dict[int, List]:
+        """faculty_id -> baris query (kolom pertama query = faculty_id)"""
+        grouped = defaultdict(list)
+        for row in cursor.execute(query):
+            grouped[row[0]].append(row)
+        return grouped
+
+    def _load_faculties(self, cursor):
+        """Baris fakultas urut (nama, id) plus data enrich per fakultas"""
+        rows = sorted((dict(row) for row in cursor.execute('SELECT * FROM faculties')),
+                      key=lambda row: (row['name'], row['id']))
+        programs = self._grouped(cursor, 'SELECT faculty_id, name FROM programs ORDER BY id')
+        departments = self._grouped(cursor, 'SELECT faculty_id, name FROM departments ORDER BY id')
+        contacts = self._grouped(cursor, 'SELECT faculty_id, * FROM contacts ORDER BY id')
+        try:
+            routes = self._grouped(cursor, 'SELECT faculty_id, name, url FROM routes ORDER BY faculty_id, step_order')
+        except sqlite3.Error:
+            routes = {}
+
+        self._records = rows
+        self._enrichment = []
+        for row in rows:
+            faculty_id = row['id']
+            contact = contacts.get(faculty_id)
+            self._enrichment.append((
+                tuple(program['name'] for program in programs.get(faculty_id, ())),
+                tuple(department['name'] for department in departments.get(faculty_id, ())),
+                {key: contact[0][key] for key in contact[0].keys()[1:]} if contact else {},
+                tuple((route['name'], route['url']) for route in routes.get(faculty_id, ()))
+            ))
+
+        self.doc_numbers = {row['id']: number for number, row in enumerate(rows)}
+        self.types = sorted({row['faculty_type'] for row in rows if row['faculty_type']})
+        type_codes = {faculty_type: code for code, faculty_type in enumerate(self.types)}
+        self._doc_types = np.array([type_codes.get(row['faculty_type'], -1) for row in rows], dtype=np.int64)
+        self._type_docs = {faculty_type: np.flatnonzero(self._doc_types == code)
+                           for faculty_type, code in type_codes.items()}
+
+        # Kandidat saran per nama berbeda (SELECT DISTINCT name), urut panjang nama (ORDER BY LENGTH(name)):
+        # (nama lowercase, nama, nomor dokumen yang memakai nama itu)
+        self._name_suggestions = self._suggestion_names((row['name'], number) for number, row in enumerate(rows))
+        self._program_suggestions = self._suggestion_names(
+            (name, number) for number, (names, *_) in enumerate(self._enrichment) for name in names)
+
+    @staticmethod
+    def _suggestion_names(names: Iterable[Tuple[str, int]]) -> List[Tuple[str, str, frozenset]]:
+        documents = defaultdict(set)
+        for name, number in names:
+            documents[name].add(number)
+        return [(name.lower(), name, frozenset(documents[name]))
+                for name in sorted(documents, key=lambda name: (len(name), name))]
+
+    def _load_index(self, cursor):
+        """Term dictionary, postings (urut term), kamus stem dan trigram dari tabel index live"""
+        self.fields: List[str] = []
+        self._ranges: Dict[str, Tuple[int, int]] = {}
+        self._stems: Dict[str, str] = {}
+        self._trigrams: Dict[str, np.ndarray] = {}
+        self._term_by_id: Dict[int, str] = {}
+        self._scores = np.zeros(0)
+        self._docs = np.zeros(0, dtype=np.int64)
+        self._fields = np.zeros(0, dtype=np.int64)
+        self.has_index = False
+        try:
+            terms = dict(cursor.execute('SELECT id, term FROM index_terms').fetchall())
+            rows = cursor.execute('''
+                SELECT term_id, faculty_id, field, score FROM index_postings ORDER BY term_id, faculty_id, field
+            ''').fetchall()
+            self._stems = dict(cursor.execute('SELECT word, stem FROM index_stems').fetchall())
+            trigram_rows = cursor.execute('SELECT trigram, term_id FROM index_trigrams ORDER BY trigram').fetchall()
+        except sqlite3.Error:
+            return  # Index belum pernah dibangun: pencarian dijawab jalur SQLite
+        self.has_index = True
+        self._term_by_id = terms
+        self._trigrams = {trigram: np.array([row[1] for row in group], dtype=np.int64)
+                          for trigram, group in groupby(trigram_rows, key=itemgetter(0))}
+        if not rows:
+            return
+
+        # Postings urut primary key (term_id, faculty_id, field): postings satu term berurutan
+        term_ids, faculty_ids, fields, scores = zip(*rows)
+        self.fields = sorted(set(fields))
+        field_codes = {field: code for code, field in enumerate(self.fields)}
+        doc_by_id = np.full(max(max(faculty_ids), max(self.doc_numbers, default=0)) + 1, -1, dtype=np.int64)
+        doc_by_id[list(self.doc_numbers)] = list(self.doc_numbers.values())
+
+        term_ids = np.array(term_ids, dtype=np.int64)
+        docs = doc_by_id[np.array(faculty_ids, dtype=np.int64)]
+        keep = docs >= 0  # Postings fakultas yang sudah dihapus tapi belum di-reindex
+        self._docs = docs[keep]
+        self._fields = np.array([field_codes[field] for field in fields], dtype=np.int64)[keep]
+        self._scores = np.array(scores, dtype=np.float64)[keep]
+        term_ids = term_ids[keep]
+        if not len(term_ids):
+            return
+
+        starts = np.flatnonzero(np.r_[True, term_ids[1:] != term_ids[:-1]])
+        ends = np.r_[starts[1:], len(term_ids)]
+        self._ranges = {terms[term_id]: (start, end)
+                        for term_id, start, end in zip(term_ids[starts].tolist(), starts.tolist(), ends.tolist())
+                        if term_id in terms}
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._ranges
+
+    def match_partial_terms(self, word: str, fuzzy: bool = True) -> List[str]:
+        """Term untuk kata parsial/typo (sama dengan FacultySearchEngine._match_partial_terms)"""
+        grams = trigrams(word)
+        if not grams:
+            return []
+
+        edits = max_edits(word) if fuzzy else 0
+        parts = [self._trigrams[gram] for gram in grams if gram in self._trigrams]
+        if not parts:
+            return []
+        term_ids, shared = np.unique(np.concatenate(parts), return_counts=True)
+        min_shared = min_shared_trigrams(word, edits)
+        candidates = [(self._term_by_id[term_id], count) for term_id, count in zip(term_ids.tolist(), shared.tolist())
+                      if count >= min_shared and term_id in self._term_by_id]
+
+        matches = [term for term, count in candidates if count == len(grams) and word in term]
+        if matches or not edits:
+            return matches
+
+        distances = {term: edit_distance(word, term, edits) for term, _ in candidates}
+        best = min(distances.values(), default=edits + 1)
+        return [term for term, distance in distances.items() if distance == best <= edits]
+
+    def query_terms(self, words: List[str]) -> List[str]:
+        """Term index untuk kata query (sama dengan FacultySearchEngine._index_term_ids)"""
+        matched = set()
+        for term in sorted(set(tokenize(' '.join(words)))):
+            term_stem = self._stems.get(term) or stem(term)
+            key = term_stem if term_stem in self._ranges else term
+            if key in self._ranges:
+                matched.add(key)
+            else:
+                matched.update(self.match_partial_terms(term))
+        return sorted(matched)
+
+    def _postings(self, term: str, fields: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(nomor dokumen, skor) postings satu term, opsional hanya field tertentu"""
+        start, end = self._ranges.get(term, (0, 0))
+        docs, scores = self._docs[start:end], self._scores[start:end]
+        if fields:
+            codes = [self.fields.index(field) for field in fields if field in self.fields]
+            keep = np.isin(self._fields[start:end], codes)
+            docs, scores = docs[keep], scores[keep]
+        return docs, scores
+
+    def _result(self, number: int, columns: Optional[Iterable[str]] = None, **extra) -> Dict:
+        """Baris hasil yang sudah di-enrich (bentuk sama dengan _enrich_search_results)"""
+        record = self._records[number]
+        row = {column: record[column] for column in columns} if columns else dict(record)
+        row.update(extra)
+        programs, departments, contact, routes = self._enrichment[number]
+        row['programs'] = list(programs)
+        row['programs_count'] = len(programs)
+        row['departments'] = list(departments)
+        row['departments_count'] = len(departments)
+        row['contact'] = dict(contact)
+        row['route'] = [{'name': name, 'url': url} for name, url in routes]
+        row['search_score'] = row.get('final_score', 0)
+        return row
+
+    def search(self, words: List[str], limit: int, fields: Optional[Tuple[str, ...]] = None,
+               faculty_type: Optional[str] = None) -> List[Dict]:
+        """Jumlah skor postings per fakultas, urut skor tertinggi lalu nama"""
+        allowed = None
+        if faculty_type is not None:
+            if faculty_type not in self._type_docs:
+                return []
+            allowed = self._doc_types == self.types.index(faculty_type)
+
+        doc_parts, score_parts = [], []
+        match_count = np.zeros(len(self._records), dtype=np.int64)
+        for term in self.query_terms(words):
+            docs, scores = self._postings(term, fields)
+            if allowed is not None:
+                keep = allowed[docs]
+                docs, scores = docs[keep], scores[keep]
+            if not len(docs):
+                continue
+            doc_parts.append(docs)
+            score_parts.append(scores)
+            match_count[np.unique(docs)] += 1
+
+        if not doc_parts:
+            return []
+        totals = np.bincount(np.concatenate(doc_parts), weights=np.concatenate(score_parts),
+                             minlength=len(self._records))
+        hits = np.flatnonzero(match_count)
+        ranked = hits[np.lexsort((hits, -totals[hits]))[:limit]]
+        return [self._result(number, RESULT_COLUMNS, match_count=int(match_count[number]),
+                             final_score=float(totals[number]))
+                for number in ranked.tolist()]
+
+    def type_facets(self, words: List[str], fields: Optional[Tuple[str, ...]] = None) -> Dict[str, int]:
+        """Jumlah fakultas yang cocok dengan query per faculty_type"""
+        parts = [self._postings(term, fields)[0] for term in self.query_terms(words)]
+        if not parts:
+            return {}
+        types = self._doc_types[np.unique(np.concatenate(parts))]
+        counts = np.bincount(types[types >= 0], minlength=len(self.types))
+        return {faculty_type: int(count) for faculty_type, count in zip(self.types, counts.tolist()) if count}
+
+    def faculties_by_type(self, faculty_type: str, limit: int) -> List[Dict]:
+        """Fakultas satu tipe urut nama (sama dengan SELECT * ... ORDER BY name)"""
+        numbers = self._type_docs.get(faculty_type, np.zeros(0, dtype=np.int64))
+        return [self._result(number) for number in numbers[:limit].tolist()]
+
+    def _suggestion_candidates(self, query: str) -> Optional[Set[int]]:
+        """
+        Nomor dokumen yang nama atau programnya memuat semua kata query (lihat
+        FacultySearchEngine._suggestion_candidates); None = tanpa pembatasan.
+        """
+        words = [word for word in dict.fromkeys(tokenize(query)) if len(word) >= 3]
+        if not words or not self.has_index:
+            return None
+
+        candidates = None
+        for word in words:
+            docs = set()
+            for term in self.match_partial_terms(word, fuzzy=False):
+                docs.update(self._postings(term, ('name', 'program'))[0].tolist())
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return set()
+        return candidates
+
+    def suggestions(self, query: str, limit: int) -> List[str]:
+        """Nama fakultas dan program yang memuat query, terpendek dulu"""
+        pattern = query.lower()
+        candidates = self._suggestion_candidates(query)
+        if candidates is not None and not candidates:
+            return []
+
+        suggestions = {}
+        for source in (self._name_suggestions, self._program_suggestions):
+            found = {}
+            for lowered, name, numbers in source:
+                if len(found) >= limit:
+                    break
+                if pattern in lowered and (candidates is None or not numbers.isdisjoint(candidates)):
+                    found.setdefault(name, None)
+            suggestions.update(found)
+        return list(suggestions)[:limit]
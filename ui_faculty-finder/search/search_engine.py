@@ -5,16 +5,84 @@ from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 import math
 import os
+import threading
+import time
+
+from database.cache import get_query_cache
+
+from .analysis import normalize_text, tokenize
+from .binary_index import BinaryIndex
+from .indexer import SearchIndexer
+from .resident import ResidentSnapshot, data_version
+from .stemmer import stem
+from .trigram import edit_distance, max_edits, min_shared_trigrams, trigrams
 
 class FacultySearchEngine:
     """
     Search engine untuk mencari fakultas UI dengan berbagai metode pencarian
     """
     
-    def __init__(self, db_path: str):
+    # search_type -> field postings yang dipakai (None = semua field)
+    INDEX_SEARCH_FIELDS = {
+        'comprehensive': None,
+        'name': ('name',),
+        'description': ('description',),
+        'program': ('program',)
+    }
+    
+    # Backend pencarian: 'index' (inverted index + trigram) atau 'fts5' (tabel faculty_fts, ranking bm25())
+    BACKENDS = ('index', 'fts5')
+    
+    # search_type -> kolom faculty_fts yang dipakai (None = semua kolom)
+    FTS_SEARCH_COLUMNS = {
+        'comprehensive': None,
+        'name': ('name',),
+        'description': ('description',),
+        'program': ('programs',)
+    }
+    
+    def __init__(self, db_path: str, backend: str = 'index', binary_index_path: Optional[str] = None,
+                 field_boosts: Optional[Dict[str, float]] = None, resident: bool = False,
+                 reload_interval: float = 1.0):
+        """
+        binary_index_path: file index biner dari SearchIndexer.export_binary_index; jika
+        ada, backend 'index' mencari lewat file itu (mmap) dan tidak membaca postings dari SQLite
+        field_boosts: boost per field (Config.SEARCH_FIELD_BOOSTS, sama dengan indexer), dipakai
+        sebagai bobot bm25() per kolom faculty_fts; backend 'index' memakai skor postings
+        yang boost-nya sudah dihitung indexer
+        resident: muat fakultas dan index ke memori (ResidentSnapshot); backend 'index',
+        saran dan daftar per tipe dijawab tanpa SQLite, snapshot dimuat ulang di background
+        setiap reload_interval detik jika data_version database berubah
+        
+        Hasil search_faculties, get_search_suggestions dan get_type_facets disimpan di
+        QueryCache database ini (get_query_cache) sampai data version-nya berubah.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown search backend: {backend} (expected one of {self.BACKENDS})")
         self.db_path = db_path
+        self.backend = backend
+        self.binary_index_path = binary_index_path
+        boosts = dict(SearchIndexer.FIELD_BOOSTS, **(field_boosts or {}))
+        self.fts_weights = tuple(boosts[field] for field in SearchIndexer.FTS_COLUMNS.values())
+        self._binary_index = None
+        self._binary_index_stat = None
+        self.cache = get_query_cache(db_path)
+        # Cache dipakai bersama per database: engine dengan jalur baca lain (resident, index
+        # biner, SQLite) atau bobot FTS5 lain tidak memakai hasil satu sama lain
+        self._cache_scope = ('resident' if resident else 'binary' if binary_index_path else 'sqlite',
+                             binary_index_path, self.fts_weights)
         self.logger = logging.getLogger(__name__)
         
+        # Snapshot resident dan koneksi baca khusus untuk memantau data_version
+        self.resident = resident
+        self.reload_interval = reload_interval
+        self._resident = None
+        self._resident_version = None
+        self._resident_conn = None
+        self._resident_lock = threading.Lock()
+        self._resident_stop = threading.Event()
+        self._resident_thread = None
+        
         # Check if database exists
         if not os.path.exists(db_path):
             self.logger.error(f"Database not found: {db_path}")
@@ -27,27 +95,72 @@ class FacultySearchEngine:
             'tidak', 'sudah', 'telah', 'bisa', 'saya', 'kami', 'kita', 'mereka'
         }
         
-        # Synonym mapping untuk memperbaiki pencarian
-        self.synonyms = {
-            'kedokteran': ['medical', 'medicine', 'dokter', 'medis'],
-            'teknik': ['engineering', 'engineer', 'teknologi', 'tech'],
-            'ekonomi': ['economy', 'business', 'bisnis', 'manajemen'],
-            'hukum': ['law', 'legal'],
-            'ilmu': ['science', 'sains'],
-            'komputer': ['computer', 'informatika', 'it'],
-            'sosial': ['social'],
-            'budaya': ['culture', 'cultural'],
-            'politik': ['political', 'politics'],
-            'matematika': ['math', 'mathematics'],
-            'psikologi': ['psychology', 'psych'],
-            'kesehatan': ['health'],
-            'gigi': ['dental', 'dentistry'],
-            'keperawatan': ['nursing'],
-            'vokasi': ['vocational']
-        }
-        
         # Initialize database and verify tables
         self._verify_database_structure()
+        if resident:
+            self._start_resident()
+    
+    def _start_resident(self):
+        """Muat snapshot pertama lalu jalankan thread yang memuat ulang saat data berubah"""
+        self._resident_conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        try:
+            self.reload_resident()
+        except Exception as e:
+            # Sampai snapshot berhasil dimuat thread reload, pencarian lewat SQLite
+            self.logger.error(f"Error loading resident search snapshot: {e}")
+        self._resident_thread = threading.Thread(target=self._watch_data_version, daemon=True,
+                                                 name=f'resident-search:{os.path.basename(self.db_path)}')
+        self._resident_thread.start()
+    
+    def _watch_data_version(self):
+        while not self._resident_stop.wait(self.reload_interval):
+            try:
+                self.reload_resident()
+            except Exception as e:
+                self.logger.error(f"Error reloading resident search snapshot: {e}")
+    
+    def reload_resident(self, force: bool = False) -> bool:
+        """
+        Muat snapshot resident baru jika data_version berubah sejak snapshot
+        terakhir (atau force). Snapshot baru dibangun penuh dulu, lalu diganti
+        dengan satu assignment: pencarian yang sedang berjalan tetap memakai
+        snapshot lama. Returns True jika snapshot diganti.
+        """
+        if self._resident_conn is None:
+            return False
+        with self._resident_lock:
+            # Versi dibaca sebelum memuat: commit di tengah pemuatan memicu reload berikutnya
+            version = data_version(self._resident_conn)
+            if version == self._resident_version and not force:
+                return False
+            start = time.perf_counter()
+            snapshot = ResidentSnapshot(self._resident_conn)
+            self._resident, self._resident_version = snapshot, version
+            # Hasil cache yang dihitung dari snapshot lama (sesudah data version naik) dibuang
+            self.cache.clear()
+        self.logger.info(f"Resident search snapshot loaded: {len(snapshot)} faculties in "
+                         f"{(time.perf_counter() - start) * 1000:.0f} ms")
+        return True
+    
+    def close(self):
+        """Hentikan thread reload dan tutup koneksi snapshot resident"""
+        self._resident_stop.set()
+        if self._resident_thread is not None:
+            self._resident_thread.join()
+            self._resident_thread = None
+        with self._resident_lock:
+            if self._resident_conn is not None:
+                self._resident_conn.close()
+                self._resident_conn = None
+    
+    def _resident_snapshot(self, backend: Optional[str] = None, postings: bool = True) -> Optional[ResidentSnapshot]:
+        """Snapshot resident untuk backend 'index' (None jika tidak dipakai atau index belum dibangun)"""
+        snapshot = self._resident
+        if snapshot is None or (backend or self.backend) != 'index':
+            return None
+        if postings and not snapshot.has_postings:
+            return None
+        return snapshot
     
     def _verify_database_structure(self):
         """Verify database structure and create missing tables/indexes if needed"""
@@ -55,10 +168,10 @@ class FacultySearchEngine:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # Check if search_index table exists
+                # Check if search_index table (atau view dari SearchIndexer) exists
                 cursor.execute("""
                     SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='search_index'
+                    WHERE type IN ('table', 'view') AND name='search_index'
                 """)
                 
                 if not cursor.fetchone():
@@ -104,17 +217,17 @@ class FacultySearchEngine:
         # Remove stopwords and short words
         words = [word for word in words if word not in self.stopwords and len(word) > 2]
         
-        # Add synonyms
-        expanded_words = words.copy()
-        for word in words:
-            if word in self.synonyms:
-                expanded_words.extend(self.synonyms[word])
-        
-        return list(set(expanded_words))  # Remove duplicates
+        # Sinonim tidak di-expand di sini: indexer sudah menulis term kanonik
+        # (mis. "kedokteran" untuk "medical") ke postings dan keywords
+        return list(dict.fromkeys(words))  # Remove duplicates
     
-    def search_faculties(self, query: str, limit: int = 20, search_type: str = 'comprehensive') -> List[Dict]:
+    def search_faculties(self, query: str, limit: int = 20, search_type: str = 'comprehensive',
+                         backend: Optional[str] = None, faculty_type: Optional[str] = None) -> List[Dict]:
         """
         Main search method dengan berbagai strategi pencarian
+        
+        backend memilih 'index' atau 'fts5' untuk query ini (default: backend engine).
+        faculty_type membatasi hasil ke satu tipe fakultas.
         """
         if not query or not query.strip():
             self.logger.warning("Empty query provided")
@@ -126,35 +239,16 @@ class FacultySearchEngine:
             return []
         
         self.logger.info(f"Searching for: {query} -> {processed_words}")
+        backend = backend or self.backend
         
+        # Query yang sama (kata ternormalisasi, tipe, limit, backend, filter) dijawab dari
+        # QueryCache; FTS5 juga memakai phrase/prefix dari query mentah
+        key = ('search', self._cache_scope, backend, search_type, limit, faculty_type, tuple(processed_words))
+        if backend == 'fts5':
+            key += (self.fts_query(query),)
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:  # Add timeout
-                conn.row_factory = sqlite3.Row
-                
-                # First try to check if search_index has data
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM search_index")
-                index_count = cursor.fetchone()[0]
-                
-                if index_count == 0:
-                    self.logger.warning("Search index is empty, falling back to direct search")
-                    return self._fallback_search(conn, processed_words, limit)
-                
-                if search_type == 'comprehensive':
-                    results = self._comprehensive_search(conn, processed_words, limit)
-                elif search_type == 'name':
-                    results = self._search_by_name(conn, processed_words, limit)
-                elif search_type == 'description':
-                    results = self._search_by_description(conn, processed_words, limit)
-                elif search_type == 'program':
-                    results = self._search_by_program(conn, processed_words, limit)
-                else:
-                    results = self._comprehensive_search(conn, processed_words, limit)
-                
-                self.logger.info(f"Found {len(results)} results")
-                
-                # Enrich results with additional data
-                return self._enrich_search_results(conn, results)
+            return self.cache.get_or_compute(key, lambda: self._search_faculties(
+                query, processed_words, limit, search_type, backend, faculty_type))
         
         except sqlite3.Error as e:
             self.logger.error(f"Database error searching faculties: {e}")
@@ -163,6 +257,309 @@ class FacultySearchEngine:
             self.logger.error(f"Unexpected error searching faculties: {e}")
             return []
     
+    def _search_faculties(self, query: str, processed_words: List[str], limit: int, search_type: str,
+                          backend: str, faculty_type: Optional[str]) -> List[Dict]:
+        """Jalankan pencarian search_faculties() (exception diteruskan supaya tidak di-cache)"""
+        # Snapshot resident: term, postings dan data enrich dari memori, tanpa koneksi SQLite
+        snapshot = self._resident_snapshot(backend)
+        if snapshot is not None:
+            results = snapshot.search(processed_words, limit, self.INDEX_SEARCH_FIELDS.get(search_type), faculty_type)
+            self.logger.info(f"Found {len(results)} results (resident)")
+            return results
+        
+        with sqlite3.connect(self.db_path, timeout=30.0) as conn:  # Add timeout
+            conn.row_factory = sqlite3.Row
+            
+            # FTS5: tokenizer, prefix/phrase query dan ranking bm25() dari SQLite
+            if backend == 'fts5' and self._has_fts_index(conn):
+                results = self._fts_search(conn, query, limit, self.FTS_SEARCH_COLUMNS.get(search_type), faculty_type)
+                self.logger.info(f"Found {len(results)} results (fts5)")
+                return self._enrich_search_results(conn, results)
+            
+            # Index biner (mmap): term dan postings dibaca dari file, SQLite hanya untuk enrich
+            binary_index = self._load_binary_index() if backend == 'index' else None
+            if binary_index is not None:
+                results = self._binary_index_search(conn, binary_index, processed_words, limit,
+                                                    self.INDEX_SEARCH_FIELDS.get(search_type), faculty_type)
+                self.logger.info(f"Found {len(results)} results (binary index)")
+                return self._enrich_search_results(conn, results)
+            
+            # Inverted index (term lookup + skor BM25 tersimpan) jika sudah dibangun; kata
+            # parsial/typo dicocokkan lewat trigram, jadi LIKE hanya untuk database tanpa index
+            if self._has_inverted_index(conn):
+                results = self._index_search(conn, processed_words, limit, self.INDEX_SEARCH_FIELDS.get(search_type),
+                                             faculty_type)
+                self.logger.info(f"Found {len(results)} results (inverted index)")
+                return self._enrich_search_results(conn, results)
+            
+            # First try to check if search_index has data
+            cursor = conn.cursor()
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM search_index)")
+            has_index = cursor.fetchone()[0]
+            
+            if not has_index:
+                self.logger.warning("Search index is empty, falling back to direct search")
+                return self._filter_type(self._fallback_search(conn, processed_words, limit), faculty_type)
+            
+            if search_type == 'comprehensive':
+                results = self._comprehensive_search(conn, processed_words, limit)
+            elif search_type == 'name':
+                results = self._search_by_name(conn, processed_words, limit)
+            elif search_type == 'description':
+                results = self._search_by_description(conn, processed_words, limit)
+            elif search_type == 'program':
+                results = self._search_by_program(conn, processed_words, limit)
+            else:
+                results = self._comprehensive_search(conn, processed_words, limit)
+            results = self._filter_type(results, faculty_type)
+            
+            self.logger.info(f"Found {len(results)} results")
+            
+            # Enrich results with additional data
+            return self._enrich_search_results(conn, results)
+    
+    def _has_inverted_index(self, conn) -> bool:
+        """True jika tabel postings ada dan berisi"""
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM index_postings)")
+            return bool(cursor.fetchone()[0])
+        except sqlite3.Error:
+            return False  # Index belum pernah dibuat (database lama)
+    
+    def _has_fts_index(self, conn) -> bool:
+        """True jika tabel faculty_fts ada dan berisi"""
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM faculty_fts)")
+            return bool(cursor.fetchone()[0])
+        except sqlite3.Error:
+            return False  # Index dibangun sebelum ada backend FTS5
+    
+    def fts_query(self, query: str) -> str:
+        """
+        Ekspresi MATCH FTS5 dari query pengguna: teks dalam tanda kutip jadi
+        phrase query, kata lain jadi prefix query ("kata"*), digabung dengan OR.
+        Teks dinormalisasi sama seperti isi faculty_fts.
+        """
+        phrases = re.findall(r'"([^"]+)"', query)
+        remainder = re.sub(r'"[^"]*"?', ' ', query)
+        
+        clauses = [f'"{normalize_text(phrase)}"' for phrase in phrases if normalize_text(phrase)]
+        clauses.extend(f'"{word}"*' for word in dict.fromkeys(tokenize(remainder)))
+        return ' OR '.join(clauses)
+    
+    def _fts_search(self, conn, query: str, limit: int, columns: Optional[Tuple[str, ...]] = None,
+                    faculty_type: Optional[str] = None) -> List[Tuple]:
+        """Pencarian lewat tabel FTS5 faculty_fts, diurutkan bm25() dengan bobot per kolom"""
+        match = self.fts_query(query)
+        if not match:
+            return []
+        if columns:
+            match = f"{{{' '.join(columns)}}} : ({match})"
+        params = [match]
+        type_condition = ''
+        if faculty_type is not None:
+            type_condition = 'AND f.faculty_type = ?'
+            params.append(faculty_type)
+        params.append(limit)
+        
+        weights = ', '.join(map(str, self.fts_weights))
+        sql = f"""
+            SELECT 
+                f.id,
+                f.name,
+                f.url,
+                f.description,
+                f.faculty_type,
+                f.created_at,
+                -bm25(faculty_fts, {weights}) as final_score
+            FROM faculty_fts
+            JOIN faculties f ON f.id = faculty_fts.rowid
+            WHERE faculty_fts MATCH ? {type_condition}
+            ORDER BY bm25(faculty_fts, {weights}), f.name ASC
+            LIMIT ?
+        """
+        
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error in FTS5 search: {e}")
+            return []
+    
+    def _index_term_ids(self, cursor, words: List[str]) -> Dict[str, int]:
+        """
+        term -> term_id untuk kata query: kata dasar term dicari di term dictionary,
+        term yang tidak ada dicocokkan sebagai kata parsial atau typo lewat index
+        trigram (_match_partial_terms).
+        """
+        terms = sorted(set(tokenize(' '.join(words))))
+        if not terms:
+            return {}
+        
+        # Indexer menulis stem di posisi setiap kata berimbuhan, jadi stem cukup satu lookup exact
+        # ("pendidikan" juga menemukan "pendidik", "didik", ...)
+        stems = self._query_stems(cursor, terms)
+        lookup = sorted(set(terms) | set(stems.values()))
+        cursor.execute(f"SELECT term, id FROM index_terms WHERE term IN ({','.join('?' * len(lookup))})", lookup)
+        found = dict(cursor.fetchall())
+        term_ids = {}
+        for term in terms:
+            key = stems[term] if stems[term] in found else term
+            if key in found:
+                term_ids[key] = found[key]
+            else:
+                term_ids.update(self._match_partial_terms(cursor, term))
+        return term_ids
+    
+    def _index_search(self, conn, words: List[str], limit: int, fields: Optional[Tuple[str, ...]] = None,
+                      faculty_type: Optional[str] = None) -> List[Tuple]:
+        """
+        Pencarian lewat inverted index: lookup term query (_index_term_ids), lalu
+        jumlahkan skor BM25 yang sudah dihitung indexer per fakultas.
+        """
+        cursor = conn.cursor()
+        try:
+            term_ids = self._index_term_ids(cursor, words)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error looking up terms: {e}")
+            return []
+        if not term_ids:
+            return []
+        
+        params = list(term_ids.values())
+        field_condition = ''
+        if fields:
+            field_condition = f"AND p.field IN ({','.join('?' * len(fields))})"
+            params.extend(fields)
+        if faculty_type is not None:
+            field_condition += ' AND f.faculty_type = ?'
+            params.append(faculty_type)
+        params.append(limit)
+        
+        query = f"""
+            SELECT 
+                f.id,
+                f.name,
+                f.url,
+                f.description,
+                f.faculty_type,
+                f.created_at,
+                COUNT(DISTINCT p.term_id) as match_count,
+                SUM(p.score) as final_score
+            FROM index_postings p
+            JOIN faculties f ON f.id = p.faculty_id
+            WHERE p.term_id IN ({','.join('?' * len(term_ids))}) {field_condition}
+            GROUP BY p.faculty_id
+            ORDER BY final_score DESC, f.name ASC
+            LIMIT ?
+        """
+        
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error in inverted index search: {e}")
+            return []
+    
+    def _load_binary_index(self) -> Optional[BinaryIndex]:
+        """
+        BinaryIndex untuk binary_index_path (None jika tidak dipakai/belum ada).
+        
+        File ditulis ulang indexer dengan os.replace, jadi perubahan terdeteksi
+        dari stat file; mmap lama dilepas setelah tidak ada pencarian yang memakainya.
+        """
+        if not self.binary_index_path:
+            return None
+        try:
+            stat = os.stat(self.binary_index_path)
+        except OSError:
+            return None
+        
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if key != self._binary_index_stat:
+            try:
+                self._binary_index = BinaryIndex(self.binary_index_path)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Error loading binary index: {e}")
+                self._binary_index = None
+            self._binary_index_stat = key
+        return self._binary_index
+    
+    def _binary_index_search(self, conn, index: BinaryIndex, words: List[str], limit: int,
+                             fields: Optional[Tuple[str, ...]] = None, faculty_type: Optional[str] = None) -> List[Dict]:
+        """_index_search lewat index biner; filter faculty_type lewat bitmap tipe"""
+        return index.search(self._binary_index_terms(conn, index, words), limit, fields, faculty_type)
+    
+    def _binary_index_terms(self, conn, index: BinaryIndex, words: List[str]) -> List[str]:
+        """
+        Term index biner untuk kata query: stem query dicari di term table file,
+        term yang tidak ada dicocokkan lewat trigram (SQLite) seperti biasa.
+        """
+        matched = []
+        for term in sorted(set(tokenize(' '.join(words)))):
+            key = stem(term)
+            if key in index:
+                matched.append(key)
+            elif term in index:
+                matched.append(term)
+            else:
+                try:
+                    matched.extend(self._match_partial_terms(conn.cursor(), term))
+                except sqlite3.Error as e:
+                    self.logger.error(f"Error matching partial term '{term}': {e}")
+        return matched
+    
+    @staticmethod
+    def _filter_type(results: List, faculty_type: Optional[str]) -> List:
+        """Saring hasil jalur LIKE (tanpa inverted index) ke satu faculty_type"""
+        if faculty_type is None:
+            return results
+        return [row for row in results if row['faculty_type'] == faculty_type]
+    
+    def _query_stems(self, cursor, terms: List[str]) -> Dict[str, str]:
+        """term query -> kata dasar, dari kamus index_stems; kata di luar kamus di-stem langsung"""
+        try:
+            cursor.execute(f"SELECT word, stem FROM index_stems WHERE word IN ({','.join('?' * len(terms))})", terms)
+            stems = dict(cursor.fetchall())
+        except sqlite3.Error:
+            stems = {}  # Index lama (sebelum index_stems), dibangun ulang oleh ensure_index
+        return {term: stems.get(term) or stem(term) for term in terms}
+    
+    def _match_partial_terms(self, cursor, word: str, fuzzy: bool = True) -> Dict[str, int]:
+        """
+        Term dictionary yang cocok dengan kata parsial: kandidat dari irisan
+        posting trigram, lalu diverifikasi sebagai substring. Jika tidak ada
+        substring yang cocok (dan fuzzy), pakai term dengan edit distance
+        terkecil dalam batas max_edits (typo).
+        
+        Returns term -> term_id.
+        """
+        grams = trigrams(word)
+        if not grams:
+            return {}  # Kata < 3 karakter tidak punya trigram
+        
+        edits = max_edits(word) if fuzzy else 0
+        cursor.execute(f'''
+            SELECT t.term, t.id, COUNT(*) as shared
+            FROM index_trigrams g
+            JOIN index_terms t ON t.id = g.term_id
+            WHERE g.trigram IN ({','.join('?' * len(grams))})
+            GROUP BY g.term_id
+            HAVING shared >= ?
+        ''', grams + [min_shared_trigrams(word, edits)])
+        candidates = cursor.fetchall()
+        
+        matches = {term: term_id for term, term_id, shared in candidates if shared == len(grams) and word in term}
+        if matches or not edits:
+            return matches
+        
+        distances = {term: (edit_distance(word, term, edits), term_id) for term, term_id, _ in candidates}
+        best = min((distance for distance, _ in distances.values()), default=edits + 1)
+        return {term: term_id for term, (distance, term_id) in distances.items() if distance == best <= edits}
+    
     def _fallback_search(self, conn, words: List[str], limit: int) -> List[Tuple]:
         """Fallback search when search_index is empty"""
         cursor = conn.cursor()
@@ -198,49 +595,43 @@ class FacultySearchEngine:
         """Pencarian komprehensif dengan scoring - simplified version"""
         cursor = conn.cursor()
         
-        # Simplified search with better error handling
-        word_conditions = []
-        search_params = []
-        
-        for word in words:
-            word_pattern = f"%{word}%"
-            word_conditions.append("""
-                (si.keywords LIKE ? OR si.content LIKE ? OR f.name LIKE ?)
-            """)
-            search_params.extend([word_pattern, word_pattern, word_pattern])
-        
-        if not word_conditions:
+        if not words:
             return []
         
-        search_condition = " OR ".join(word_conditions)
+        # LIKE dievaluasi sekali per keyword, per teks field dan per nama fakultas
+        # (tabel index ternormalisasi), bukan per baris search_index
+        patterns = [f"%{word}%" for word in words]
+        
+        def like_any(column: str) -> str:
+            return " OR ".join(f"{column} LIKE ?" for _ in patterns)
         
         # Simplified scoring query
         query = f"""
-            SELECT DISTINCT 
+            WITH matched_keywords AS (SELECT id FROM index_keywords WHERE {like_any('keyword')}),
+                 matched_fields AS (SELECT id FROM index_fields WHERE {like_any('content')}),
+                 matched_names AS (SELECT id FROM faculties WHERE {like_any('name')})
+            SELECT 
                 f.id,
                 f.name,
                 f.url,
                 f.description,
                 f.faculty_type,
                 f.created_at,
-                COUNT(DISTINCT si.id) as match_count,
-                -- Simple scoring based on content type
-                SUM(CASE 
-                    WHEN si.content_type = 'name' THEN 100
-                    WHEN si.content_type = 'program' THEN 70
-                    WHEN si.content_type = 'description' THEN 60
-                    WHEN si.content_type = 'department' THEN 50
-                    ELSE 10
-                END) as final_score
-            FROM faculties f
-            LEFT JOIN search_index si ON f.id = si.faculty_id
-            WHERE ({search_condition})
+                COUNT(DISTINCT e.id) as match_count,
+                -- weight field = boost field dari indexer
+                SUM(fl.weight) as final_score
+            FROM index_entries e
+            JOIN index_fields fl ON fl.id = e.field_id
+            JOIN faculties f ON f.id = fl.faculty_id
+            WHERE e.keyword_id IN matched_keywords
+               OR e.field_id IN matched_fields
+               OR fl.faculty_id IN matched_names
             GROUP BY f.id, f.name, f.url, f.description, f.faculty_type, f.created_at
             ORDER BY final_score DESC, f.name ASC
             LIMIT ?
         """
         
-        search_params.append(limit)
+        search_params = patterns * 3 + [limit]
         
         try:
             cursor.execute(query, search_params)
@@ -384,55 +775,111 @@ class FacultySearchEngine:
         return enriched_results
     
     def get_search_suggestions(self, query: str, limit: int = 5) -> List[str]:
-        """Dapatkan saran pencarian berdasarkan query parsial"""
+        """Dapatkan saran pencarian berdasarkan query parsial (di-cache per query dan limit)"""
         if not query or len(query) < 2:
             return []
         
         try:
-            with sqlite3.connect(self.db_path, timeout=10.0) as conn:
-                cursor = conn.cursor()
-                
-                search_pattern = f"%{query.lower()}%"
-                suggestions = set()
-                
-                # From faculty names
-                cursor.execute('''
-                    SELECT DISTINCT name FROM faculties 
-                    WHERE LOWER(name) LIKE ? 
+            return self.cache.get_or_compute(('suggest', self._cache_scope, query.lower(), limit),
+                                             lambda: self._search_suggestions(query, limit))
+        
+        except sqlite3.Error as e:
+            self.logger.error(f"Error getting search suggestions: {e}")
+            return []
+    
+    def _search_suggestions(self, query: str, limit: int) -> List[str]:
+        """Saran untuk get_search_suggestions() (exception diteruskan supaya tidak di-cache)"""
+        snapshot = self._resident_snapshot(postings=False)
+        if snapshot is not None:
+            return snapshot.suggestions(query, limit)
+        
+        with sqlite3.connect(self.db_path, timeout=10.0) as conn:
+            cursor = conn.cursor()
+            
+            search_pattern = f"%{query.lower()}%"
+            suggestions = set()
+            
+            # Kandidat fakultas dari index trigram; LIKE hanya memverifikasi kandidat itu
+            candidates = self._suggestion_candidates(cursor, query)
+            faculty_condition = program_condition = ''
+            candidate_params = []
+            if candidates is not None:
+                candidate_query, candidate_params = candidates
+                if not candidate_query:
+                    return []
+                faculty_condition = f"AND id IN ({candidate_query})"
+                program_condition = f"AND faculty_id IN ({candidate_query})"
+            
+            # From faculty names
+            cursor.execute(f'''
+                SELECT DISTINCT name FROM faculties 
+                WHERE LOWER(name) LIKE ? {faculty_condition}
+                ORDER BY LENGTH(name) ASC
+                LIMIT ?
+            ''', [search_pattern, *candidate_params, limit])
+            
+            for row in cursor.fetchall():
+                suggestions.add(row[0])
+            
+            # From programs (if table exists)
+            try:
+                cursor.execute(f'''
+                    SELECT DISTINCT name FROM programs 
+                    WHERE LOWER(name) LIKE ? {program_condition}
                     ORDER BY LENGTH(name) ASC
                     LIMIT ?
-                ''', (search_pattern, limit))
+                ''', [search_pattern, *candidate_params, limit])
                 
                 for row in cursor.fetchall():
                     suggestions.add(row[0])
-                
-                # From programs (if table exists)
-                try:
-                    cursor.execute('''
-                        SELECT DISTINCT name FROM programs 
-                        WHERE LOWER(name) LIKE ? 
-                        ORDER BY LENGTH(name) ASC
-                        LIMIT ?
-                    ''', (search_pattern, limit))
-                    
-                    for row in cursor.fetchall():
-                        suggestions.add(row[0])
-                except sqlite3.Error:
-                    pass  # Table might not exist
-                
-                return list(suggestions)[:limit]
+            except sqlite3.Error:
+                pass  # Table might not exist
+            
+            return list(suggestions)[:limit]
+    
+    def _suggestion_candidates(self, cursor, query: str) -> Optional[Tuple[str, List[int]]]:
+        """
+        Subquery fakultas yang nama atau nama programnya memuat semua kata query
+        (term dari trigram, lalu postings field name/program), sebagai (sql, params).
         
-        except sqlite3.Error as e:
-            self.logger.error(f"Error getting search suggestions: {e}")
-            return []
+        Returns None jika index trigram tidak bisa dipakai (belum dibangun, atau
+        tidak ada kata >= 3 karakter), dan ('', []) jika ada kata tanpa term cocok.
+        """
+        words = [word for word in dict.fromkeys(tokenize(query)) if len(word) >= 3]
+        if not words:
+            return None
+        
+        subqueries, params = [], []
+        try:
+            for word in words:
+                term_ids = list(self._match_partial_terms(cursor, word, fuzzy=False).values())
+                if not term_ids:
+                    return '', []
+                subqueries.append(f"""
+                    SELECT faculty_id FROM index_postings
+                    WHERE term_id IN ({','.join('?' * len(term_ids))}) AND field IN ('name', 'program')
+                """)
+                params.extend(term_ids)
+        except sqlite3.Error:
+            return None  # Index belum pernah dibuat (database lama)
+        return ' INTERSECT '.join(subqueries), params
     
     def get_faculty_by_type(self, faculty_type: str, limit: int = 20) -> List[Dict]:
-        """Dapatkan fakultas berdasarkan tipe"""
+        """Dapatkan fakultas berdasarkan tipe (dari snapshot resident, atau bitmap tipe jika ada index biner)"""
+        snapshot = self._resident_snapshot(postings=False)
+        if snapshot is not None:
+            return snapshot.faculties_by_type(faculty_type, limit)
+        
         try:
             with sqlite3.connect(self.db_path, timeout=10.0) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
+                binary_index = self._load_binary_index()
+                if binary_index is not None:
+                    results = binary_index.documents(binary_index.type_bitmap(faculty_type), limit)
+                    return self._enrich_search_results(conn, results)
+                
                 cursor.execute('''
                     SELECT * FROM faculties 
                     WHERE faculty_type = ? 
@@ -447,6 +894,57 @@ class FacultySearchEngine:
             self.logger.error(f"Error getting faculties by type: {e}")
             return []
     
+    def get_type_facets(self, query: str, search_type: str = 'comprehensive') -> Dict[str, int]:
+        """
+        Jumlah fakultas yang cocok dengan query per faculty_type.
+        
+        Dengan index biner: OR bitmap term lalu popcount AND bitmap tipe; tanpa
+        itu GROUP BY di atas postings.
+        """
+        words = self.preprocess_query(query)
+        if not words:
+            return {}
+        
+        try:
+            return self.cache.get_or_compute(('facets', self._cache_scope, search_type, tuple(words)),
+                                             lambda: self._type_facets(words, search_type))
+        
+        except sqlite3.Error as e:
+            self.logger.error(f"Error counting type facets: {e}")
+            return {}
+    
+    def _type_facets(self, words: List[str], search_type: str) -> Dict[str, int]:
+        """Hitung facet untuk get_type_facets() (exception diteruskan supaya tidak di-cache)"""
+        fields = self.INDEX_SEARCH_FIELDS.get(search_type)
+        
+        snapshot = self._resident_snapshot()
+        if snapshot is not None:
+            return snapshot.type_facets(words, fields)
+        
+        with sqlite3.connect(self.db_path, timeout=10.0) as conn:
+            binary_index = self._load_binary_index()
+            if binary_index is not None:
+                return binary_index.facet_counts(
+                    binary_index.match(self._binary_index_terms(conn, binary_index, words), fields))
+            
+            cursor = conn.cursor()
+            term_ids = self._index_term_ids(cursor, words)
+            if not term_ids:
+                return {}
+            params = list(term_ids.values())
+            field_condition = ''
+            if fields:
+                field_condition = f"AND p.field IN ({','.join('?' * len(fields))})"
+                params.extend(fields)
+            cursor.execute(f"""
+                SELECT f.faculty_type, COUNT(DISTINCT p.faculty_id)
+                FROM index_postings p
+                JOIN faculties f ON f.id = p.faculty_id
+                WHERE p.term_id IN ({','.join('?' * len(term_ids))}) {field_condition}
+                GROUP BY f.faculty_type
+            """, params)
+            return {faculty_type: count for faculty_type, count in cursor.fetchall() if faculty_type}
+    
     def debug_search(self, query: str) -> Dict:
         """Debug function untuk troubleshooting search issues"""
         debug_info = {
@@ -481,8 +979,12 @@ class FacultySearchEngine:
                     cursor.execute("SELECT id, name FROM faculties LIMIT 5")
                     debug_info['sample_faculties'] = [dict(row) for row in cursor.fetchall()]
                 
-                # Count search index
-                if 'search_index' in debug_info['tables']:
+                # Count search index (index_stats dijaga indexer, tanpa scan search_index)
+                if 'index_stats' in debug_info['tables']:
+                    cursor.execute("SELECT value FROM index_stats WHERE kind = 'total' AND key = 'entries'")
+                    row = cursor.fetchone()
+                    debug_info['search_index_count'] = row[0] if row else 0
+                elif 'search_index' in debug_info['tables']:
                     cursor.execute("SELECT COUNT(*) FROM search_index")
                     debug_info['search_index_count'] = cursor.fetchone()[0]
                 
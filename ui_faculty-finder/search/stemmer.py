@@ -0,0 +1,127 @@
+"""
+Stemmer bahasa Indonesia (affix stripping gaya Nazief-Adriani)
+
+Imbuhan dilepas berurutan: partikel (-lah, -kah, -tah, -pun), kata ganti
+milik (-ku, -mu, -nya), sufiks turunan (-i, -an, -kan), lalu sampai tiga
+prefiks (di-, ke-, se-, be-, te-, me-, pe-) termasuk perubahan bunyinya
+(meng-/meny-/mem-/men-, peng-/peny-/pem-/pen-/per-/pel-, ber-/bel-, ter-).
+Setiap kandidat dicek ke kamus kata dasar; jika tidak ada yang cocok kata
+dikembalikan apa adanya, jadi kata asing dan nama tidak ikut terpotong.
+
+Hasil di-memoize per proses dan disimpan indexer di index_stems.
+"""
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+# Kamus kata dasar: kosakata akademik/kelembagaan yang muncul di data fakultas.
+# Tambahkan kata dasar di sini (lalu naikkan ANALYZER_VERSION) jika ada bentuk
+# berimbuhan yang belum ter-stem.
+ROOT_WORDS = frozenset('''
+    abdi ada adil ajar akal akhir aktif akuntansi alam alih amal aman ambil anak analisis angkat antar arah
+    arsitektur arti asuh atur awal awat bahasa baik baca bagi bahan bangun bantu baru batas bawa bayar beda
+    bedah beri besar biaya bidang bijak bina bisnis budaya buat buku bumi cakup capai cari cegah cerita cipta
+    daftar dagang daya dalam damai dapat darat darah data datang dengar desain diri didik dokter duduk dukung
+    ekonomi fakultas farmasi filsafat fisika fungsi gambar gedung gelar geografi geologi gigi gizi guna guru
+    hadap hadir hak hasil hati hidup hitung hubung hukum hutan ibu ikan ikut ilmu industri informasi insinyur
+    jadi jalan jaga jamin jasa jelas jiwa jual kaji kampus karya kata kait kelola kembang kenal kerja kimia
+    klinik komputer komunikasi kota kuat kuliah kumpul kurang laku laksana lanjut latih layan lengkap lestari
+    lihat lindung lingkung lulus luas maju makan makmur manfaat masuk masyarakat mata mesin milik minat mulai
+    mutu nalar negara nilai obat olah pakai pandang pasar pegang pelihara pengaruh perintah periksa pikir pimpin
+    politik pulih rancang rawat riset ruang rumah saji sakit sama sarjana satu sebar sedia sehat sejahtera
+    sejarah seni siap sidang sistem sosial sulit susun tahu tambah tanam tanya tani tata teliti temu tentu
+    terap terima ternak tiba timbang tindak tinggi tulis tumbuh tunjuk uji ukur ulang umum unggul urus usaha
+    wajib wakil waris warga wilayah
+'''.split())
+
+PARTICLES = ('lah', 'kah', 'tah', 'pun')
+POSSESSIVES = ('ku', 'mu', 'nya')
+DERIVATION_SUFFIXES = ('kan', 'an', 'i')
+
+# Pasangan prefiks-sufiks yang tidak mungkin muncul bersama (mis. di-...-an)
+DISALLOWED_CONFIXES = {
+    ('be', 'i'), ('di', 'an'), ('ke', 'i'), ('ke', 'kan'), ('me', 'an'), ('se', 'i'), ('se', 'kan'), ('te', 'an')
+}
+
+MAX_PREFIXES = 3
+VOWELS = frozenset('aiueo')
+
+
+def _prefix_options(word: str) -> List[Tuple[str, str]]:
+    """(jenis prefiks, sisa kata) yang mungkin untuk awal kata, termasuk perubahan bunyi prefiks"""
+    options = []
+    if word[:2] in ('di', 'ke', 'se'):
+        options.append((word[:2], word[2:]))
+
+    for prefix in ('be', 'te'):
+        if word.startswith(prefix):
+            if word[2:3] == 'r':
+                options.append((prefix, word[3:]))  # ber-/ter- + kata dasar
+            if prefix == 'be' and word.startswith('bel'):
+                options.append((prefix, word[3:]))  # belajar -> ajar
+            options.append((prefix, word[2:]))  # bekerja -> kerja
+
+    for prefix in ('me', 'pe'):
+        if not word.startswith(prefix):
+            continue
+        rest = word[2:]
+        if rest.startswith('ng'):
+            options.append((prefix, rest[2:]))  # mengukur -> ukur
+            if rest[2:3] in VOWELS:
+                options.append((prefix, 'k' + rest[2:]))  # mengelola -> kelola
+        elif rest.startswith('ny'):
+            options.append((prefix, 's' + rest[2:]))  # menyusun -> susun
+        elif rest.startswith('m'):
+            options.append((prefix, rest[1:]))  # membangun -> bangun
+            if rest[1:2] in VOWELS:
+                options.append((prefix, 'p' + rest[1:]))  # memakai -> pakai
+        elif rest.startswith('n'):
+            options.append((prefix, rest[1:]))  # mendidik -> didik
+            if rest[1:2] in VOWELS:
+                options.append((prefix, 't' + rest[1:]))  # meneliti -> teliti
+        else:
+            options.append((prefix, rest))  # melatih -> latih, perawat -> rawat
+            if prefix == 'pe' and rest[:1] in ('r', 'l'):
+                options.append((prefix, rest[1:]))  # pertanian -> tani, pelajar -> ajar
+    return options
+
+
+def _strip_prefixes(word: str, suffix: str, depth: int = 0, previous: Optional[str] = None) -> Iterator[str]:
+    if depth == MAX_PREFIXES or len(word) < 4:
+        return
+    for prefix, rest in _prefix_options(word):
+        if prefix == previous or (depth == 0 and (prefix, suffix) in DISALLOWED_CONFIXES) or len(rest) < 2:
+            continue
+        yield rest
+        yield from _strip_prefixes(rest, suffix, depth + 1, prefix)
+
+
+def _candidates(word: str) -> Iterator[str]:
+    """Kandidat kata dasar dalam urutan Nazief-Adriani"""
+    bases = [word]
+    for endings in (PARTICLES, POSSESSIVES):
+        for ending in endings:
+            if bases[-1].endswith(ending) and len(bases[-1]) > len(ending) + 2:
+                bases.append(bases[-1][:-len(ending)])
+                break
+
+    # Bentuk tanpa infleksi dicoba dulu, lalu mundur ke kata utuh (ditanya bukan di + ta + -nya)
+    for base in reversed(bases):
+        yield base
+        # Sufiks turunan dulu; jika tidak ketemu kata dasar, prefiks dilepas dari kata tanpa sufiks
+        for suffix in DERIVATION_SUFFIXES:
+            if base.endswith(suffix) and len(base) > len(suffix) + 2:
+                stripped = base[:-len(suffix)]
+                yield stripped
+                yield from _strip_prefixes(stripped, suffix)
+        yield from _strip_prefixes(base, '')
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Kata dasar dari word, atau word sendiri jika tidak ada kandidat di kamus kata dasar"""
+    if len(word) <= 3 or word in ROOT_WORDS:
+        return word
+    for candidate in _candidates(word):
+        if candidate in ROOT_WORDS:
+            return candidate
+    return word
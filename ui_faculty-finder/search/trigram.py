@@ -0,0 +1,42 @@
+"""
+Trigram karakter untuk pencarian kata parsial dan toleran typo
+
+Setiap term di term dictionary dipecah jadi trigram (index_trigrams). Kata
+query dicocokkan lewat irisan posting trigram-nya, lalu kandidat diverifikasi
+(substring atau edit distance), jadi tidak perlu LIKE '%kata%' yang selalu
+scan seluruh tabel.
+"""
+from typing import List
+
+
+def trigrams(word: str) -> List[str]:
+    """Trigram unik kata (terurut); kosong untuk kata < 3 karakter"""
+    return sorted({word[i:i + 3] for i in range(len(word) - 2)})
+
+
+def max_edits(word: str) -> int:
+    """Jumlah typo yang ditoleransi: 0 untuk kata pendek, 1 sampai 7 karakter, selebihnya 2"""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+
+def min_shared_trigrams(word: str, edits: int) -> int:
+    """Batas bawah trigram yang sama: satu edit mengubah paling banyak 3 trigram"""
+    return max(len(trigrams(word)) - 3 * edits, 1)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, berhenti lebih awal (return limit + 1) jika pasti melebihi limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
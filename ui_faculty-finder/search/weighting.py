@@ -0,0 +1,125 @@
+"""
+Vectorized term weighting untuk inverted index
+
+Postings seluruh korpus dipegang sebagai document-term matrix dalam bentuk
+COO (satu elemen array per posting: term, dokumen, field, tf, panjang field),
+lalu df, idf, bobot BM25/TF-IDF dan L2 norm dihitung dengan operasi array
+NumPy sekaligus, bukan per term per dokumen.
+"""
+from array import array
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+class PostingsMatrix:
+    """Document-term matrix (COO) yang diisi satu pass saat load postings"""
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = list(fields)
+        self.field_codes = {field: code for code, field in enumerate(self.fields)}
+        self.term_ids = array('q')
+        self.faculty_ids = array('q')
+        self.field_ids = array('b')
+        self.tfs = array('l')
+        self.lengths = array('l')
+
+    def __len__(self) -> int:
+        return len(self.tfs)
+
+    def add(self, term_id: int, faculty_id: int, field: str, tf: int, length: int):
+        self.term_ids.append(term_id)
+        self.faculty_ids.append(faculty_id)
+        self.field_ids.append(self.field_codes[field])
+        self.tfs.append(tf)
+        self.lengths.append(length)
+
+    def arrays(self) -> Tuple[np.ndarray, ...]:
+        """(term_ids, faculty_ids, field_ids, tfs, lengths) sebagai array NumPy"""
+        return tuple(np.frombuffer(column, dtype=column.typecode) if len(column) else np.zeros(0, dtype=np.int64)
+                     for column in (self.term_ids, self.faculty_ids, self.field_ids, self.tfs, self.lengths))
+
+
+class TermWeighting:
+    """
+    Skema pembobotan postings: 'bm25' (BM25F per field) atau 'tfidf'.
+
+    Bobot TF-IDF memakai tf ternormalisasi panjang field dan idf log(N/df) + 1
+    (sama dengan calculate_tf_idf), lalu dibagi L2 norm vektor field dokumen
+    supaya SUM(score) saat query setara cosine similarity per field.
+
+    Boost field dikalikan paling akhir (setelah normalisasi), jadi skor selalu
+    boost x bobot dasar dan ganti boost cukup menskala skor yang tersimpan.
+    """
+
+    SCHEMES = ('bm25', 'tfidf')
+
+    def __init__(self, scheme: str = 'bm25', k1: float = 1.2, b: float = 0.75):
+        if scheme not in self.SCHEMES:
+            raise ValueError(f"Unknown weighting scheme: {scheme} (expected one of {self.SCHEMES})")
+        self.scheme = scheme
+        self.k1 = k1
+        self.b = b
+
+    @staticmethod
+    def document_frequencies(term_ids: np.ndarray, faculty_ids: np.ndarray) -> Dict[int, int]:
+        """term_id -> jumlah dokumen berbeda (posting per field dihitung sekali per dokumen)"""
+        if not len(term_ids):
+            return {}
+        # Satu key int64 per pasangan (term, dokumen): np.unique 1-D jauh lebih cepat dari axis=1
+        stride = int(faculty_ids.max()) + 1
+        pairs = np.unique(term_ids.astype(np.int64) * stride + faculty_ids)
+        terms, counts = np.unique(pairs // stride, return_counts=True)
+        return dict(zip(terms.tolist(), counts.tolist()))
+
+    def idf(self, df: np.ndarray, total_docs: int) -> np.ndarray:
+        df = np.asarray(df, dtype=np.float64)
+        if self.scheme == 'bm25':
+            return np.log1p((total_docs - df + 0.5) / (df + 0.5))  # Selalu positif
+        with np.errstate(divide='ignore'):
+            return np.where(df > 0, np.log(total_docs / np.maximum(df, 1)) + 1, 0.0)
+
+    def weights(self, tf: np.ndarray, lengths: np.ndarray, avg_lengths: np.ndarray, idf: np.ndarray) -> np.ndarray:
+        """Bobot dasar per posting (tanpa boost); avg_lengths sudah di-broadcast per posting"""
+        tf = tf.astype(np.float64)
+        lengths = lengths.astype(np.float64)
+        if self.scheme == 'bm25':
+            safe_avg = np.where(avg_lengths > 0, avg_lengths, 1.0)
+            length_norm = np.where(avg_lengths > 0, 1 - self.b + self.b * lengths / safe_avg, 1.0)
+            return idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+        return idf * tf / np.maximum(lengths, 1.0)
+
+    @staticmethod
+    def l2_norms(faculty_ids: np.ndarray, field_ids: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        L2 norm vektor bobot per (dokumen, field).
+
+        Returns:
+            (array 2 x G berisi (faculty_id, field_id) per dokumen-field, norm per
+            dokumen-field, index dokumen-field untuk setiap posting)
+        """
+        stride = int(field_ids.max()) + 1
+        keys, inverse = np.unique(faculty_ids.astype(np.int64) * stride + field_ids, return_inverse=True)
+        norms = np.sqrt(np.bincount(inverse, weights=weights * weights, minlength=len(keys)))
+        return np.stack([keys // stride, keys % stride]), norms, inverse
+
+    def score(self, faculty_ids: np.ndarray, field_ids: np.ndarray, tfs: np.ndarray, lengths: np.ndarray,
+              idf: np.ndarray, avg_length_by_field: np.ndarray,
+              boost_by_field: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Skor akhir semua postings sekaligus.
+
+        idf sudah per posting; avg_length_by_field dan boost_by_field diindeks field_id.
+
+        Returns:
+            (skor per posting, (faculty_id, field_id) per dokumen-field, L2 norm
+            bobot dasar per dokumen-field)
+        """
+        weights = self.weights(tfs, lengths, avg_length_by_field[field_ids], idf)
+        if not len(weights):
+            return weights, np.zeros((2, 0), dtype=np.int64), np.zeros(0)
+
+        groups, norms, inverse = self.l2_norms(faculty_ids, field_ids, weights)
+        if self.scheme == 'tfidf':
+            weights = weights / np.where(norms > 0, norms, 1.0)[inverse]
+        return weights * boost_by_field[field_ids], groups, norms